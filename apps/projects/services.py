@@ -2,6 +2,7 @@
 
 import base64
 import logging
+from collections.abc import Callable
 
 import requests
 from django.utils import timezone
@@ -99,8 +100,12 @@ def fetch_file_content(gh: GitHubRepo, file_path: str) -> str:
     return data.get("content", "")
 
 
-def sync_repo(gh: GitHubRepo) -> dict:
-    """Sync all resource files from the linked GitHub repo into the project."""
+def sync_repo(gh: GitHubRepo, on_progress: Callable[[int, dict], None] | None = None) -> dict:
+    """Sync all resource files from the linked GitHub repo into the project.
+
+    ``on_progress`` is called after each file with the number of files found
+    and the file's summary (empty if it failed), e.g. to update an ImportJob.
+    """
     results = {"files_found": 0, "files_synced": 0, "errors": [], "details": []}
 
     try:
@@ -128,6 +133,10 @@ def sync_repo(gh: GitHubRepo) -> dict:
             except Exception as e:
                 logger.warning("Failed to sync %s: %s", f["path"], e)
                 results["errors"].append({"path": f["path"], "error": str(e)})
+                result = {}
+
+            if on_progress:
+                on_progress(len(files), result)
 
         gh.last_synced_at = timezone.now()
         if results["files_found"] == 0:
@@ -12,6 +12,7 @@ from apps.projects.serializers import (
     ProjectSerializer,
 )
 from apps.projects.services import list_repo_tree, sync_repo
+from apps.resources.jobs import enqueue_github_sync, job_accepted_response, wants_async
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -80,7 +81,11 @@ def github_repo_files(request, slug):
 @api_view(["POST"])
 @permission_classes([IsManagerOrAbove])
 def github_repo_sync(request, slug):
-    """Trigger a sync: import all resource files from the linked GitHub repo."""
+    """Trigger a sync: import all resource files from the linked GitHub repo.
+
+    With ``?async=1`` the sync is queued as an ImportJob and 202 is returned
+    with the job id.
+    """
     project = get_object_or_404(Project, slug=slug)
     try:
         gh = project.github_repo
@@ -90,5 +95,8 @@ def github_repo_sync(request, slug):
             status=status.HTTP_404_NOT_FOUND,
         )
 
+    if wants_async(request):
+        return job_accepted_response(request, enqueue_github_sync(project))
+
     results = sync_repo(gh)
     return Response(results)
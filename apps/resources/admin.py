@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources.models import ImportJob, ResourceFile, StringChange, TranslatableString
 
 
 @admin.register(ResourceFile)
@@ -8,7 +8,7 @@ class ResourceFileAdmin(admin.ModelAdmin):
     list_display = ["file_path", "project", "file_format", "version", "uploaded_at"]
     list_filter = ["file_format", "project"]
     search_fields = ["file_path"]
-    readonly_fields = ["id", "checksum", "uploaded_at"]
+    readonly_fields = ["id", "checksum", "blob_digest", "uploaded_at"]
 
 
 @admin.register(TranslatableString)
@@ -16,4 +16,19 @@ class TranslatableStringAdmin(admin.ModelAdmin):
     list_display = ["key", "project", "source_text", "is_active", "has_plurals"]
     list_filter = ["is_active", "has_plurals", "project"]
     search_fields = ["key", "source_text"]
-    readonly_fields = ["id", "created_at", "updated_at"]
+    readonly_fields = ["id", "translation_count", "created_at", "updated_at"]
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "project", "kind", "status", "processed_files", "total_files", "created_at"]
+    list_filter = ["kind", "status", "project"]
+    readonly_fields = ["id", "created_at", "started_at", "finished_at"]
+
+
+@admin.register(StringChange)
+class StringChangeAdmin(admin.ModelAdmin):
+    list_display = ["id", "project", "key", "action", "language_code", "created_at"]
+    list_filter = ["action", "project"]
+    search_fields = ["key"]
+    readonly_fields = ["id", "created_at"]
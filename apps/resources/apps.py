@@ -1,7 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ResourcesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.resources"
     verbose_name = "Resources"
+
+    def ready(self):
+        from apps.resources.search import ensure_sqlite_search_index
+
+        post_migrate.connect(ensure_sqlite_search_index, sender=self)
@@ -0,0 +1,150 @@
+"""Content-addressed store for raw resource file payloads.
+
+Payloads are keyed by the SHA-256 of their bytes, the same digest as
+ResourceFile.checksum, so identical files uploaded to any project or
+version are stored once. Each payload is compressed with zstd when the
+``zstandard`` package is installed and with zlib otherwise; the file
+extension records which, so both can be read back.
+"""
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+from django.conf import settings
+
+from parsers.base import RawContent
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Extension of stored payloads for each compression
+EXTENSIONS = {"zstd": ".zst", "zlib": ".zz"}
+
+# Uncompressed bytes fed to the compressor at a time
+COMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, directory: str | os.PathLike, compression: str = "zstd", level: int | None = None):
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unsupported blob compression: {compression}")
+        self.directory = Path(directory)
+        self.compression = compression
+        self.level = level
+
+    def put(self, content: RawContent, digest: str | None = None) -> str:
+        """Store ``content`` unless it is already present, and return its digest.
+
+        ``digest`` may pass the already computed SHA-256 of the content.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if digest is None:
+            digest = hashlib.sha256(content).hexdigest()
+        for compression in EXTENSIONS:
+            try:
+                # A reused payload restarts the GC grace period like a fresh write,
+                # so it is not collected before the row referencing it commits
+                os.utime(self._path(digest, compression))
+            except FileNotFoundError:
+                continue
+            return digest
+
+        path = self._path(digest, self.compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial payload
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._compress(memoryview(content).cast("B")):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes | None:
+        """Return the payload stored under ``digest``, or None if it is missing."""
+        for compression in EXTENSIONS:
+            path = self._path(digest, compression)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            return self._decompress(data, compression)
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return any(self._path(digest, compression).exists() for compression in EXTENSIONS)
+
+    def delete(self, digest: str) -> None:
+        for compression in EXTENSIONS:
+            self._path(digest, compression).unlink(missing_ok=True)
+
+    def iter_blobs(self) -> Iterator[tuple[str, Path]]:
+        """Yield ``(digest, path)`` for every stored payload."""
+        if not self.directory.is_dir():
+            return
+        suffixes = set(EXTENSIONS.values())
+        for path in self.directory.glob("??/*"):
+            if path.suffix in suffixes:
+                yield path.stem, path
+
+    def collect_garbage(self, referenced: set[str], grace_seconds: float = 0, dry_run: bool = False) -> list[str]:
+        """Delete payloads whose digest is not in ``referenced``.
+
+        Payloads written less than ``grace_seconds`` ago are kept, so blobs of
+        uploads still in flight are not removed before their row is committed.
+        Returns the digests that were (or, with ``dry_run``, would be) deleted.
+        """
+        cutoff = time.time() - grace_seconds
+        deleted = []
+        for digest, path in self.iter_blobs():
+            if digest in referenced or path.stat().st_mtime > cutoff:
+                continue
+            if not dry_run:
+                path.unlink(missing_ok=True)
+            deleted.append(digest)
+        return deleted
+
+    def _path(self, digest: str, compression: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}{EXTENSIONS[compression]}"
+
+    def _compress(self, view: memoryview) -> Iterator[bytes]:
+        if self.compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.level or 3).compressobj()
+        else:
+            compressor = zlib.compressobj(6 if self.level is None else self.level)
+        for start in range(0, len(view), COMPRESS_CHUNK_SIZE):
+            yield compressor.compress(view[start:start + COMPRESS_CHUNK_SIZE])
+        yield compressor.flush()
+
+    def _decompress(self, data: bytes, compression: str) -> bytes:
+        if compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed blobs")
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return zlib.decompress(data)
+
+
+@functools.cache
+def get_blob_store() -> BlobStore | None:
+    """Get the blob store configured from settings, or None if it is disabled."""
+    config = getattr(settings, "BLOB_STORE", {})
+    directory = config.get("DIRECTORY")
+    if not directory:
+        return None
+    return BlobStore(directory, config.get("COMPRESSION", "zstd"), config.get("LEVEL"))
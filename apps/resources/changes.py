@@ -0,0 +1,140 @@
+"""Append-only change log of a project's strings and translations.
+
+Uploads and translation saves record what they changed as StringChange rows,
+and consumers read them back with changes_since(), passing the cursor of the
+last page, instead of listing and diffing every string.
+
+Entries are appended under the project's change log lock, held until the
+writing transaction commits. Uploads collect their entries with
+DeferredChanges and append them all at the end, so the lock is held while
+the upload commits rather than for the whole import.
+"""
+import uuid
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import connection
+
+from apps.resources.locks import lock_project_changes
+from apps.resources.models import StringChange
+
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+TRANSLATED = "translated"
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+PENDING_TABLE = "locflow_pending_changes"
+
+
+def record_changes(
+    project_id,
+    changes: Iterable[tuple[uuid.UUID, str, str]],
+    language_code: str = "",
+) -> int:
+    """Append ``(string_id, key, action)`` changes to the project's log.
+
+    Must run inside the transaction that made the changes, and as late in
+    it as possible, since the change log lock is held until it commits.
+    Returns the number of entries written.
+    """
+    rows = [
+        StringChange(
+            project_id=project_id,
+            string_id=string_id,
+            key=key,
+            action=action,
+            language_code=language_code,
+        )
+        for string_id, key, action in changes
+    ]
+    if not rows:
+        return 0
+    lock_project_changes(project_id)
+    batch_size = getattr(settings, "RESOURCE_IMPORT", {}).get("CREATE_BATCH_SIZE")
+    StringChange.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+class DeferredChanges:
+    """Change log entries of a running upload, appended to the log by publish().
+
+    On PostgreSQL entries are staged in a temporary table of the upload's
+    transaction, in the order they were recorded. Other backends already
+    serialise writing transactions, so entries are written straight away.
+    """
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.staged = False
+
+    def staging_table(self) -> str:
+        """Create the staging table if needed and return its quoted name.
+
+        Its columns are ``string_id``, ``key`` and ``action``; the copy
+        import inserts into it directly.
+        """
+        table = connection.ops.quote_name(PENDING_TABLE)
+        if not self.staged:
+            with connection.cursor() as cursor:
+                cursor.execute(f"""
+                    CREATE TEMP TABLE {table} (
+                        "seq" bigserial PRIMARY KEY,
+                        "string_id" uuid NOT NULL,
+                        "key" varchar(1000) NOT NULL,
+                        "action" varchar(20) NOT NULL
+                    ) ON COMMIT DROP
+                """)
+            self.staged = True
+        return table
+
+    def record(self, changes: Iterable[tuple[uuid.UUID, str, str]]) -> int:
+        """Stage ``(string_id, key, action)`` changes; returns how many were recorded."""
+        if connection.vendor != "postgresql":
+            return record_changes(self.project_id, changes)
+        changes = list(changes)
+        if not changes:
+            return 0
+        string_ids, keys, actions = zip(*changes)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.staging_table()} ("string_id", "key", "action") '
+                "SELECT * FROM unnest(%s::uuid[], %s::varchar[], %s::varchar[])",
+                [[str(string_id) for string_id in string_ids], list(keys), list(actions)],
+            )
+        return len(changes)
+
+    def publish(self) -> None:
+        """Append the staged entries to the log, taking the change log lock."""
+        if not self.staged:
+            return
+        table = connection.ops.quote_name(PENDING_TABLE)
+        log = connection.ops.quote_name(StringChange._meta.db_table)
+        lock_project_changes(self.project_id)
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO {log} ("project_id", "string_id", "key", "action", "language_code", "created_at")
+                SELECT %s::uuid, "string_id", "key", "action", '', now()
+                FROM {table}
+                ORDER BY "seq"
+            """, [str(self.project_id)])
+            cursor.execute(f"DROP TABLE {table}")
+        self.staged = False
+
+
+def changes_since(project_id, cursor: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[StringChange], int, bool]:
+    """Return up to ``limit`` changes after ``cursor``, oldest first.
+
+    Also returns the cursor to pass for the next page, which is ``cursor``
+    itself when nothing changed, and whether more changes are waiting.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    changes = list(
+        StringChange.objects.filter(project_id=project_id, id__gt=cursor).order_by("id")[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    next_cursor = changes[-1].id if changes else cursor
+    return changes, next_cursor, has_more
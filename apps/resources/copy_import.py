@@ -0,0 +1,211 @@
+"""PostgreSQL ingestion path for very large resource files.
+
+Parsed entries are streamed with COPY into a temporary staging table, then
+applied to resources_translatablestring with three set-based statements:
+an UPDATE of changed or reactivated strings, an INSERT ... ON CONFLICT of
+new ones, and an UPDATE deactivating the file's strings missing from it.
+Each statement stages change log entries for the rows it touched as well,
+and they are appended to the log at the end.
+"""
+import io
+import json
+from collections.abc import Iterable, Iterator
+
+from django.db import connection
+
+from apps.projects.models import Project
+from apps.resources import changes as change_log
+from apps.resources.diff import sort_entries
+from apps.resources.models import ResourceFile, TranslatableString
+from parsers.base import ParsedEntry
+
+STAGING_TABLE = "locflow_import_staging"
+
+STAGING_COLUMNS = (
+    "key", "source_text", "context", "max_length", "has_plurals", "plural_forms", "order", "content_hash",
+)
+
+# Characters with a meaning in COPY's text format
+COPY_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
+
+COPY_READ_SIZE = 64 * 1024
+
+
+def apply_with_copy(
+    project: Project,
+    resource_file: ResourceFile,
+    entries: Iterable[ParsedEntry],
+) -> tuple[int, int, int]:
+    """Write ``entries`` as the new content of ``resource_file``.
+
+    Returns the number of new, updated and removed strings, counted the
+    same way as the ORM path: reactivated strings count as new.
+    """
+    strings = connection.ops.quote_name(TranslatableString._meta.db_table)
+    files = connection.ops.quote_name(ResourceFile._meta.db_table)
+    staging = connection.ops.quote_name(STAGING_TABLE)
+    pending_changes = change_log.DeferredChanges(project.id)
+    pending = pending_changes.staging_table()
+    pending_columns = '"string_id", "key", "action"'
+    project_id = str(project.id)
+    resource_file_id = str(resource_file.id)
+
+    with connection.cursor() as cursor:
+        # The table outlives this call when the upload runs in an outer transaction
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(f"""
+            CREATE TEMP TABLE {staging} (
+                "key" varchar(1000) PRIMARY KEY,
+                "source_text" text NOT NULL,
+                "context" text NOT NULL,
+                "max_length" integer,
+                "has_plurals" boolean NOT NULL,
+                "plural_forms" jsonb NOT NULL,
+                "order" integer NOT NULL,
+                "content_hash" varchar(64) NOT NULL
+            ) ON COMMIT DROP
+        """)
+        columns = ", ".join(connection.ops.quote_name(c) for c in STAGING_COLUMNS)
+        cursor.copy_expert(
+            f"COPY {staging} ({columns}) FROM STDIN",
+            CopyReader(_iter_copy_lines(entries)),
+        )
+        cursor.execute(f"ANALYZE {staging}")
+
+        cursor.execute(f"""
+            WITH targets AS (
+                SELECT t."id", t."is_active" AS was_active
+                FROM {strings} AS t
+                JOIN {staging} AS s ON s."key" = t."key"
+                WHERE t."project_id" = %s::uuid
+                  AND (NOT t."is_active" OR t."content_hash" <> s."content_hash")
+            ), changed AS (
+                UPDATE {strings} AS t SET
+                    "source_text" = s."source_text",
+                    "context" = s."context",
+                    "max_length" = s."max_length",
+                    "has_plurals" = s."has_plurals",
+                    "plural_forms" = s."plural_forms",
+                    "order" = s."order",
+                    "content_hash" = s."content_hash",
+                    "is_active" = true,
+                    "resource_file_id" = %s::uuid,
+                    "updated_at" = now()
+                FROM {staging} AS s, targets
+                WHERE t."id" = targets."id" AND s."key" = t."key"
+                RETURNING t."id", t."key", targets.was_active
+            ), logged AS (
+                INSERT INTO {pending} ({pending_columns})
+                SELECT "id", "key", CASE WHEN was_active THEN %s ELSE %s END
+                FROM changed
+                ORDER BY "key"
+            )
+            SELECT
+                count(*) FILTER (WHERE was_active),
+                count(*) FILTER (WHERE NOT was_active)
+            FROM changed
+        """, [project_id, resource_file_id, change_log.UPDATED, change_log.ADDED])
+        updated, reactivated = cursor.fetchone()
+
+        cursor.execute(f"""
+            WITH inserted AS (
+                INSERT INTO {strings} (
+                    "id", "project_id", "resource_file_id", "key", "source_text", "context",
+                    "max_length", "has_plurals", "plural_forms", "order", "content_hash",
+                    "translation_count", "is_active", "created_at", "updated_at"
+                )
+                SELECT
+                    gen_random_uuid(), %s::uuid, %s::uuid, s."key", s."source_text", s."context",
+                    s."max_length", s."has_plurals", s."plural_forms", s."order", s."content_hash",
+                    0, true, now(), now()
+                FROM {staging} AS s
+                ON CONFLICT ("project_id", "key") DO NOTHING
+                RETURNING "id", "key"
+            ), logged AS (
+                INSERT INTO {pending} ({pending_columns})
+                SELECT "id", "key", %s
+                FROM inserted
+                ORDER BY "key"
+            )
+            SELECT count(*) FROM inserted
+        """, [project_id, resource_file_id, change_log.ADDED])
+        inserted = cursor.fetchone()[0]
+
+        # Strings from the project's other resource files are left alone
+        cursor.execute(f"""
+            WITH removed AS (
+                UPDATE {strings} AS t SET "is_active" = false
+                FROM {files} AS f
+                WHERE t."resource_file_id" = f."id"
+                  AND t."project_id" = %s::uuid
+                  AND t."is_active"
+                  AND f."file_path" = %s
+                  AND NOT EXISTS (SELECT 1 FROM {staging} AS s WHERE s."key" = t."key")
+                RETURNING t."id", t."key"
+            ), logged AS (
+                INSERT INTO {pending} ({pending_columns})
+                SELECT "id", "key", %s
+                FROM removed
+                ORDER BY "key"
+            )
+            SELECT count(*) FROM removed
+        """, [project_id, resource_file.file_path, change_log.REMOVED])
+        removed = cursor.fetchone()[0]
+
+        cursor.execute(f"DROP TABLE {staging}")
+
+    pending_changes.publish()
+    return inserted + reactivated, updated, removed
+
+
+class CopyReader(io.TextIOBase):
+    """File-like object that COPY reads from, producing lines on demand."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            size = COPY_READ_SIZE
+        parts = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if length >= size:
+                break
+        data = "".join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _iter_copy_lines(entries: Iterable[ParsedEntry]) -> Iterator[str]:
+    """Yield one COPY text-format line per key; the first of duplicate keys wins."""
+    last_key = None
+    for entry in sort_entries(entries):
+        if entry.key == last_key:
+            continue
+        last_key = entry.key
+        yield "\t".join((
+            _copy_text(entry.key),
+            _copy_text(entry.source_text),
+            _copy_text(entry.context),
+            r"\N" if entry.max_length is None else str(entry.max_length),
+            "t" if entry.has_plurals else "f",
+            _copy_text(json.dumps(dict(entry.plural_forms), ensure_ascii=False)),
+            str(entry.order),
+            entry.content_hash,
+        )) + "\n"
+
+
+def _copy_text(value: str) -> str:
+    return value.translate(COPY_ESCAPES)
@@ -0,0 +1,126 @@
+"""Merge-join diff between a project's stored strings and parser output.
+
+Both sides are read in key order, so every key is classified in a single
+pass while holding one row of each side at a time.
+"""
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models.functions import Collate
+
+from apps.projects.models import Project
+from apps.resources.models import TranslatableString
+from parsers.base import ParsedBatch, ParsedEntry
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+REMOVED = "removed"
+
+STORED_CHUNK_SIZE = 2000
+
+
+@dataclass(slots=True)
+class StoredString:
+    key: str
+    content_hash: str
+    id: uuid.UUID
+    is_active: bool
+    file_path: str
+
+
+@dataclass(slots=True)
+class DiffResult:
+    status: str
+    key: str
+    entry: ParsedEntry | None = None
+    stored: StoredString | None = None
+
+
+def iter_stored_strings(project: Project, chunk_size: int = STORED_CHUNK_SIZE) -> Iterator[StoredString]:
+    """Stream every string of ``project``, active or not, sorted by key.
+
+    Keys are compared in code point order, as Python compares str, so the
+    PostgreSQL sort uses the "C" collation rather than the database locale.
+    SQLite's default BINARY collation already sorts UTF-8 that way.
+
+    The caller may write to the project's strings while consuming the
+    stream. PostgreSQL cursors never see those writes; elsewhere each chunk
+    is read in full, after the last key of the previous one, through the
+    (project, key) index.
+    """
+    fields = ("key", "content_hash", "id", "is_active", "resource_file__file_path")
+    strings = TranslatableString.objects.filter(project=project)
+    if connection.vendor == "postgresql":
+        rows = strings.order_by(Collate("key", "C")).values_list(*fields)
+        for row in rows.iterator(chunk_size=chunk_size):
+            yield StoredString(*row)
+        return
+
+    rows = strings.order_by("key").values_list(*fields)
+    chunk = list(rows[:chunk_size])
+    while chunk:
+        for row in chunk:
+            yield StoredString(*row)
+        if len(chunk) < chunk_size:
+            return
+        chunk = list(rows.filter(key__gt=chunk[-1][0])[:chunk_size])
+
+
+def sort_entries(entries: Iterable[ParsedEntry]) -> Iterable[ParsedEntry]:
+    """Return parser output sorted by key, reading a ParsedBatch column-wise."""
+    if isinstance(entries, ParsedBatch):
+        return entries.iter_by_key()
+    return sorted(entries, key=lambda e: e.key)
+
+
+def merge_diff(stored: Iterable[StoredString], entries: Iterable[ParsedEntry]) -> Iterator[DiffResult]:
+    """Classify every key of two key-sorted streams as new, changed, unchanged or removed.
+
+    An inactive stored string whose key reappears is reported as new, with
+    ``stored`` set so the row can be reactivated instead of inserted again.
+    Inactive strings missing from ``entries`` are skipped. When a key occurs
+    more than once in ``entries``, the first occurrence wins.
+
+    Raises:
+        ValueError: If either stream is not sorted by key.
+    """
+    stored = iter(stored)
+    entries = iter(entries)
+    row = next(stored, None)
+    entry = next(entries, None)
+    last_stored_key = last_entry_key = None
+
+    while row is not None or entry is not None:
+        if entry is None or (row is not None and row.key < entry.key):
+            if row.is_active:
+                yield DiffResult(REMOVED, row.key, stored=row)
+            last_stored_key = row.key
+            row = _advance(stored, last_stored_key)
+        elif row is None or entry.key < row.key:
+            yield DiffResult(NEW, entry.key, entry=entry)
+            last_entry_key = entry.key
+            entry = _advance(entries, last_entry_key)
+        else:
+            if not row.is_active:
+                status = NEW
+            elif row.content_hash != entry.content_hash:
+                status = CHANGED
+            else:
+                status = UNCHANGED
+            yield DiffResult(status, entry.key, entry=entry, stored=row)
+            last_stored_key = last_entry_key = entry.key
+            row = _advance(stored, last_stored_key)
+            entry = _advance(entries, last_entry_key)
+
+
+def _advance(items: Iterator, last_key: str):
+    """Return the next item with a key greater than ``last_key``, skipping duplicates."""
+    for item in items:
+        if item.key > last_key:
+            return item
+        if item.key < last_key:
+            raise ValueError(f"Diff input is not sorted by key: {item.key!r} after {last_key!r}")
+    return None
@@ -0,0 +1,97 @@
+"""Streaming exports of a project's strings with their translations.
+
+Strings are read in chunks of ``RESOURCE_EXPORT["CHUNK_SIZE"]`` rows and the
+translations of each chunk are fetched just before its entries are handed to
+the exporter, so an export holds one chunk at a time instead of every string
+and translation of the project.
+"""
+from collections.abc import Iterator
+
+from django.conf import settings
+
+from apps.projects.models import Project
+from apps.resources.models import TranslatableString
+from apps.translations.models import Translation
+from parsers.base import BaseParser, ParsedEntry
+
+DEFAULT_CHUNK_SIZE = 2000
+
+STRING_FIELDS = ("id", "key", "source_text", "context", "has_plurals", "plural_forms", "order", "max_length")
+
+
+class ChunkTranslations(dict):
+    """Translations of the chunk being exported, keyed as the exporters expect.
+
+    Exporters treat falsy translations as "nothing is translated", which
+    changes how some formats are written; a chunk that happens to have no
+    translations must not, so this dict is always truthy.
+    """
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def export_translations(parser: BaseParser, project: Project, language: str) -> Iterator[str]:
+    """Stream the project's active strings and their ``language`` translations with ``parser``."""
+    chunk_size = getattr(settings, "RESOURCE_EXPORT", {}).get("CHUNK_SIZE") or DEFAULT_CHUNK_SIZE
+    strings = TranslatableString.objects.filter(project=project, is_active=True)
+    translations = Translation.objects.filter(language_code=language)
+    has_translations = translations.filter(string__project=project, string__is_active=True).exists()
+    chunk_translations = ChunkTranslations() if has_translations else None
+
+    def iter_entries() -> Iterator[ParsedEntry]:
+        for rows in _iter_chunks(parser, strings, chunk_size):
+            if chunk_translations is not None:
+                keys = {row[0]: row[1] for row in rows}
+                chunk_translations.clear()
+                # Translated plural forms are keyed as "<key>_<category>" for the exporters
+                for string_id, translated_text, plural_forms in translations.filter(
+                    string_id__in=keys,
+                ).values_list("string_id", "translated_text", "plural_forms"):
+                    key = keys[string_id]
+                    chunk_translations[key] = translated_text
+                    for category, form_text in (plural_forms or {}).items():
+                        chunk_translations[f"{key}_{category}"] = form_text
+
+            for _, key, source_text, context, has_plurals, plural_forms, order, max_length in rows:
+                yield ParsedEntry(
+                    key=key,
+                    source_text=source_text,
+                    context=context,
+                    has_plurals=has_plurals,
+                    plural_forms=plural_forms,
+                    order=order,
+                    max_length=max_length,
+                )
+
+    return parser.export_iter(iter_entries(), chunk_translations, language)
+
+
+def _iter_chunks(parser: BaseParser, strings, chunk_size: int) -> Iterator[list[tuple]]:
+    """Yield the rows of ``strings`` in the parser's export order, ``chunk_size`` at a time."""
+    ordered = strings.order_by("order", "id")
+    ids = []
+
+    def iter_keys() -> Iterator[str]:
+        for pk, key in ordered.values_list("id", "key").iterator(chunk_size=chunk_size):
+            ids.append(pk)
+            yield key
+
+    positions = parser.export_order(iter_keys())
+    if positions is None:
+        chunk = []
+        for row in ordered.values_list(*STRING_FIELDS).iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    # Only the ids are kept; each chunk of rows is read by id in export order
+    ids = [ids[position] for position in positions]
+    for start in range(0, len(ids), chunk_size):
+        chunk_ids = ids[start:start + chunk_size]
+        rows = {row[0]: row for row in strings.filter(pk__in=chunk_ids).values_list(*STRING_FIELDS)}
+        yield [rows[pk] for pk in chunk_ids if pk in rows]
@@ -0,0 +1,245 @@
+"""Database-backed queue of import jobs, processed by the import worker.
+
+Uploads and GitHub syncs can be enqueued instead of run in the request
+thread. Workers claim pending jobs with SELECT ... FOR UPDATE SKIP LOCKED,
+so any number of them can poll the same table without blocking each other.
+
+A claimed job is leased to its worker, which renews the lease from a
+heartbeat thread while the job runs and with each progress report. Jobs of workers that crashed or were killed are requeued
+once their lease runs out, and failed after IMPORT_JOBS["MAX_ATTEMPTS"]
+claims. Each claim bumps ``attempts``, and a worker only records progress
+or a result while the job is still on the attempt it claimed.
+"""
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connections, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.projects.models import Project
+from apps.resources.models import ImportJob
+from apps.resources.services import process_uploaded_file
+
+logger = logging.getLogger(__name__)
+
+
+# Values of the ``async`` query parameter that queue an import instead of running it
+ASYNC_TRUE_VALUES = {"1", "true", "yes"}
+
+DEFAULT_LEASE_SECONDS = 1800
+DEFAULT_MAX_ATTEMPTS = 3
+
+STALE_JOB_ERROR = "The import worker stopped responding."
+
+
+def wants_async(request) -> bool:
+    return request.query_params.get("async", "").lower() in ASYNC_TRUE_VALUES
+
+
+def job_accepted_response(request, job: ImportJob) -> Response:
+    """Build the 202 response returned when an import is queued."""
+    status_url = reverse("import-job-detail", kwargs={"slug": job.project.slug, "job_id": job.id})
+    return Response(
+        {"job_id": str(job.id), "status": job.status, "status_url": request.build_absolute_uri(status_url)},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def _spool_dir() -> Path:
+    config = getattr(settings, "IMPORT_JOBS", {})
+    return Path(config.get("SPOOL_DIR") or Path(tempfile.gettempdir()) / "locflow-import-jobs")
+
+
+def enqueue_upload(project: Project, uploaded_file: UploadedFile, file_format: str) -> ImportJob:
+    """Spool ``uploaded_file`` to disk and queue it for processing."""
+    directory = _spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, spool_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    with os.fdopen(fd, "wb") as f:
+        for chunk in uploaded_file.chunks():
+            f.write(chunk)
+
+    return ImportJob.objects.create(
+        project=project,
+        kind="upload",
+        file_path=uploaded_file.name,
+        file_format=file_format,
+        spool_path=spool_path,
+        total_files=1,
+    )
+
+
+def enqueue_github_sync(project: Project) -> ImportJob:
+    return ImportJob.objects.create(project=project, kind="github_sync")
+
+
+def claim_next_job() -> ImportJob | None:
+    """Mark the oldest pending job as running and return it, or None if the queue is empty.
+
+    Stale jobs are requeued first. Rows locked by another worker's claim
+    are skipped. Backends without row locks (SQLite) rely on the
+    conditional UPDATE, so a job is never claimed twice.
+    """
+    requeue_stale_jobs()
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status="pending")
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=job.id, status="pending", attempts=job.attempts).update(
+            status="running", started_at=now, heartbeat_at=now, attempts=F("attempts") + 1,
+        )
+        if not claimed:
+            return None
+    job.status = "running"
+    job.started_at = job.heartbeat_at = now
+    job.attempts += 1
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """Requeue running jobs whose lease ran out, failing those out of attempts.
+
+    Requeued jobs start over, so their progress counts are reset. Returns
+    the number of jobs requeued.
+    """
+    lease = timedelta(seconds=_lease_seconds())
+    max_attempts = getattr(settings, "IMPORT_JOBS", {}).get("MAX_ATTEMPTS") or DEFAULT_MAX_ATTEMPTS
+    now = timezone.now()
+    stale = ImportJob.objects.filter(status="running", heartbeat_at__lt=now - lease)
+
+    for job_id, spool_path in stale.filter(attempts__gte=max_attempts).values_list("id", "spool_path"):
+        failed = stale.filter(id=job_id).update(status="failed", error=STALE_JOB_ERROR, finished_at=now)
+        if failed:
+            logger.warning("Import job %s failed: its worker stopped responding", job_id)
+            if spool_path:
+                Path(spool_path).unlink(missing_ok=True)
+
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status="pending", heartbeat_at=None, processed_files=0, new=0, updated=0, removed=0,
+    )
+    if requeued:
+        logger.warning("Requeued %d import job(s) whose worker stopped responding", requeued)
+    return requeued
+
+
+def run_job(job: ImportJob) -> None:
+    """Process a claimed job and record its result or error.
+
+    If the job was requeued meanwhile, the result is dropped and the spooled
+    file left to the attempt that now owns the job.
+    """
+    try:
+        with _lease_heartbeat(job):
+            if job.kind == "upload":
+                result = _run_upload(job)
+            else:
+                result = _run_github_sync(job)
+    except Exception as e:
+        logger.exception("Import job %s failed", job.id)
+        job.status = "failed"
+        job.error = str(e)
+    else:
+        job.status = "succeeded"
+        job.result = result
+
+    job.finished_at = timezone.now()
+    recorded = _current_attempt(job).update(
+        status=job.status, result=job.result, error=job.error, finished_at=job.finished_at,
+    )
+    if not recorded:
+        logger.warning("Import job %s was requeued while attempt %d ran; its result is dropped", job.id, job.attempts)
+        return
+    if job.spool_path:
+        Path(job.spool_path).unlink(missing_ok=True)
+
+
+def _lease_seconds() -> float:
+    return getattr(settings, "IMPORT_JOBS", {}).get("LEASE_SECONDS") or DEFAULT_LEASE_SECONDS
+
+
+@contextmanager
+def _lease_heartbeat(job: ImportJob):
+    """Renew the job's lease from a background thread while the block runs.
+
+    An upload is written in a single transaction, so a renewal made from
+    inside it would only become visible once the upload is done. The
+    thread uses its own connection and renews three times per lease.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        try:
+            while not stop.wait(_lease_seconds() / 3):
+                if not _renew_lease(job):
+                    break
+        except Exception:
+            logger.exception("Could not renew the lease of import job %s", job.id)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f"import-job-{job.id}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _renew_lease(job: ImportJob) -> bool:
+    """Extend the job's lease; False once the job no longer runs this attempt."""
+    return bool(_current_attempt(job).update(heartbeat_at=timezone.now()))
+
+
+def _current_attempt(job: ImportJob):
+    """The job's row, as long as it is still running the attempt ``job`` claimed."""
+    return ImportJob.objects.filter(id=job.id, status="running", attempts=job.attempts)
+
+
+def _run_upload(job: ImportJob) -> dict:
+    with open(job.spool_path, "rb") as f:
+        result = process_uploaded_file(job.project, UploadedFile(f, name=job.file_path), job.file_format)
+    _record_progress(job, result)
+    return result
+
+
+def _run_github_sync(job: ImportJob) -> dict:
+    from apps.projects.models import GitHubRepo
+    from apps.projects.services import sync_repo
+
+    gh = GitHubRepo.objects.get(project=job.project)
+
+    def on_progress(total_files: int, detail: dict) -> None:
+        _record_progress(job, detail, total_files=total_files)
+
+    return sync_repo(gh, on_progress=on_progress)
+
+
+def _record_progress(job: ImportJob, detail: dict, total_files: int | None = None) -> None:
+    """Add one processed file's counts to the job and renew its lease."""
+    extra = {} if total_files is None else {"total_files": total_files}
+    _current_attempt(job).update(
+        **extra,
+        heartbeat_at=timezone.now(),
+        processed_files=F("processed_files") + 1,
+        new=F("new") + detail.get("new", 0),
+        updated=F("updated") + detail.get("updated", 0),
+        removed=F("removed") + detail.get("removed", 0),
+    )
@@ -0,0 +1,87 @@
+"""Serialisation of uploads to the same resource file.
+
+Uploads allocate the next version of a (project, file_path) pair, so two of
+them running at once for the same path would both pick the same number and
+one would fail on unique_project_file_version after all its parse work.
+
+On PostgreSQL each upload takes a transaction-level advisory lock keyed on
+the pair, held until the upload's transaction ends. Other backends, such as
+SQLite in development and tests, fall back to a lock shared by the threads
+of the current process. Uploads to different paths never wait on each other.
+
+Writes to a project's change log take a second, project-wide lock, so the
+log's ids are allocated and committed in the same order. Writers take it
+just before committing, so it is only held briefly.
+"""
+import contextlib
+import hashlib
+import threading
+from collections.abc import Iterator
+
+from django.db import connection, transaction
+
+# Namespaces mixed into every key, so other advisory locks cannot collide with these
+LOCK_NAMESPACE = "locflow.resources.upload"
+CHANGES_LOCK_NAMESPACE = "locflow.resources.changes"
+
+_local_locks: dict[str, tuple[threading.Lock, int]] = {}
+_local_locks_guard = threading.Lock()
+
+
+def resource_file_lock_key(project_id, file_path: str) -> int:
+    """Return the signed 64-bit advisory lock key for a (project, file_path) pair."""
+    digest = hashlib.sha256(f"{LOCK_NAMESPACE}:{project_id}:{file_path}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def lock_project_changes(project_id) -> None:
+    """Hold the project's change log lock until the current transaction ends.
+
+    Only PostgreSQL needs it: SQLite already serialises writing transactions.
+    """
+    if connection.vendor != "postgresql":
+        return
+    digest = hashlib.sha256(f"{CHANGES_LOCK_NAMESPACE}:{project_id}".encode("utf-8")).digest()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [int.from_bytes(digest[:8], "big", signed=True)])
+
+
+@contextlib.contextmanager
+def locked_resource_file(project_id, file_path: str) -> Iterator[None]:
+    """Run the block in a transaction, holding the lock for ``file_path``.
+
+    Uploads of the same path wait here until the one holding the lock has
+    committed, so they see its ResourceFile once they get the lock.
+    """
+    key = resource_file_lock_key(project_id, file_path)
+    if connection.vendor == "postgresql":
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+            yield
+        return
+
+    # The fallback lock is released when this block's transaction ends, which
+    # is only its commit when the upload is not nested in an outer transaction
+    with _local_lock(str(key)), transaction.atomic():
+        yield
+
+
+@contextlib.contextmanager
+def _local_lock(name: str) -> Iterator[None]:
+    """Hold a process-wide lock for ``name``, dropped once no thread uses it."""
+    with _local_locks_guard:
+        lock, users = _local_locks.get(name, (None, 0))
+        if lock is None:
+            lock = threading.Lock()
+        _local_locks[name] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _local_locks_guard:
+            lock, users = _local_locks[name]
+            if users == 1:
+                del _local_locks[name]
+            else:
+                _local_locks[name] = (lock, users - 1)
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resources.blobs import get_blob_store
+from apps.resources.models import ResourceFile
+
+RELEASE_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Apply blob retention and delete stored payloads no resource file references."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-versions",
+            type=int,
+            default=getattr(settings, "BLOB_STORE", {}).get("KEEP_VERSIONS", 0),
+            help="Keep payloads of the latest N versions of each file (0 = keep all).",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Never delete payloads written more recently than this.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deleted without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        store = get_blob_store()
+        if store is None:
+            raise CommandError("The blob store is disabled; set BLOB_STORE_DIR.")
+
+        referenced, expired = self._scan_references(options["keep_versions"])
+        if expired and not options["dry_run"]:
+            for start in range(0, len(expired), RELEASE_BATCH_SIZE):
+                ResourceFile.objects.filter(
+                    id__in=expired[start:start + RELEASE_BATCH_SIZE],
+                ).update(blob_digest="")
+
+        deleted = store.collect_garbage(
+            referenced,
+            grace_seconds=options["grace_hours"] * 3600,
+            dry_run=options["dry_run"],
+        )
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(deleted)} blob(s); released {len(expired)} old version(s)"
+        ))
+
+    def _scan_references(self, keep_versions: int) -> tuple[set[str], list]:
+        """Return the digests still referenced and the ids of versions past retention.
+
+        With ``keep_versions`` > 0, only the latest ``keep_versions`` versions
+        of each (project, file_path) keep their payload.
+        """
+        referenced = set()
+        expired = []
+        group, seen = None, 0
+        rows = (
+            ResourceFile.objects.exclude(blob_digest="")
+            .order_by("project_id", "file_path", "-version")
+            .values_list("id", "project_id", "file_path", "blob_digest")
+        )
+        for pk, project_id, file_path, digest in rows.iterator():
+            if (project_id, file_path) != group:
+                group, seen = (project_id, file_path), 0
+            seen += 1
+            if keep_versions > 0 and seen > keep_versions:
+                expired.append(pk)
+            else:
+                referenced.add(digest)
+        return referenced, expired
@@ -0,0 +1,68 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.resources.jobs import claim_next_job, run_job
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries after the worker loop failed, e.g. while the database is down
+MAX_BACKOFF_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = "Process queued import jobs (async uploads and GitHub syncs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling for new jobs. Errors are raised instead of retried.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "IMPORT_JOBS", {}).get("POLL_INTERVAL", 2.0),
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Exit after processing this many jobs (0 = no limit).",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        failures = 0
+        while not options["max_jobs"] or processed < options["max_jobs"]:
+            # Drop connections the database closed or that outlived CONN_MAX_AGE
+            close_old_connections()
+            try:
+                job = claim_next_job()
+                if job is not None:
+                    self.stdout.write(f"Running {job.kind} job {job.id} for {job.project.slug}")
+                    run_job(job)
+            except Exception:
+                if options["once"]:
+                    raise
+                failures += 1
+                delay = min(options["poll_interval"] * 2 ** failures, MAX_BACKOFF_SECONDS)
+                logger.exception("Import worker loop failed, retrying in %.0f seconds", delay)
+                time.sleep(delay)
+                continue
+            failures = 0
+
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            processed += 1
+            self.stdout.write(f"Job {job.id} {job.status}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)"))
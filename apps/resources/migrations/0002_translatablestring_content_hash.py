@@ -0,0 +1,49 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:09
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def _content_hash(source_text, context, has_plurals, plural_forms):
+    # Frozen copy of parsers.base.compute_content_hash as of this migration
+    payload = json.dumps(
+        [source_text, context, has_plurals, sorted(plural_forms.items())],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def backfill_content_hash(apps, schema_editor):
+    TranslatableString = apps.get_model('resources', 'TranslatableString')
+    batch = []
+    for string in TranslatableString.objects.only(
+        'source_text', 'context', 'has_plurals', 'plural_forms',
+    ).iterator(chunk_size=2000):
+        string.content_hash = _content_hash(
+            string.source_text, string.context, string.has_plurals, string.plural_forms,
+        )
+        batch.append(string)
+        if len(batch) >= 2000:
+            TranslatableString.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        TranslatableString.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translatablestring',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
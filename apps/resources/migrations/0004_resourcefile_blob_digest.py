@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0003_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resourcefile',
+            name='blob_digest',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_githubrepo'),
+        ('resources', '0004_resourcefile_blob_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StringChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('string_id', models.UUIDField()),
+                ('key', models.CharField(max_length=1000)),
+                ('action', models.CharField(choices=[('added', 'Added'), ('updated', 'Updated'), ('removed', 'Removed'), ('translated', 'Translated')], max_length=20)),
+                ('language_code', models.CharField(blank=True, default='', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='string_changes', to='projects.project')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['project', 'id'], name='idx_string_change_cursor')],
+            },
+        ),
+    ]
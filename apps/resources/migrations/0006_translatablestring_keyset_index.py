@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_githubrepo'),
+        ('resources', '0005_stringchange'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='translatablestring',
+            index=models.Index(fields=['project', 'is_active', 'order', 'id'], name='idx_project_active_order'),
+        ),
+    ]
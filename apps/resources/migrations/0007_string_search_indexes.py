@@ -0,0 +1,69 @@
+from django.db import connection, migrations
+
+# SQLite: an FTS5 trigram index of key and source_text, kept in sync by triggers
+SQLITE_FTS_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS resources_translatablestring_fts USING fts5(
+        key, source_text, content='resources_translatablestring', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resources_translatablestring_fts_ai
+    AFTER INSERT ON resources_translatablestring BEGIN
+        INSERT INTO resources_translatablestring_fts(rowid, key, source_text)
+        VALUES (new.rowid, new.key, new.source_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resources_translatablestring_fts_ad
+    AFTER DELETE ON resources_translatablestring BEGIN
+        INSERT INTO resources_translatablestring_fts(resources_translatablestring_fts, rowid, key, source_text)
+        VALUES ('delete', old.rowid, old.key, old.source_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resources_translatablestring_fts_au
+    AFTER UPDATE OF key, source_text ON resources_translatablestring BEGIN
+        INSERT INTO resources_translatablestring_fts(resources_translatablestring_fts, rowid, key, source_text)
+        VALUES ('delete', old.rowid, old.key, old.source_text);
+        INSERT INTO resources_translatablestring_fts(rowid, key, source_text)
+        VALUES (new.rowid, new.key, new.source_text);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO resources_translatablestring_fts(resources_translatablestring_fts) VALUES ('rebuild')",
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if connection.vendor == "postgresql":
+        # idx_source_text_trgm already covers source_text
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_key_trgm "
+            "ON resources_translatablestring "
+            "USING gin (key gin_trgm_ops);"
+        )
+    elif connection.vendor == "sqlite":
+        for statement in SQLITE_FTS_STATEMENTS:
+            schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS idx_key_trgm;")
+    elif connection.vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS resources_translatablestring_fts_{suffix}")
+        schema_editor.execute("DROP TABLE IF EXISTS resources_translatablestring_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0006_translatablestring_keyset_index"),
+        ("translations", "0003_add_trgm_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_translations(apps, schema_editor):
+    TranslatableString = apps.get_model("resources", "TranslatableString")
+    Translation = apps.get_model("translations", "Translation")
+    counts = (
+        Translation.objects.filter(string=OuterRef("pk"))
+        .values("string")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    TranslatableString.objects.update(translation_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0007_string_search_indexes'),
+        ('translations', '0003_add_trgm_index'),
+    ]
+
+    # Adding the column rebuilds the table on SQLite, dropping its search
+    # triggers; the post_migrate hook in apps.resources recreates them
+    operations = [
+        migrations.AddField(
+            model_name='translatablestring',
+            name='translation_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_translations, migrations.RunPython.noop),
+    ]
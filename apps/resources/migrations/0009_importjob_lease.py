@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_leases(apps, schema_editor):
+    # Jobs already claimed count as one attempt, last heard from when they started
+    ImportJob = apps.get_model("resources", "ImportJob")
+    ImportJob.objects.filter(started_at__isnull=False).update(attempts=1, heartbeat_at=F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0008_translatablestring_translation_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_leases, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,11 @@ import uuid
 
 from django.db import models
 
+from parsers.base import compute_content_hash
+
+# Fields covered by TranslatableString.content_hash
+CONTENT_FIELDS = ("source_text", "context", "has_plurals", "plural_forms")
+
 
 class ResourceFile(models.Model):
     FORMAT_CHOICES = [
@@ -21,6 +26,8 @@ class ResourceFile(models.Model):
     file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
     version = models.PositiveIntegerField(default=1)
     checksum = models.CharField(max_length=64)
+    # Digest of the raw payload in the blob store, empty if it was not kept
+    blob_digest = models.CharField(max_length=64, blank=True, default="", db_index=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -55,6 +62,10 @@ class TranslatableString(models.Model):
     has_plurals = models.BooleanField(default=False)
     plural_forms = models.JSONField(default=dict, blank=True)
     order = models.PositiveIntegerField(default=0)
+    # SHA-256 of CONTENT_FIELDS, computed like ParsedEntry.content_hash
+    content_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    # Number of languages with a translation, maintained by Translation.save()/delete()
+    translation_count = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -72,7 +83,115 @@ class TranslatableString(models.Model):
                 fields=["project", "is_active"],
                 name="idx_project_active",
             ),
+            # Keyset pagination of list_strings
+            models.Index(
+                fields=["project", "is_active", "order", "id"],
+                name="idx_project_active_order",
+            ),
         ]
 
     def __str__(self):
         return self.key
+
+    def save(self, *args, **kwargs):
+        self.content_hash = compute_content_hash(
+            self.source_text, self.context, self.has_plurals, self.plural_forms,
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(CONTENT_FIELDS).isdisjoint(update_fields):
+            kwargs["update_fields"] = {*update_fields, "content_hash"}
+        super().save(*args, **kwargs)
+
+
+class ImportJob(models.Model):
+    KIND_CHOICES = [
+        ("upload", "File upload"),
+        ("github_sync", "GitHub sync"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Upload jobs: the uploaded file, spooled to disk until a worker processes it
+    file_path = models.CharField(max_length=500, blank=True, default="")
+    file_format = models.CharField(max_length=10, blank=True, default="")
+    spool_path = models.CharField(max_length=1000, blank=True, default="")
+    # Progress counts, updated as files are processed
+    total_files = models.PositiveIntegerField(default=0)
+    processed_files = models.PositiveIntegerField(default=0)
+    new = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    removed = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Running jobs: refreshed by the worker; a job not heard from within the
+    # lease is requeued. attempts counts claims and identifies the current one.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="idx_import_job_queue",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.id} ({self.status})"
+
+
+class StringChange(models.Model):
+    """Append-only log entry for a change to a string or one of its translations.
+
+    The id is the cursor of the project's changes feed. Rows are appended
+    at the end of the writing transaction while holding the project's
+    change lock, so within a project ids become visible in increasing order.
+    """
+    ACTION_CHOICES = [
+        ("added", "Added"),
+        ("updated", "Updated"),
+        ("removed", "Removed"),
+        ("translated", "Translated"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    project = models.ForeignKey(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        related_name="string_changes",
+    )
+    # Not a foreign key, so entries outlive the strings they describe
+    string_id = models.UUIDField()
+    key = models.CharField(max_length=1000)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    # Set for translation changes
+    language_code = models.CharField(max_length=20, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["project", "id"],
+                name="idx_string_change_cursor",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key} {self.action}"
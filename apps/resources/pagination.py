@@ -0,0 +1,127 @@
+"""Keyset (cursor) pagination for large string listings.
+
+Pages are ordered by a unique key such as ``(order, id)``, and each page
+starts with a WHERE clause on the last key returned rather than an OFFSET,
+so the database seeks straight to the page through the matching index and a
+deep page costs the same as the first. Cursors are opaque tokens encoding
+that key; they only move forward.
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Fields that together identify a row; "-" marks a descending one
+    ordering = ("order", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering: tuple[str, ...] | None = None):
+        if ordering is not None:
+            self.ordering = ordering
+        self.page_size = getattr(settings, "REST_FRAMEWORK", {}).get("PAGE_SIZE") or 50
+        self.next_position = None
+        self.request = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position))
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether there is a next page
+        results = list(queryset[:page_size + 1])
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_position = [self._value(results[-1], field) for field in self.ordering]
+        else:
+            self.next_position = None
+        return results
+
+    def get_paginated_response(self, data):
+        next_cursor = self.encode_cursor(self.next_position)
+        return Response({
+            "next": self.get_next_link(),
+            "next_cursor": next_cursor,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_page_size(self, request) -> int:
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, position: list | None) -> str | None:
+        if position is None:
+            return None
+        raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request) -> list | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            position = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def _after(self, position: list) -> Q:
+        """Rows strictly after ``position`` in ``ordering`` order."""
+        condition = Q()
+        for i in reversed(range(len(self.ordering))):
+            field = self.ordering[i].lstrip("-")
+            comparison = "lt" if self.ordering[i].startswith("-") else "gt"
+            after = Q(**{f"{field}__{comparison}": position[i]})
+            if i < len(self.ordering) - 1:
+                after |= Q(**{field: position[i]}) & condition
+            condition = after
+        return condition
+
+    @staticmethod
+    def _value(obj, field: str):
+        value = getattr(obj, field.lstrip("-"))
+        return value if isinstance(value, (int, float, str)) or value is None else str(value)
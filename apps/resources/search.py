@@ -0,0 +1,135 @@
+"""Indexed substring search over string keys and source texts.
+
+On PostgreSQL the search is a case-insensitive ILIKE on key and source_text,
+which the planner answers from the trigram GIN indexes on both columns
+(idx_key_trgm, idx_source_text_trgm) instead of scanning every string. On
+SQLite it is an FTS5 MATCH against a trigram-tokenized shadow table kept in
+sync by triggers, which a post_migrate hook recreates whenever a migration
+has dropped them. Queries too short for trigrams, and other backends, fall
+back to icontains.
+
+Matches are ranked: an exact key first, then an exact source text, a key
+prefix, a source text prefix and any other match. Ties keep the usual
+(order, id) order, so results page with KeysetPagination.
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import Case, F, IntegerField, Lookup, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+
+from apps.resources.models import TranslatableString
+
+logger = logging.getLogger(__name__)
+
+# Trigram indexes cannot answer queries shorter than this
+MIN_TRIGRAM_LENGTH = 3
+
+# Pagination order of search results
+SEARCH_ORDERING = ("-search_rank", "order", "id")
+
+STRINGS_TABLE = TranslatableString._meta.db_table
+SQLITE_FTS_TABLE = f"{STRINGS_TABLE}_fts"
+SQLITE_FTS_TRIGGERS = tuple(f"{SQLITE_FTS_TABLE}_{suffix}" for suffix in ("ai", "ad", "au"))
+
+# The migration that first creates the search indexes
+SEARCH_MIGRATION = ("resources", "0007_string_search_indexes")
+
+# Same statements as that migration, which keeps its own copy
+SQLITE_FTS_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        key, source_text, content='{STRINGS_TABLE}', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON {STRINGS_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, key, source_text)
+        VALUES (new.rowid, new.key, new.source_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON {STRINGS_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, key, source_text)
+        VALUES ('delete', old.rowid, old.key, old.source_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF key, source_text ON {STRINGS_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, key, source_text)
+        VALUES ('delete', old.rowid, old.key, old.source_text);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, key, source_text)
+        VALUES (new.rowid, new.key, new.source_text);
+    END
+    """,
+    # Index the rows that already exist
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+class ILike(Lookup):
+    """``lhs ILIKE rhs``, which trigram GIN indexes can answer, unlike UPPER(lhs) LIKE."""
+    lookup_name = "ilike"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+def search_strings(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter ``queryset`` to strings whose key or source text contains ``query``.
+
+    The result is annotated with ``search_rank``, higher for better matches.
+    """
+    return queryset.filter(_match(query)).annotate(search_rank=Case(
+        When(key__iexact=query, then=Value(5)),
+        When(source_text__iexact=query, then=Value(4)),
+        When(key__istartswith=query, then=Value(3)),
+        When(source_text__istartswith=query, then=Value(2)),
+        default=Value(1),
+        output_field=IntegerField(),
+    ))
+
+
+def _match(query: str) -> Q:
+    if connection.vendor == "postgresql":
+        pattern = f"%{connection.ops.prep_for_like_query(query)}%"
+        return Q(ILike(F("key"), pattern)) | Q(ILike(F("source_text"), pattern))
+
+    if connection.vendor == "sqlite" and len(query) >= MIN_TRIGRAM_LENGTH:
+        # A quoted FTS5 string is matched as a substring by the trigram tokenizer
+        phrase = '"' + query.replace('"', '""') + '"'
+        return Q(id__in=RawSQL(
+            f"SELECT t.id FROM {STRINGS_TABLE} AS t WHERE t.rowid IN "
+            f"(SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s)",
+            [phrase],
+        ))
+
+    return Q(key__icontains=query) | Q(source_text__icontains=query)
+
+
+def ensure_sqlite_search_index(using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """Recreate the SQLite search table and triggers if they are missing.
+
+    Connected to post_migrate: a migration that makes Django rebuild
+    resources_translatablestring on SQLite drops the triggers with the old
+    table, and searches would silently stop seeing new strings.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return
+    names = {SQLITE_FTS_TABLE, *SQLITE_FTS_TRIGGERS}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})",
+            list(names),
+        )
+        if {name for name, in cursor.fetchall()} == names:
+            return
+        logger.info("Recreating the string search index of database %r", using)
+        for statement in SQLITE_FTS_STATEMENTS:
+            cursor.execute(statement)
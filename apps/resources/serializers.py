@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources.models import ImportJob, ResourceFile, StringChange, TranslatableString
 from apps.translations.models import Translation
 
 
@@ -57,7 +57,6 @@ class TranslatableStringSerializer(serializers.ModelSerializer):
 
 class TranslatableStringListSerializer(serializers.ModelSerializer):
     """Lighter serializer for list views (without inline translations)."""
-    translation_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = TranslatableString
@@ -79,3 +78,45 @@ class FileUploadSerializer(serializers.Serializer):
         choices=["json", "po", "strings", "xliff"],
         required=False,
     )
+
+
+class ArchiveUploadSerializer(serializers.Serializer):
+    file = serializers.FileField()
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "project",
+            "kind",
+            "status",
+            "file_path",
+            "total_files",
+            "processed_files",
+            "new",
+            "updated",
+            "removed",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "attempts",
+        ]
+        read_only_fields = fields
+
+
+class StringChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StringChange
+        fields = [
+            "id",
+            "string_id",
+            "key",
+            "action",
+            "language_code",
+            "created_at",
+        ]
+        read_only_fields = fields
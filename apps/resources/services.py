@@ -1,14 +1,93 @@
+import contextlib
+import functools
 import hashlib
+import logging
+import mmap
+import multiprocessing
+import os
+import tarfile
+import uuid
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 
-from django.db import transaction
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection
+from django.utils import timezone
 
 from apps.projects.models import Project
-from apps.resources.models import ResourceFile, TranslatableString
-from parsers.factory import ParserFactory
+from apps.resources import changes as change_log
+from apps.resources.blobs import get_blob_store
+from apps.resources.copy_import import apply_with_copy
+from apps.resources.diff import CHANGED, NEW, REMOVED, iter_stored_strings, merge_diff, sort_entries
+from apps.resources.locks import locked_resource_file
+from apps.resources.models import CONTENT_FIELDS, ResourceFile, TranslatableString
+from parsers.base import ParsedBatch, ParsedEntry, RawContent
+from parsers.cache import DEFAULT_MAX_ROWS, ParseCache
+from parsers.factory import parse_content
 
+logger = logging.getLogger(__name__)
 
-def compute_checksum(content: str) -> str:
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def compute_checksum(content: RawContent) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def compute_file_checksum(uploaded_file: UploadedFile) -> str:
+    """Hash an uploaded file chunk by chunk, without reading it into memory."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def open_upload_buffer(uploaded_file: UploadedFile) -> Iterator[RawContent]:
+    """Yield the content of an uploaded file as a byte buffer.
+
+    Uploads backed by a file on disk, such as those Django spooled to a
+    temporary file, are memory-mapped, so the content is paged in by the
+    parser rather than copied onto the heap. In-memory uploads expose their
+    existing buffer.
+    """
+    file = uploaded_file.file
+    try:
+        fileno = file.fileno()
+    except (AttributeError, OSError):
+        fileno = None
+
+    if fileno is not None:
+        # Empty files cannot be mapped
+        if os.fstat(fileno).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+        return
+
+    if hasattr(file, "getbuffer"):
+        buffer = file.getbuffer()
+        try:
+            yield buffer
+        finally:
+            buffer.release()
+        return
+
+    uploaded_file.seek(0)
+    yield uploaded_file.read()
+
+
+@functools.cache
+def get_parse_cache() -> ParseCache:
+    """Get the process-wide parse cache configured from settings."""
+    config = getattr(settings, "PARSE_CACHE", {})
+    return ParseCache(
+        max_rows=config.get("MAX_ROWS", DEFAULT_MAX_ROWS),
+        directory=config.get("DIRECTORY") or None,
+    )
 
 
 def detect_format_from_filename(filename: str) -> str | None:
@@ -24,15 +103,60 @@ def detect_format_from_filename(filename: str) -> str | None:
     return format_map.get(ext)
 
 
-@transaction.atomic
-def process_upload(project: Project, file_content: str, file_path: str, file_format: str) -> dict:
+# Columns written when a string changed, besides resource_file and updated_at
+UPDATE_FIELDS = (*CONTENT_FIELDS, "max_length", "order", "content_hash", "is_active")
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the queries run through it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def process_upload(
+    project: Project,
+    file_content: RawContent,
+    file_path: str,
+    file_format: str,
+    batch: ParsedBatch | None = None,
+    checksum: str | None = None,
+) -> dict:
     """Process an uploaded resource file.
 
     Parses the file, detects changes from previous version, and saves strings.
+    ``file_content`` may be text or a UTF-8 byte buffer. ``batch`` may hold
+    the already parsed content, in which case it is used instead of parsing
+    ``file_content`` again, and ``checksum`` the already computed digest.
 
-    Returns a summary dict with counts of new, updated, and removed strings.
+    Uploads of the same ``file_path`` in a project run one at a time, so
+    each gets its own version; a later upload of identical content waits
+    for the first and returns its version as unchanged.
+
+    Returns a summary dict with counts of new, updated, and removed strings,
+    and the number of database queries the import made.
     """
-    checksum = compute_checksum(file_content)
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter), locked_resource_file(project.id, file_path):
+        summary = _apply_upload(project, file_content, file_path, file_format, batch, checksum)
+    summary["queries"] = counter.count
+    return summary
+
+
+def _apply_upload(
+    project: Project,
+    file_content: RawContent,
+    file_path: str,
+    file_format: str,
+    batch: ParsedBatch | None,
+    checksum: str | None,
+) -> dict:
+    if checksum is None:
+        checksum = compute_checksum(file_content)
 
     # Check if this exact file was already uploaded
     existing = ResourceFile.objects.filter(
@@ -58,35 +182,85 @@ def process_upload(project: Project, file_content: str, file_path: str, file_for
         .first()
     ) or 0
 
+    # Keep the raw payload; identical content is stored once across projects
+    blob_store = get_blob_store()
+    blob_digest = blob_store.put(file_content, checksum) if blob_store is not None else ""
+
     resource_file = ResourceFile.objects.create(
         project=project,
         file_path=file_path,
         file_format=file_format,
         version=last_version + 1,
         checksum=checksum,
+        blob_digest=blob_digest,
     )
 
-    # Parse the file
-    parser = ParserFactory.get_parser(file_format)
-    entries = parser.parse(file_content)
+    # Parse the file, reusing the result for content that was parsed before
+    if batch is not None:
+        entries = batch
+    else:
+        entries = get_parse_cache().get_or_parse(file_format, file_content, checksum)
+
+    config = getattr(settings, "RESOURCE_IMPORT", {})
+    copy_min_rows = config.get("COPY_MIN_ROWS")
+    if connection.vendor == "postgresql" and copy_min_rows is not None and len(entries) >= copy_min_rows:
+        new_count, updated_count, removed_count = apply_with_copy(project, resource_file, entries)
+    else:
+        new_count, updated_count, removed_count = _write_strings(
+            project, resource_file, file_path, entries, config,
+        )
 
-    # Get existing active strings for this project
-    existing_strings = {
-        s.key: s
-        for s in TranslatableString.objects.filter(project=project, is_active=True)
+    return {
+        "resource_file_id": str(resource_file.id),
+        "version": resource_file.version,
+        "status": "processed",
+        "new": new_count,
+        "updated": updated_count,
+        "removed": removed_count,
     }
 
-    new_count = 0
-    updated_count = 0
-    seen_keys = set()
 
-    for entry in entries:
-        seen_keys.add(entry.key)
-        existing_string = existing_strings.get(entry.key)
+def _write_strings(
+    project: Project,
+    resource_file: ResourceFile,
+    file_path: str,
+    entries: ParsedBatch,
+    config: dict,
+) -> tuple[int, int, int]:
+    """Apply parsed entries through the ORM; returns new, updated and removed counts.
 
-        if existing_string is None:
-            # New string
-            TranslatableString.objects.create(
+    The key-sorted parser output is merged with the project's strings
+    streamed in key order, and the resulting writes and change log entries
+    are flushed batch by batch during the merge, so memory is bounded by the
+    batch sizes rather than by the size of the upload.
+    """
+    create_batch_size = config.get("CREATE_BATCH_SIZE") or 1000
+    update_batch_size = config.get("UPDATE_BATCH_SIZE") or 500
+    new_strings = []
+    changed_entries: dict[uuid.UUID, ParsedEntry] = {}
+    removed_ids = []
+    logged = []
+    new_count = updated_count = removed_count = 0
+    pending_changes = change_log.DeferredChanges(project.id)
+
+    def flush() -> None:
+        nonlocal removed_count
+        TranslatableString.objects.bulk_create(new_strings, batch_size=create_batch_size)
+        _update_changed_strings(changed_entries, resource_file, update_batch_size)
+        if removed_ids:
+            # Mark strings that came from this file but are no longer in it as inactive
+            removed_count += TranslatableString.objects.filter(id__in=removed_ids).update(is_active=False)
+        # Logged after the writes, so new strings exist when their entries reference them
+        pending_changes.record(logged)
+        new_strings.clear()
+        changed_entries.clear()
+        removed_ids.clear()
+        logged.clear()
+
+    for result in merge_diff(iter_stored_strings(project), sort_entries(entries)):
+        if result.status == NEW and result.stored is None:
+            entry = result.entry
+            new_strings.append(TranslatableString(
                 project=project,
                 resource_file=resource_file,
                 key=entry.key,
@@ -94,44 +268,235 @@ def process_upload(project: Project, file_content: str, file_path: str, file_for
                 context=entry.context,
                 max_length=entry.max_length,
                 has_plurals=entry.has_plurals,
-                plural_forms=entry.plural_forms,
+                plural_forms=dict(entry.plural_forms),
                 order=entry.order,
-            )
+                content_hash=entry.content_hash,
+            ))
+            new_count += 1
+            logged.append((new_strings[-1].id, entry.key, change_log.ADDED))
+        elif result.status == NEW:
+            # A previously removed key is back: reactivate its row
+            changed_entries[result.stored.id] = result.entry
             new_count += 1
+            logged.append((result.stored.id, result.key, change_log.ADDED))
+        elif result.status == CHANGED:
+            changed_entries[result.stored.id] = result.entry
+            updated_count += 1
+            logged.append((result.stored.id, result.key, change_log.UPDATED))
+        elif result.status == REMOVED and result.stored.file_path == file_path:
+            # Strings from the project's other resource files are left alone
+            removed_ids.append(result.stored.id)
+            logged.append((result.stored.id, result.key, change_log.REMOVED))
         else:
-            # Check if source text changed
-            changed = (
-                existing_string.source_text != entry.source_text
-                or existing_string.context != entry.context
-                or existing_string.has_plurals != entry.has_plurals
-                or existing_string.plural_forms != entry.plural_forms
-            )
-            if changed:
-                existing_string.source_text = entry.source_text
-                existing_string.context = entry.context
-                existing_string.max_length = entry.max_length
-                existing_string.has_plurals = entry.has_plurals
-                existing_string.plural_forms = entry.plural_forms
-                existing_string.order = entry.order
-                existing_string.resource_file = resource_file
-                existing_string.save()
-                updated_count += 1
-
-    # Mark removed strings as inactive
-    removed_keys = set(existing_strings.keys()) - seen_keys
-    removed_count = 0
-    if removed_keys:
-        removed_count = TranslatableString.objects.filter(
-            project=project,
-            key__in=removed_keys,
-            is_active=True,
-        ).update(is_active=False)
+            continue
 
-    return {
-        "resource_file_id": str(resource_file.id),
-        "version": resource_file.version,
-        "status": "processed",
-        "new": new_count,
-        "updated": updated_count,
-        "removed": removed_count,
-    }
+        if (
+            len(new_strings) >= create_batch_size
+            or len(changed_entries) >= update_batch_size
+            or len(removed_ids) >= update_batch_size
+        ):
+            flush()
+
+    flush()
+    pending_changes.publish()
+    return new_count, updated_count, removed_count
+
+
+def _update_changed_strings(
+    changed_entries: dict[uuid.UUID, ParsedEntry],
+    resource_file: ResourceFile,
+    batch_size: int,
+) -> None:
+    """Write changed entries over their strings, loading only those rows.
+
+    Strings are loaded and written batch by batch. Each batch is grouped by
+    the columns that actually differ, so every UPDATE only sets those columns
+    plus resource_file and updated_at.
+    """
+    now = timezone.now()
+    ids = list(changed_entries)
+    for start in range(0, len(ids), batch_size):
+        # Changed strings, grouped by the columns that actually differ
+        updates: dict[tuple[str, ...], list[TranslatableString]] = {}
+        for pk, string in TranslatableString.objects.in_bulk(ids[start:start + batch_size]).items():
+            entry = changed_entries[pk]
+            values = {
+                "source_text": entry.source_text,
+                "context": entry.context,
+                "has_plurals": entry.has_plurals,
+                "plural_forms": dict(entry.plural_forms),
+                "max_length": entry.max_length,
+                "order": entry.order,
+                "content_hash": entry.content_hash,
+                "is_active": True,
+            }
+            fields = [name for name in UPDATE_FIELDS if getattr(string, name) != values[name]]
+            for name in fields:
+                setattr(string, name, values[name])
+            string.resource_file = resource_file
+            # bulk_update() does not apply auto_now
+            string.updated_at = now
+            updates.setdefault((*fields, "resource_file", "updated_at"), []).append(string)
+
+        for fields, strings in updates.items():
+            TranslatableString.objects.bulk_update(strings, fields)
+
+
+def load_resource_content(resource_file: ResourceFile) -> bytes | None:
+    """Return the raw payload of ``resource_file`` from the blob store, if it was kept."""
+    blob_store = get_blob_store()
+    if blob_store is None or not resource_file.blob_digest:
+        return None
+    return blob_store.get(resource_file.blob_digest)
+
+
+def process_uploaded_file(project: Project, uploaded_file: UploadedFile, file_format: str) -> dict:
+    """Process an uploaded file without reading it into memory as a whole.
+
+    The checksum is computed over the upload's chunks, and the parser reads
+    the file through open_upload_buffer(), so the content is neither joined
+    into one bytes object nor decoded and re-encoded to be hashed.
+    """
+    checksum = compute_file_checksum(uploaded_file)
+    with open_upload_buffer(uploaded_file) as content:
+        return process_upload(project, content, uploaded_file.name, file_format, checksum=checksum)
+
+
+def iter_archive_members(archive) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(path, data)`` for each resource file in a zip or tar archive.
+
+    Directories, members in an unsupported format and macOS metadata files
+    are skipped. Raises ValueError if ``archive`` is not a readable archive or
+    exceeds the limits in ``settings.ARCHIVE_UPLOAD``.
+    """
+    config = getattr(settings, "ARCHIVE_UPLOAD", {})
+    max_members = config.get("MAX_MEMBERS", 1000)
+    max_total_size = config.get("MAX_TOTAL_SIZE", 256 * 1024 * 1024)
+
+    if zipfile.is_zipfile(archive):
+        archive.seek(0)
+        with zipfile.ZipFile(archive) as zf:
+            members = [
+                (info.filename, info.file_size, info)
+                for info in zf.infolist()
+                if not info.is_dir() and _is_resource_path(info.filename)
+            ]
+            _check_archive_limits(members, max_members, max_total_size)
+            for path, _, info in members:
+                yield path, zf.read(info)
+        return
+
+    archive.seek(0)
+    try:
+        tf = tarfile.open(fileobj=archive, mode="r:*")
+    except tarfile.TarError:
+        raise ValueError("File must be a zip or tar archive.")
+    with tf:
+        members = [
+            (info.name, info.size, info)
+            for info in tf.getmembers()
+            if info.isfile() and _is_resource_path(info.name)
+        ]
+        _check_archive_limits(members, max_members, max_total_size)
+        for path, _, info in members:
+            yield path, tf.extractfile(info).read()
+
+
+def _check_archive_limits(members: list, max_members: int, max_total_size: int) -> None:
+    if len(members) > max_members:
+        raise ValueError(f"Archive contains more than {max_members} resource files.")
+    # Sizes come from the archive headers, so nothing is decompressed yet
+    if sum(size for _, size, _ in members) > max_total_size:
+        raise ValueError(f"Archive expands to more than {max_total_size} bytes.")
+
+
+def _is_resource_path(path: str) -> bool:
+    name = path.rsplit("/", 1)[-1]
+    if path.startswith("__MACOSX/") or name.startswith("."):
+        return False
+    return detect_format_from_filename(name) is not None
+
+
+def process_archive(project: Project, archive) -> dict:
+    """Process every resource file in a zip or tar archive.
+
+    Members whose content is not in the parse cache are parsed concurrently
+    in a process pool. The results are then applied one file at a time with
+    process_upload(), in archive order, and summarised like a repository sync.
+    """
+    results = {"files_found": 0, "files_processed": 0, "errors": [], "details": []}
+
+    # Member bytes are parsed as they are; parsers report invalid UTF-8
+    members = []
+    for path, data in iter_archive_members(archive):
+        results["files_found"] += 1
+        members.append((path, detect_format_from_filename(path), data, compute_checksum(data)))
+
+    # Parse each distinct content once, skipping what is already cached
+    cache = get_parse_cache()
+    batches: dict[tuple[str, str], ParsedBatch] = {}
+    pending: dict[tuple[str, str], bytes] = {}
+    for _, file_format, content, checksum in members:
+        key = (file_format, checksum)
+        if key in batches or key in pending:
+            continue
+        batch = cache.get(file_format, checksum)
+        if batch is None:
+            pending[key] = content
+        else:
+            batches[key] = batch
+
+    parse_errors = {}
+    for key, outcome in _parse_in_pool(pending):
+        if isinstance(outcome, ParsedBatch):
+            cache.put(*key, outcome)
+            batches[key] = outcome
+        else:
+            parse_errors[key] = outcome
+
+    for path, file_format, content, checksum in members:
+        key = (file_format, checksum)
+        if key in parse_errors:
+            results["errors"].append({"path": path, "error": str(parse_errors[key])})
+            continue
+        try:
+            result = process_upload(project, content, path, file_format, batch=batches[key], checksum=checksum)
+        except Exception as e:
+            logger.warning("Failed to process %s: %s", path, e)
+            results["errors"].append({"path": path, "error": str(e)})
+            continue
+        results["details"].append({"path": path, **result})
+        results["files_processed"] += 1
+
+    for field in ("new", "updated", "removed", "queries"):
+        results[field] = sum(detail[field] for detail in results["details"])
+    return results
+
+
+def _parse_in_pool(pending: dict[tuple[str, str], bytes]) -> Iterator[tuple[tuple[str, str], object]]:
+    """Parse ``pending`` contents, yielding ``(key, batch_or_exception)``.
+
+    Worker processes are spawned rather than forked, so they never inherit
+    database connections or server threads. A single file is parsed inline.
+    """
+    config = getattr(settings, "ARCHIVE_UPLOAD", {})
+    max_workers = min(config.get("MAX_WORKERS") or os.cpu_count() or 1, len(pending))
+
+    if max_workers <= 1:
+        for key, content in pending.items():
+            try:
+                yield key, parse_content(key[0], content)
+            except Exception as e:
+                yield key, e
+        return
+
+    with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {
+            key: pool.submit(parse_content, key[0], content)
+            for key, content in pending.items()
+        }
+        for key, future in futures.items():
+            try:
+                yield key, future.result()
+            except Exception as e:
+                yield key, e
@@ -1,12 +1,24 @@
+import hashlib
+import io
 import json
+import mmap
+import tarfile
+import zipfile
 
 import pytest
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
 from django.urls import reverse
 from rest_framework import status
 
 from apps.projects.models import Project
-from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources.models import ResourceFile, StringChange, TranslatableString
+from apps.resources.services import (
+    compute_checksum,
+    compute_file_checksum,
+    open_upload_buffer,
+    process_upload,
+    process_uploaded_file,
+)
 
 
 @pytest.fixture
@@ -68,6 +80,201 @@ class TestUploadAPI:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+    def test_upload_other_file_keeps_existing_strings(self, api_client, project):
+        url = reverse("resource-upload", kwargs={"slug": "test-project"})
+        api_client.post(url, {"file": SimpleUploadedFile("a.json", b'{"a": "A"}')}, format="multipart")
+        response = api_client.post(url, {"file": SimpleUploadedFile("b.json", b'{"b": "B"}')}, format="multipart")
+
+        assert response.data["removed"] == 0
+        assert TranslatableString.objects.filter(project=project, is_active=True).count() == 2
+
+    def test_upload_query_count_does_not_grow_with_strings(self, project, settings):
+        settings.RESOURCE_IMPORT = {"CREATE_BATCH_SIZE": 50, "UPDATE_BATCH_SIZE": 50}
+        other = Project.objects.create(name="Other", slug="other")
+        small = process_upload(other, json.dumps({"only": "One"}), "small.json", "json")
+        content = json.dumps({f"k{i}": f"Value {i}" for i in range(300)})
+        large = process_upload(project, content, "large.json", "json")
+
+        assert large["new"] == 300
+        # One INSERT per batch of 50 strings and of 50 change log entries
+        # on top of the same fixed cost
+        assert large["queries"] == small["queries"] + 10
+
+    def test_upload_flushes_batches_during_merge(self, project, settings, monkeypatch):
+        process_upload(project, json.dumps({f"k{i:02}": f"V{i}" for i in range(0, 20, 2)}), "m.json", "json")
+        settings.RESOURCE_IMPORT = {"CREATE_BATCH_SIZE": 2, "UPDATE_BATCH_SIZE": 2}
+        flushed_at = []
+        original = TranslatableString.objects.bulk_create
+
+        def bulk_create(objs, *args, **kwargs):
+            if objs:
+                flushed_at.append(objs[0].key)
+            return original(objs, *args, **kwargs)
+
+        monkeypatch.setattr(TranslatableString.objects, "bulk_create", bulk_create)
+        content = {f"k{i:02}": f"V{i}" for i in range(20) if i % 4}
+        content.update({"k04": "changed", "k12": "changed"})
+        result = process_upload(project, json.dumps(content), "m.json", "json")
+
+        # Half of the old keys are gone, and every odd key is new
+        assert (result["new"], result["updated"], result["removed"]) == (10, 2, 3)
+        assert flushed_at == ["k01", "k05", "k09", "k13", "k17"]
+        active = TranslatableString.objects.filter(project=project, is_active=True)
+        assert sorted(active.values_list("key", flat=True)) == sorted(content)
+        assert active.get(key="k12").source_text == "changed"
+        assert StringChange.objects.filter(project=project).count() == 10 + 10 + 2 + 3
+
+    def test_upload_updates_only_changed_strings(self, project):
+        process_upload(project, json.dumps({"a": "A", "b": "B", "c": "C"}), "m.json", "json")
+        before = {s.key: s.updated_at for s in TranslatableString.objects.filter(project=project)}
+
+        result = process_upload(project, json.dumps({"a": "A", "b": "B!", "c": "C!"}), "m.json", "json")
+        strings = {s.key: s for s in TranslatableString.objects.filter(project=project)}
+
+        assert result["updated"] == 2
+        assert strings["a"].updated_at == before["a"]
+        assert strings["b"].updated_at > before["b"]
+        assert strings["b"].source_text == "B!"
+        assert strings["b"].resource_file_id == strings["c"].resource_file_id != strings["a"].resource_file_id
+
+    def test_reordered_strings_are_not_updated(self, project):
+        process_upload(project, json.dumps({"a": "A", "b": "B"}), "m.json", "json")
+        result = process_upload(project, json.dumps({"b": "B", "a": "A", "c": "C"}), "m.json", "json")
+
+        assert result["new"] == 1
+        assert result["updated"] == 0
+
+    def test_identical_strings_share_content_hash(self, project):
+        other = Project.objects.create(name="Other", slug="other")
+        process_upload(project, json.dumps({"save": "Save"}), "en.json", "json")
+        process_upload(other, json.dumps({"actions.save": "Save"}), "en.json", "json")
+
+        hashes = TranslatableString.objects.values_list("content_hash", flat=True)
+        assert len(set(hashes)) == 1
+
+    def test_upload_non_utf8_file(self, api_client, project):
+        url = reverse("resource-upload", kwargs={"slug": "test-project"})
+        file = SimpleUploadedFile("test.json", '{"key": "café"}'.encode("latin-1"))
+        response = api_client.post(url, {"file": file}, format="multipart")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "File must be UTF-8 encoded."
+        assert not ResourceFile.objects.filter(project=project).exists()
+
+    def test_upload_temporary_file_is_memory_mapped(self, project):
+        content = '{"greeting": "Grüß dich", "farewell": "Tschüss"}'.encode("utf-8")
+        uploaded_file = TemporaryUploadedFile("big.json", "application/json", len(content), "utf-8")
+        uploaded_file.write(content)
+        uploaded_file.seek(0)
+
+        with open_upload_buffer(uploaded_file) as buffer:
+            assert isinstance(buffer, mmap.mmap)
+        result = process_uploaded_file(project, uploaded_file, "json")
+        uploaded_file.close()
+
+        assert result["new"] == 2
+        assert ResourceFile.objects.get(project=project).checksum == hashlib.sha256(content).hexdigest()
+
+    def test_empty_temporary_file(self, project):
+        uploaded_file = TemporaryUploadedFile("empty.json", "application/json", 0, "utf-8")
+
+        with open_upload_buffer(uploaded_file) as buffer:
+            assert buffer == b""
+        uploaded_file.close()
+
+    def test_checksum_is_computed_over_chunks(self, project):
+        content = json.dumps({f"key{i}": f"Value {i}" for i in range(2000)}).encode("utf-8")
+        uploaded_file = SimpleUploadedFile("chunks.json", content)
+        uploaded_file.DEFAULT_CHUNK_SIZE = 1024
+
+        assert compute_file_checksum(uploaded_file) == compute_checksum(content)
+        assert compute_checksum(content) == compute_checksum(content.decode("utf-8"))
+
+
+def _zip_archive(members: dict[str, str]) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return SimpleUploadedFile("resources.zip", buffer.getvalue())
+
+
+@pytest.mark.django_db
+class TestArchiveUploadAPI:
+    def test_upload_zip_archive(self, api_client, project):
+        archive = _zip_archive({
+            "en/app.json": json.dumps({"greeting": "Hello", "farewell": "Goodbye"}),
+            "en/messages.po": 'msgid "Save"\nmsgstr ""\n',
+            "README.md": "not a resource",
+            "__MACOSX/en/._app.json": "metadata",
+        })
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        response = api_client.post(url, {"file": archive}, format="multipart")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["files_found"] == 2
+        assert response.data["files_processed"] == 2
+        assert response.data["new"] == 3
+        assert response.data["errors"] == []
+        assert {d["path"] for d in response.data["details"]} == {"en/app.json", "en/messages.po"}
+        assert TranslatableString.objects.filter(project=project, is_active=True).count() == 3
+
+    def test_upload_tar_archive(self, api_client, project):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+            data = json.dumps({"key": "value"}).encode("utf-8")
+            info = tarfile.TarInfo("locales/en.json")
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        archive = SimpleUploadedFile("resources.tar.gz", buffer.getvalue())
+
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        response = api_client.post(url, {"file": archive}, format="multipart")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["details"][0]["path"] == "locales/en.json"
+        assert response.data["new"] == 1
+
+    def test_member_errors_are_reported(self, api_client, project):
+        archive = _zip_archive({
+            "good.json": json.dumps({"key": "value"}),
+            "broken.json": "{not json",
+        })
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        response = api_client.post(url, {"file": archive}, format="multipart")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["files_processed"] == 1
+        assert response.data["errors"][0]["path"] == "broken.json"
+        assert "Invalid JSON" in response.data["errors"][0]["error"]
+
+    def test_members_are_parsed_in_worker_processes(self, api_client, project, settings):
+        settings.ARCHIVE_UPLOAD = {"MAX_WORKERS": 2}
+        archive = _zip_archive({
+            f"pool/file{i}.json": json.dumps({f"key{i}_{n}": f"Text {n}" for n in range(50)})
+            for i in range(3)
+        })
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        response = api_client.post(url, {"file": archive}, format="multipart")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["files_processed"] == 3
+        assert response.data["new"] == 150
+
+    def test_rejects_non_archive(self, api_client, project):
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        file = SimpleUploadedFile("resources.zip", b"plain text")
+        response = api_client.post(url, {"file": file}, format="multipart")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rejects_archive_over_member_limit(self, api_client, project, settings):
+        settings.ARCHIVE_UPLOAD = {"MAX_MEMBERS": 1}
+        archive = _zip_archive({"a.json": "{}", "b.json": "{}"})
+        url = reverse("resource-upload-archive", kwargs={"slug": "test-project"})
+        response = api_client.post(url, {"file": archive}, format="multipart")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 class TestResourceListAPI:
     def test_list_resources(self, api_client, project):
@@ -104,8 +311,8 @@ class TestStringListAPI:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["key"] == "hello"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["key"] == "hello"
 
     def test_search_strings(self, api_client, project):
         rf = ResourceFile.objects.create(
@@ -124,4 +331,29 @@ class TestStringListAPI:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url, {"search": "save"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        assert len(response.data["results"]) == 1
+
+
+@pytest.mark.django_db
+class TestParseCache:
+    def test_reupload_under_other_path_hits_cache(self, api_client, project):
+        from apps.resources.services import get_parse_cache
+
+        get_parse_cache().clear()
+        content = json.dumps({"shared": "Vendored catalog"}).encode("utf-8")
+        url = reverse("resource-upload", kwargs={"slug": "test-project"})
+
+        api_client.post(url, {"file": SimpleUploadedFile("a.json", content)}, format="multipart")
+        api_client.post(url, {"file": SimpleUploadedFile("b.json", content)}, format="multipart")
+
+        stats = get_parse_cache().stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_stats_endpoint_requires_admin(self, api_client, admin_client):
+        url = reverse("parse-cache-stats")
+
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert {"hits", "misses", "disk_hits", "rows"} <= set(response.data)
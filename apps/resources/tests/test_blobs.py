@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import time
+
+import pytest
+from django.core.management import call_command
+
+from apps.projects.models import Project
+from apps.resources.blobs import BlobStore, get_blob_store
+from apps.resources.models import ResourceFile
+from apps.resources.services import compute_checksum, load_resource_content, process_upload
+
+
+@pytest.fixture
+def blob_dir(settings, tmp_path):
+    settings.BLOB_STORE = {"DIRECTORY": str(tmp_path / "blobs"), "COMPRESSION": "zlib"}
+    get_blob_store.cache_clear()
+    yield tmp_path / "blobs"
+    get_blob_store.cache_clear()
+
+
+def _age(store: BlobStore, hours: float) -> None:
+    """Backdate every stored payload so the GC grace period has passed."""
+    then = time.time() - hours * 3600
+    for _, path in store.iter_blobs():
+        os.utime(path, (then, then))
+
+
+class TestBlobStore:
+    def test_roundtrip_and_dedupe(self, tmp_path):
+        store = BlobStore(tmp_path, compression="zlib")
+        content = "Grüße " * 1000
+
+        digest = store.put(content)
+        assert digest == compute_checksum(content)
+        assert store.put(content.encode("utf-8")) == digest
+        assert store.get(digest) == content.encode("utf-8")
+        assert [d for d, _ in store.iter_blobs()] == [digest]
+        # Compressed on disk
+        (_, path), = store.iter_blobs()
+        assert path.suffix == ".zz"
+        assert path.stat().st_size < len(content)
+
+    def test_memoryview_input(self, tmp_path):
+        store = BlobStore(tmp_path, compression="zlib")
+        digest = store.put(memoryview(b"payload"))
+        assert store.get(digest) == b"payload"
+
+    def test_missing_blob(self, tmp_path):
+        assert BlobStore(tmp_path).get("0" * 64) is None
+
+    def test_garbage_collection(self, tmp_path):
+        store = BlobStore(tmp_path, compression="zlib")
+        kept = store.put(b"kept")
+        dropped = store.put(b"dropped")
+        _age(store, 2)
+        recent = store.put(b"recent")
+
+        assert store.collect_garbage({kept}, grace_seconds=3600, dry_run=True) == [dropped]
+        assert store.exists(dropped)
+        assert store.collect_garbage({kept}, grace_seconds=3600) == [dropped]
+        assert not store.exists(dropped)
+        assert store.exists(kept) and store.exists(recent)
+
+    def test_reused_payload_restarts_grace_period(self, tmp_path):
+        store = BlobStore(tmp_path, compression="zlib")
+        digest = store.put(b"shared")
+        _age(store, 2)
+
+        assert store.put(b"shared") == digest
+        assert store.collect_garbage(set(), grace_seconds=3600) == []
+        assert store.exists(digest)
+
+    def test_zstd_roundtrip(self, tmp_path):
+        store = BlobStore(tmp_path)
+        digest = store.put(b"payload" * 100)
+
+        (_, path), = store.iter_blobs()
+        assert path.suffix == ".zst"
+        assert store.get(digest) == b"payload" * 100
+
+    def test_unknown_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            BlobStore(tmp_path, compression="lzma")
+
+
+@pytest.mark.django_db
+class TestResourceFileBlobs:
+    def test_upload_keeps_payload_once(self, blob_dir):
+        first = Project.objects.create(name="A", slug="a")
+        second = Project.objects.create(name="B", slug="b")
+        content = json.dumps({"save": "Save"})
+
+        process_upload(first, content, "en.json", "json")
+        process_upload(second, content, "locales/en.json", "json")
+
+        files = ResourceFile.objects.all()
+        assert {f.blob_digest for f in files} == {compute_checksum(content)}
+        assert len(list(get_blob_store().iter_blobs())) == 1
+        assert load_resource_content(files[0]) == content.encode("utf-8")
+
+    def test_disabled_store(self, settings):
+        settings.BLOB_STORE = {"DIRECTORY": ""}
+        get_blob_store.cache_clear()
+        project = Project.objects.create(name="A", slug="a")
+        process_upload(project, json.dumps({"save": "Save"}), "en.json", "json")
+
+        resource_file = ResourceFile.objects.get()
+        assert resource_file.blob_digest == ""
+        assert load_resource_content(resource_file) is None
+
+    def test_gc_command_applies_retention(self, blob_dir):
+        project = Project.objects.create(name="A", slug="a")
+        for version in range(3):
+            process_upload(project, json.dumps({"k": f"v{version}"}), "en.json", "json")
+        store = get_blob_store()
+        _age(store, 48)
+
+        call_command("gc_blobs", "--keep-versions", "1", stdout=io.StringIO())
+
+        latest = ResourceFile.objects.get(version=3)
+        assert [d for d, _ in store.iter_blobs()] == [latest.blob_digest]
+        assert ResourceFile.objects.exclude(blob_digest="").count() == 1
@@ -0,0 +1,143 @@
+import json
+import uuid
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from apps.projects.models import Project
+from apps.resources.changes import ADDED, REMOVED, DeferredChanges, changes_since, record_changes
+from apps.resources.models import StringChange, TranslatableString
+from apps.resources.services import process_upload
+
+
+@pytest.fixture
+def project():
+    return Project.objects.create(name="Test Project", slug="test-project")
+
+
+def _actions(project, cursor=0):
+    changes, _, _ = changes_since(project.id, cursor)
+    return [(c.key, c.action, c.language_code) for c in changes]
+
+
+@pytest.mark.django_db
+class TestChangeLog:
+    def test_upload_records_each_change(self, project):
+        process_upload(project, json.dumps({"a": "A", "b": "B", "c": "C"}), "en.json", "json")
+        cursor = StringChange.objects.latest("id").id
+        process_upload(project, json.dumps({"a": "A", "b": "B!", "d": "D"}), "en.json", "json")
+
+        assert sorted(_actions(project, cursor)) == [
+            ("b", "updated", ""), ("c", "removed", ""), ("d", "added", ""),
+        ]
+
+    def test_reactivated_string_is_added(self, project):
+        process_upload(project, json.dumps({"a": "A", "b": "B"}), "en.json", "json")
+        process_upload(project, json.dumps({"b": "B"}), "en.json", "json")
+        cursor = StringChange.objects.latest("id").id
+        process_upload(project, json.dumps({"a": "A", "b": "B", "c": "C"}), "en.json", "json")
+
+        assert _actions(project, cursor) == [("a", "added", ""), ("c", "added", "")]
+
+    def test_unchanged_upload_records_nothing(self, project):
+        content = json.dumps({"a": "A"})
+        process_upload(project, content, "en.json", "json")
+        process_upload(project, content, "en.json", "json")
+
+        assert StringChange.objects.count() == 1
+
+    def test_changes_reference_strings(self, project):
+        process_upload(project, json.dumps({"a": "A"}), "en.json", "json")
+
+        change = StringChange.objects.get()
+        assert change.string_id == TranslatableString.objects.get(key="a").id
+
+    def test_pages_follow_the_cursor(self, project):
+        process_upload(project, json.dumps({f"k{i}": str(i) for i in range(5)}), "en.json", "json")
+
+        first, cursor, has_more = changes_since(project.id, 0, limit=3)
+        second, end, more_after = changes_since(project.id, cursor, limit=3)
+
+        assert has_more and not more_after
+        assert [c.key for c in first + second] == [f"k{i}" for i in range(5)]
+        assert changes_since(project.id, end) == ([], end, False)
+
+    def test_feed_is_scoped_to_project(self, project):
+        other = Project.objects.create(name="Other", slug="other")
+        process_upload(other, json.dumps({"a": "A"}), "en.json", "json")
+
+        assert _actions(project) == []
+
+    def test_record_nothing(self, project):
+        assert record_changes(project.id, []) == 0
+
+
+def _holds_advisory_lock() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()")
+        return cursor.fetchone()[0] > 0
+
+
+@pytest.mark.django_db
+class TestDeferredChanges:
+    def test_publish_appends_in_recorded_order(self, project):
+        pending = DeferredChanges(project.id)
+        pending.record([(uuid.uuid4(), "b", ADDED), (uuid.uuid4(), "a", ADDED)])
+        pending.record([(uuid.uuid4(), "c", REMOVED)])
+        pending.publish()
+
+        assert _actions(project) == [("b", "added", ""), ("a", "added", ""), ("c", "removed", "")]
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="staging requires PostgreSQL")
+    def test_entries_are_staged_without_the_lock(self, project):
+        pending = DeferredChanges(project.id)
+        pending.record([(uuid.uuid4(), "a", ADDED)])
+
+        assert not StringChange.objects.exists()
+        assert not _holds_advisory_lock()
+
+        pending.publish()
+        assert StringChange.objects.count() == 1
+        assert _holds_advisory_lock()
+
+
+@pytest.mark.django_db
+class TestChangesAPI:
+    def test_translation_saves_are_logged(self, api_client, project):
+        process_upload(project, json.dumps({"greeting": "Hello"}), "en.json", "json")
+        string = TranslatableString.objects.get()
+        cursor = StringChange.objects.latest("id").id
+
+        api_client.post(
+            reverse("translation-create", kwargs={"slug": "test-project", "string_id": string.pk}),
+            {"language_code": "de", "translated_text": "Hallo", "status": "draft"},
+            format="json",
+        )
+        api_client.patch(
+            reverse("translation-update", kwargs={"slug": "test-project", "string_id": string.pk, "language": "de"}),
+            {"translated_text": "Hallo!"},
+            format="json",
+        )
+
+        assert _actions(project, cursor) == [("greeting", "translated", "de")] * 2
+
+    def test_feed(self, api_client, project):
+        process_upload(project, json.dumps({"a": "A", "b": "B"}), "en.json", "json")
+        url = reverse("change-list", kwargs={"slug": "test-project"})
+
+        response = api_client.get(url, {"limit": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert [c["key"] for c in response.data["changes"]] == ["a"]
+        assert response.data["has_more"] is True
+
+        response = api_client.get(url, {"since": response.data["next_cursor"]})
+        assert [c["key"] for c in response.data["changes"]] == ["b"]
+        assert response.data["changes"][0]["action"] == "added"
+        assert response.data["has_more"] is False
+
+    @pytest.mark.parametrize("params", [{"since": "x"}, {"since": -1}, {"limit": 0}])
+    def test_feed_rejects_bad_params(self, api_client, project, params):
+        response = api_client.get(reverse("change-list", kwargs={"slug": "test-project"}), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from django.db import connection
+
+from apps.projects.models import Project
+from apps.resources.copy_import import CopyReader, _iter_copy_lines
+from apps.resources.models import TranslatableString
+from apps.resources.services import process_upload
+from parsers.base import ParsedEntry
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="COPY ingestion requires PostgreSQL",
+)
+
+
+class TestCopyLines:
+    def test_escapes_and_nulls(self):
+        entry = ParsedEntry(key="a\tb", source_text="Line 1\nLine 2 \\n", context="C:\\path", order=3)
+        (line,) = _iter_copy_lines([entry])
+
+        fields = line.rstrip("\n").split("\t")
+        assert fields[:7] == ["a\\tb", "Line 1\\nLine 2 \\\\n", "C:\\\\path", "\\N", "f", "{}", "3"]
+        assert fields[7] == entry.content_hash
+
+    def test_plurals_and_duplicates(self):
+        entries = [
+            ParsedEntry(key="files", source_text="{{count}} file", has_plurals=True,
+                        plural_forms={"one": "{{count}} file", "other": "{{count}} files"}, max_length=20),
+            ParsedEntry(key="files", source_text="duplicate"),
+        ]
+        (line,) = _iter_copy_lines(entries)
+
+        fields = line.split("\t")
+        assert fields[3:5] == ["20", "t"]
+        assert json.loads(fields[5]) == {"one": "{{count}} file", "other": "{{count}} files"}
+
+    def test_reader_returns_requested_sizes(self):
+        reader = CopyReader(iter(["abc\n", "defgh\n", "i\n"]))
+
+        assert reader.read(5) == "abc\nd"
+        assert reader.read(100) == "efgh\ni\n"
+        assert reader.read(5) == ""
+
+
+@pytest.mark.django_db
+class TestCopyIngestion:
+    def test_sqlite_falls_back_to_orm(self, settings):
+        if connection.vendor == "postgresql":
+            pytest.skip("checks the SQLite fallback")
+        settings.RESOURCE_IMPORT = {"COPY_MIN_ROWS": 0}
+        project = Project.objects.create(name="P", slug="p")
+
+        result = process_upload(project, json.dumps({"a": "A", "b": "B"}), "en.json", "json")
+
+        assert (result["new"], result["updated"], result["removed"]) == (2, 0, 0)
+
+    @postgresql_only
+    def test_copy_path_matches_orm_summary(self, settings):
+        settings.RESOURCE_IMPORT = {"COPY_MIN_ROWS": 0}
+        project = Project.objects.create(name="P", slug="p")
+        process_upload(project, json.dumps({"a": "A", "b": "B", "c": "C"}), "en.json", "json")
+        process_upload(project, json.dumps({"a": "A", "b": "B"}), "en.json", "json")
+
+        result = process_upload(project, json.dumps({"a": "A!", "c": "C", "d": "D"}), "en.json", "json")
+
+        assert (result["new"], result["updated"], result["removed"]) == (2, 1, 1)
+        active = dict(
+            TranslatableString.objects.filter(project=project, is_active=True)
+            .values_list("key", "source_text")
+        )
+        assert active == {"a": "A!", "c": "C", "d": "D"}
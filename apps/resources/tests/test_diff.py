@@ -0,0 +1,104 @@
+import json
+import uuid
+
+import pytest
+
+from apps.projects.models import Project
+from apps.resources.diff import (
+    CHANGED,
+    NEW,
+    REMOVED,
+    UNCHANGED,
+    StoredString,
+    iter_stored_strings,
+    merge_diff,
+    sort_entries,
+)
+from apps.resources.models import TranslatableString
+from apps.resources.services import process_upload
+from parsers.base import ParsedBatch, ParsedEntry
+
+
+def _stored(key, text, is_active=True, file_path="en.json"):
+    entry = ParsedEntry(key=key, source_text=text)
+    return StoredString(key, entry.content_hash, uuid.uuid4(), is_active, file_path)
+
+
+class TestMergeDiff:
+    def test_classifies_every_key(self):
+        stored = [_stored("a", "A"), _stored("b", "B"), _stored("d", "D")]
+        entries = [
+            ParsedEntry(key="a", source_text="A"),
+            ParsedEntry(key="b", source_text="B!"),
+            ParsedEntry(key="c", source_text="C"),
+        ]
+
+        results = [(r.key, r.status) for r in merge_diff(stored, entries)]
+
+        assert results == [("a", UNCHANGED), ("b", CHANGED), ("c", NEW), ("d", REMOVED)]
+
+    def test_inactive_strings(self):
+        stored = [_stored("a", "A", is_active=False), _stored("b", "B", is_active=False)]
+        results = list(merge_diff(stored, [ParsedEntry(key="a", source_text="A")]))
+
+        assert [(r.key, r.status) for r in results] == [("a", NEW)]
+        assert results[0].stored is stored[0]
+
+    def test_duplicate_entry_keys_keep_first(self):
+        entries = [ParsedEntry(key="a", source_text="first"), ParsedEntry(key="a", source_text="second")]
+        results = list(merge_diff([], entries))
+
+        assert [r.entry.source_text for r in results] == ["first"]
+
+    def test_unsorted_input_is_rejected(self):
+        entries = [ParsedEntry(key="b", source_text="B"), ParsedEntry(key="a", source_text="A")]
+        with pytest.raises(ValueError, match="not sorted"):
+            list(merge_diff([], entries))
+
+    def test_sort_entries_uses_code_point_order(self):
+        keys = ["b", "B", "é", "a.z", "a_z", "a"]
+        batch = ParsedBatch.from_entries(ParsedEntry(key=k, source_text=k) for k in keys)
+
+        assert [e.key for e in sort_entries(batch)] == sorted(keys)
+        assert [e.key for e in sort_entries(list(batch))] == sorted(keys)
+
+
+@pytest.mark.django_db
+class TestStoredStrings:
+    def test_streams_in_code_point_order(self):
+        project = Project.objects.create(name="P", slug="p")
+        keys = ["b", "B", "é", "a.z", "a_z", "Z"]
+        process_upload(project, json.dumps({k: k for k in keys}), "en.json", "json")
+
+        stored = list(iter_stored_strings(project, chunk_size=2))
+
+        assert [s.key for s in stored] == sorted(keys)
+        assert {s.file_path for s in stored} == {"en.json"}
+
+    def test_writes_during_the_stream_are_not_read(self):
+        project = Project.objects.create(name="P", slug="p3")
+        process_upload(project, json.dumps({"b": "B", "d": "D", "f": "F"}), "en.json", "json")
+        resource_file = TranslatableString.objects.get(key="b").resource_file
+
+        keys = []
+        for stored in iter_stored_strings(project, chunk_size=2):
+            keys.append(stored.key)
+            # Like an upload's merge, insert keys sorting before the current one
+            TranslatableString.objects.create(
+                project=project, resource_file=resource_file, key=chr(ord(stored.key) - 1), source_text="",
+            )
+            TranslatableString.objects.filter(id=stored.id).update(is_active=False)
+
+        assert keys == ["b", "d", "f"]
+
+    def test_removed_key_is_reactivated(self):
+        project = Project.objects.create(name="P", slug="p2")
+        process_upload(project, json.dumps({"a": "A", "b": "B"}), "en.json", "json")
+        process_upload(project, json.dumps({"a": "A"}), "en.json", "json")
+
+        result = process_upload(project, json.dumps({"a": "A", "b": "B again"}), "en.json", "json")
+
+        assert (result["new"], result["updated"], result["removed"]) == (1, 0, 0)
+        stored = {s.key: s for s in iter_stored_strings(project)}
+        assert stored["b"].is_active
+        assert stored["b"].content_hash == ParsedEntry(key="b", source_text="B again").content_hash
@@ -0,0 +1,231 @@
+import io
+import json
+import os
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.projects.models import GitHubRepo, Project
+from apps.resources.jobs import STALE_JOB_ERROR, _renew_lease, claim_next_job, requeue_stale_jobs, run_job
+from apps.resources.models import ImportJob, TranslatableString
+
+
+@pytest.fixture
+def project():
+    return Project.objects.create(name="Test Project", slug="test-project")
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(settings, tmp_path):
+    settings.IMPORT_JOBS = {"SPOOL_DIR": str(tmp_path / "spool")}
+    return tmp_path / "spool"
+
+
+@pytest.fixture(autouse=True)
+def keep_connections():
+    # Like the test client, keep the worker from closing the connection of the test's transaction
+    with patch("apps.resources.management.commands.run_import_worker.close_old_connections"):
+        yield
+
+
+def _upload_async(api_client, content: bytes, name: str = "messages.json"):
+    url = reverse("resource-upload", kwargs={"slug": "test-project"}) + "?async=1"
+    return api_client.post(url, {"file": SimpleUploadedFile(name, content)}, format="multipart")
+
+
+@pytest.mark.django_db
+class TestAsyncUpload:
+    def test_upload_is_queued(self, api_client, project, spool_dir):
+        response = _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8"))
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == "pending"
+        assert response.data["status_url"].endswith(f"/projects/test-project/import-jobs/{response.data['job_id']}/")
+        job = ImportJob.objects.get(id=response.data["job_id"])
+        assert job.kind == "upload"
+        assert os.path.dirname(job.spool_path) == str(spool_dir)
+        assert not TranslatableString.objects.exists()
+
+    def test_worker_processes_upload(self, api_client, project):
+        content = json.dumps({"greeting": "Hello", "farewell": "Goodbye"}).encode("utf-8")
+        job_id = _upload_async(api_client, content).data["job_id"]
+
+        call_command("run_import_worker", "--once", stdout=io.StringIO())
+
+        response = api_client.get(reverse("import-job-detail", kwargs={"slug": "test-project", "job_id": job_id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "succeeded"
+        assert (response.data["processed_files"], response.data["total_files"]) == (1, 1)
+        assert response.data["new"] == 2
+        assert response.data["result"]["version"] == 1
+        assert TranslatableString.objects.filter(project=project).count() == 2
+        assert not os.path.exists(ImportJob.objects.get(id=job_id).spool_path)
+
+    def test_failed_job_records_error(self, api_client, project):
+        job_id = _upload_async(api_client, '{"key": "café"}'.encode("latin-1")).data["job_id"]
+
+        call_command("run_import_worker", "--once", stdout=io.StringIO())
+
+        job = ImportJob.objects.get(id=job_id)
+        assert job.status == "failed"
+        assert job.error == "File must be UTF-8 encoded."
+        assert job.finished_at is not None
+
+    def test_job_detail_is_scoped_to_project(self, api_client, viewer_client, project):
+        job = ImportJob.objects.create(project=project, kind="github_sync")
+        Project.objects.create(name="Other", slug="other")
+
+        response = api_client.get(reverse("import-job-detail", kwargs={"slug": "other", "job_id": job.id}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        url = reverse("import-job-detail", kwargs={"slug": "test-project", "job_id": job.id})
+        assert viewer_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+def _stale(job: ImportJob, attempts: int) -> None:
+    """Make ``job`` look claimed by a worker that stopped an hour ago."""
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    ImportJob.objects.filter(id=job.id).update(
+        status="running", started_at=an_hour_ago, heartbeat_at=an_hour_ago, attempts=attempts, new=5,
+    )
+
+
+@pytest.mark.django_db
+class TestStaleJobs:
+    @pytest.fixture(autouse=True)
+    def lease(self, settings, spool_dir):
+        settings.IMPORT_JOBS = {"SPOOL_DIR": str(spool_dir), "LEASE_SECONDS": 60, "MAX_ATTEMPTS": 2}
+
+    def test_stale_job_is_requeued_and_processed(self, api_client, project):
+        job_id = _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8")).data["job_id"]
+        job = ImportJob.objects.get(id=job_id)
+        _stale(job, attempts=1)
+        running = ImportJob.objects.create(project=project, kind="github_sync", status="running",
+                                           heartbeat_at=timezone.now(), attempts=1)
+
+        call_command("run_import_worker", "--once", stdout=io.StringIO())
+
+        job.refresh_from_db()
+        assert (job.status, job.attempts, job.new) == ("succeeded", 2, 1)
+        assert ImportJob.objects.get(id=running.id).status == "running"
+
+    def test_job_out_of_attempts_fails(self, api_client, project):
+        job_id = _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8")).data["job_id"]
+        job = ImportJob.objects.get(id=job_id)
+        _stale(job, attempts=2)
+
+        assert requeue_stale_jobs() == 0
+
+        job.refresh_from_db()
+        assert (job.status, job.error) == ("failed", STALE_JOB_ERROR)
+        assert not os.path.exists(job.spool_path)
+
+    def test_requeued_attempt_does_not_record_result(self, api_client, project):
+        job_id = _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8")).data["job_id"]
+        job = claim_next_job()
+        _stale(job, attempts=1)
+        requeue_stale_jobs()
+
+        run_job(job)
+
+        stored = ImportJob.objects.get(id=job_id)
+        assert (stored.status, stored.new, stored.result) == ("pending", 0, None)
+        assert os.path.exists(stored.spool_path)
+
+    def test_lease_is_renewed_while_job_runs(self, settings, api_client, project, spool_dir):
+        settings.IMPORT_JOBS = {"SPOOL_DIR": str(spool_dir), "LEASE_SECONDS": 0.03}
+        _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8"))
+        job = claim_next_job()
+        renewed = threading.Event()
+
+        def slow_upload(job):
+            assert renewed.wait(5)
+            return {}
+
+        with patch("apps.resources.jobs._renew_lease", side_effect=lambda job: renewed.set() or True) as renew, \
+                patch("apps.resources.jobs._run_upload", side_effect=slow_upload):
+            run_job(job)
+
+        renew.assert_called_with(job)
+        assert ImportJob.objects.get(id=job.id).status == "succeeded"
+
+    def test_lease_is_not_renewed_for_requeued_attempt(self, api_client, project):
+        _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8"))
+        job = claim_next_job()
+        ImportJob.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(seconds=30))
+
+        assert _renew_lease(job)
+        assert ImportJob.objects.get(id=job.id).heartbeat_at > timezone.now() - timedelta(seconds=5)
+
+        _stale(job, attempts=1)
+        requeue_stale_jobs()
+        assert not _renew_lease(job)
+
+
+@pytest.mark.django_db
+class TestClaimNextJob:
+    def test_claims_oldest_pending_job_once(self, project):
+        first = ImportJob.objects.create(project=project, kind="github_sync")
+        ImportJob.objects.create(project=project, kind="github_sync", status="running")
+        second = ImportJob.objects.create(project=project, kind="github_sync")
+
+        assert claim_next_job().id == first.id
+        assert claim_next_job().id == second.id
+        assert claim_next_job() is None
+        assert ImportJob.objects.get(id=first.id).started_at is not None
+
+
+@pytest.mark.django_db
+class TestWorker:
+    def test_worker_retries_after_database_error(self, api_client, project):
+        job_id = _upload_async(api_client, json.dumps({"greeting": "Hello"}).encode("utf-8")).data["job_id"]
+        errors = [OperationalError("server closed the connection unexpectedly")]
+
+        def flaky_claim():
+            if errors:
+                raise errors.pop()
+            return claim_next_job()
+
+        command = "apps.resources.management.commands.run_import_worker"
+        with patch(f"{command}.claim_next_job", side_effect=flaky_claim), patch(f"{command}.time.sleep") as sleep:
+            call_command("run_import_worker", "--max-jobs", "1", "--poll-interval", "1", stdout=io.StringIO())
+
+        sleep.assert_called_once_with(2)
+        assert ImportJob.objects.get(id=job_id).status == "succeeded"
+
+    def test_once_raises_errors(self, project):
+        with patch("apps.resources.management.commands.run_import_worker.claim_next_job",
+                   side_effect=OperationalError("server closed the connection unexpectedly")):
+            with pytest.raises(OperationalError):
+                call_command("run_import_worker", "--once", stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+class TestAsyncGitHubSync:
+    @patch("apps.projects.services.fetch_file_content")
+    @patch("apps.projects.services.list_repo_tree")
+    def test_sync_job_reports_progress(self, mock_tree, mock_fetch, api_client, project):
+        GitHubRepo.objects.create(project=project, owner="o", repo="r", branch="main")
+        mock_tree.return_value = [
+            {"path": "en.json", "sha": "a", "size": 1, "extension": "json"},
+            {"path": "broken.json", "sha": "b", "size": 1, "extension": "json"},
+        ]
+        mock_fetch.side_effect = [json.dumps({"a": "A", "b": "B"}), "{not json"]
+
+        response = api_client.post(reverse("github-sync", kwargs={"slug": "test-project"}) + "?async=true")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        call_command("run_import_worker", "--once", stdout=io.StringIO())
+
+        job = ImportJob.objects.get(id=response.data["job_id"])
+        assert job.status == "succeeded"
+        assert (job.processed_files, job.total_files, job.new) == (2, 2, 2)
+        assert job.result["files_synced"] == 1
+        assert len(job.result["errors"]) == 1
@@ -0,0 +1,95 @@
+import json
+import threading
+import uuid
+
+import pytest
+from django.db import connection
+
+from apps.projects.models import Project
+from apps.resources import locks
+from apps.resources.locks import _local_lock, locked_resource_file, resource_file_lock_key
+from apps.resources.models import ResourceFile
+from apps.resources.services import process_upload
+
+
+class TestLockKey:
+    def test_key_is_stable_signed_bigint(self):
+        project_id = uuid.uuid4()
+        key = resource_file_lock_key(project_id, "en.json")
+
+        assert key == resource_file_lock_key(str(project_id), "en.json")
+        assert -2**63 <= key < 2**63
+
+    def test_key_depends_on_project_and_path(self):
+        project_id = uuid.uuid4()
+        keys = {
+            resource_file_lock_key(project_id, "en.json"),
+            resource_file_lock_key(project_id, "fr.json"),
+            resource_file_lock_key(uuid.uuid4(), "en.json"),
+        }
+        assert len(keys) == 3
+
+
+class TestLocalLock:
+    def _run_while_held(self, first: str, second: str) -> bool:
+        """Hold ``first`` and report whether ``second`` could be taken meanwhile."""
+        acquired = threading.Event()
+        with _local_lock(first):
+            thread = threading.Thread(target=lambda: _local_lock_then(second, acquired))
+            thread.start()
+            got_it = acquired.wait(timeout=0.5)
+        thread.join(timeout=5)
+        return got_it
+
+    def test_same_name_waits(self):
+        assert not self._run_while_held("a", "a")
+
+    def test_different_names_run_in_parallel(self):
+        assert self._run_while_held("a", "b")
+
+    def test_released_locks_are_dropped(self):
+        with _local_lock("a"):
+            assert "a" in locks._local_locks
+        assert "a" not in locks._local_locks
+
+
+def _local_lock_then(name: str, acquired: threading.Event) -> None:
+    with _local_lock(name):
+        acquired.set()
+
+
+@pytest.mark.django_db
+class TestLockedUpload:
+    def test_upload_runs_under_the_file_lock(self, monkeypatch):
+        project = Project.objects.create(name="A", slug="a")
+        held = []
+
+        def record(project_id, file_path):
+            held.append((project_id, file_path))
+            return locked_resource_file(project_id, file_path)
+
+        monkeypatch.setattr("apps.resources.services.locked_resource_file", record)
+        process_upload(project, json.dumps({"save": "Save"}), "en.json", "json")
+
+        assert held == [(project.id, "en.json")]
+
+    def test_repeated_upload_reuses_first_version(self):
+        project = Project.objects.create(name="A", slug="a")
+        content = json.dumps({"save": "Save"})
+
+        first = process_upload(project, content, "en.json", "json")
+        second = process_upload(project, content, "en.json", "json")
+
+        assert second["status"] == "unchanged"
+        assert second["resource_file_id"] == first["resource_file_id"]
+        assert ResourceFile.objects.count() == 1
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="advisory locks require PostgreSQL")
+    def test_advisory_lock_is_held_in_transaction(self):
+        project = Project.objects.create(name="A", slug="a")
+
+        with locked_resource_file(project.id, "en.json"), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()"
+            )
+            assert cursor.fetchone()[0] == 1
@@ -4,6 +4,7 @@ import pytest
 
 from apps.projects.models import Project
 from apps.resources.models import ResourceFile, TranslatableString
+from parsers.base import ParsedEntry
 
 
 @pytest.mark.django_db
@@ -24,3 +25,24 @@ class TestResourceModels:
             project=p, resource_file=rf, key="nav.home", source_text="Home", order=0
         )
         assert str(s) == "nav.home"
+
+    def test_content_hash_matches_parsed_entry(self):
+        p = Project.objects.create(name="P", slug="p3")
+        rf = ResourceFile.objects.create(
+            project=p, file_path="en.json", file_format="json", version=1, checksum="x"
+        )
+        forms = {"one": "{{count}} file", "other": "{{count}} files"}
+        s = TranslatableString.objects.create(
+            project=p, resource_file=rf, key="files", source_text="{{count}} file",
+            has_plurals=True, plural_forms=forms,
+        )
+        entry = ParsedEntry(
+            key="other.key", source_text="{{count}} file", has_plurals=True,
+            plural_forms=dict(reversed(forms.items())), order=5,
+        )
+        assert s.content_hash == entry.content_hash
+
+        s.source_text = "{{count}} document"
+        s.save(update_fields=["source_text"])
+        s.refresh_from_db()
+        assert s.content_hash != entry.content_hash
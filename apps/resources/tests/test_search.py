@@ -0,0 +1,118 @@
+import pytest
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.urls import reverse
+
+from apps.projects.models import Project
+from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources.search import SQLITE_FTS_TRIGGERS, search_strings
+
+
+@pytest.fixture
+def project():
+    return Project.objects.create(name="Test Project", slug="test-project")
+
+
+@pytest.fixture
+def make_strings(project):
+    resource_file = ResourceFile.objects.create(
+        project=project, file_path="en.json", file_format="json", version=1, checksum="abc",
+    )
+
+    def make(*pairs):
+        for order, (key, text) in enumerate(pairs):
+            TranslatableString.objects.create(
+                project=project, resource_file=resource_file, key=key, source_text=text, order=order,
+            )
+    return make
+
+
+def _keys(queryset, query):
+    return list(search_strings(queryset, query).order_by("-search_rank", "order", "id").values_list("key", flat=True))
+
+
+@pytest.mark.django_db
+class TestSearchStrings:
+    def test_matches_key_or_source_text(self, make_strings):
+        make_strings(("btn.save", "Store"), ("menu.file", "Save as"), ("btn.cancel", "Cancel"))
+
+        assert set(_keys(TranslatableString.objects.all(), "save")) == {"btn.save", "menu.file"}
+
+    def test_results_are_ranked(self, make_strings):
+        make_strings(
+            ("dialog.save_changes", "Keep"),
+            ("toolbar", "Autosave on"),
+            ("saveall", "All"),
+            ("save", "Persist"),
+            ("action", "Save"),
+        )
+
+        assert _keys(TranslatableString.objects.all(), "save") == [
+            "save", "action", "saveall", "dialog.save_changes", "toolbar",
+        ]
+
+    def test_short_query(self, make_strings):
+        make_strings(("ok", "OK"), ("cancel", "Cancel"))
+
+        assert _keys(TranslatableString.objects.all(), "ok") == ["ok"]
+
+    @pytest.mark.parametrize("query", ["100%", "a_b", '"quoted"'])
+    def test_special_characters_are_literal(self, make_strings, query):
+        make_strings(("percent", "100% done"), ("under", "a_b c"), ("quote", 'say "quoted" now'), ("other", "1000 axb"))
+
+        assert len(_keys(TranslatableString.objects.all(), query)) == 1
+
+    def test_index_follows_updates_and_deletes(self, make_strings):
+        make_strings(("greeting", "Hello"))
+        string = TranslatableString.objects.get()
+
+        string.source_text = "Welcome"
+        string.save()
+        assert _keys(TranslatableString.objects.all(), "hello") == []
+        assert _keys(TranslatableString.objects.all(), "welcome") == ["greeting"]
+
+        string.delete()
+        assert _keys(TranslatableString.objects.all(), "welcome") == []
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="FTS5 index is SQLite only")
+    def test_migrated_database_has_search_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            triggers = {name for name, in cursor.fetchall()}
+        assert set(SQLITE_FTS_TRIGGERS) <= triggers
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="FTS5 index is SQLite only")
+    def test_post_migrate_restores_dropped_triggers(self, make_strings):
+        make_strings(("greeting", "Hello"))
+        with connection.cursor() as cursor:
+            for name in SQLITE_FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER {name}")
+        make_strings(("farewell", "Goodbye"))
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=DEFAULT_DB_ALIAS)
+
+        assert _keys(TranslatableString.objects.all(), "goodbye") == ["farewell"]
+        make_strings(("welcome", "Welcome back"))
+        assert _keys(TranslatableString.objects.all(), "welcome") == ["welcome"]
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="trigram indexes require PostgreSQL")
+    def test_search_uses_ilike(self, make_strings):
+        sql = str(search_strings(TranslatableString.objects.all(), "save").query)
+        assert "ILIKE" in sql
+        assert "UPPER" not in sql.split("CASE")[0]
+
+
+@pytest.mark.django_db
+class TestSearchAPI:
+    def test_search_pages_in_rank_order(self, api_client, make_strings):
+        make_strings(*[(f"item.{i}", f"Save {i}") for i in range(5)], ("save", "Keep"))
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+
+        keys, params = [], {"search": "save", "page_size": 2}
+        while params:
+            response = api_client.get(url, params)
+            keys += [s["key"] for s in response.data["results"]]
+            cursor = response.data["next_cursor"]
+            params = {"search": "save", "page_size": 2, "cursor": cursor} if cursor else None
+
+        assert keys == ["save"] + [f"item.{i}" for i in range(5)]
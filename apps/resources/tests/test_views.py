@@ -4,11 +4,14 @@ import json
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from apps.projects.models import Project
 from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources.services import process_upload
 from apps.translations.models import Translation
 
 
@@ -110,8 +113,8 @@ class TestStringFilters:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url, {"language": "pt-BR"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["key"] == "greeting"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["key"] == "greeting"
 
     def test_filter_untranslated(self, api_client, project, strings):
         s1, _, _ = strings
@@ -121,11 +124,20 @@ class TestStringFilters:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url, {"language": "pt-BR", "untranslated": "true"})
         assert response.status_code == status.HTTP_200_OK
-        keys = [s["key"] for s in response.data]
+        keys = [s["key"] for s in response.data["results"]]
         assert "greeting" not in keys
         assert "farewell" in keys
         assert "welcome" in keys
 
+    def test_filters_do_not_duplicate_strings(self, api_client, project, strings):
+        s1, _, _ = strings
+        for code in ("es", "es-MX", "pt-BR"):
+            Translation.objects.create(string=s1, language_code=code, translated_text="x", status="approved")
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+        response = api_client.get(url, {"language": "es", "status": "approved"})
+        assert [s["key"] for s in response.data["results"]] == ["greeting"]
+        assert response.data["results"][0]["translation_count"] == 3
+
     def test_filter_by_status(self, api_client, project, strings):
         s1, s2, _ = strings
         Translation.objects.create(
@@ -137,8 +149,8 @@ class TestStringFilters:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url, {"language": "es", "status": "approved"})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["key"] == "greeting"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["key"] == "greeting"
 
     def test_inactive_strings_excluded(self, api_client, project, resource_file):
         TranslatableString.objects.create(
@@ -160,11 +172,72 @@ class TestStringFilters:
         url = reverse("string-list", kwargs={"slug": "test-project"})
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        keys = [s["key"] for s in response.data]
+        keys = [s["key"] for s in response.data["results"]]
         assert "active" in keys
         assert "removed" not in keys
 
 
+@pytest.mark.django_db
+class TestStringPagination:
+    def _create(self, project, resource_file, count):
+        # Equal orders, as strings from different files have, exercise the id tie-break
+        TranslatableString.objects.bulk_create(
+            TranslatableString(
+                project=project, resource_file=resource_file,
+                key=f"k{i:03}", source_text=f"Text {i}", order=i // 3,
+            )
+            for i in range(count)
+        )
+
+    def test_pages_cover_every_string_once(self, api_client, project, resource_file):
+        self._create(project, resource_file, 25)
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+
+        keys, params = [], {"page_size": 10}
+        while True:
+            response = api_client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            keys += [s["key"] for s in response.data["results"]]
+            if response.data["next_cursor"] is None:
+                assert response.data["next"] is None
+                break
+            params = {"page_size": 10, "cursor": response.data["next_cursor"]}
+
+        expected = TranslatableString.objects.order_by("order", "id").values_list("key", flat=True)
+        assert keys == list(expected)
+
+    def test_default_page_size(self, api_client, project, resource_file, settings):
+        self._create(project, resource_file, 60)
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+
+        response = api_client.get(url)
+        assert len(response.data["results"]) == settings.REST_FRAMEWORK["PAGE_SIZE"]
+        assert "cursor=" in response.data["next"]
+
+    def test_page_size_is_capped(self, api_client, project, resource_file):
+        self._create(project, resource_file, 3)
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+
+        response = api_client.get(url, {"page_size": 100000})
+        assert len(response.data["results"]) == 3
+
+    def test_translation_counts_on_page(self, api_client, project, strings):
+        s1, _, _ = strings
+        Translation.objects.create(string=s1, language_code="de", translated_text="Hallo")
+        Translation.objects.create(string=s1, language_code="es", translated_text="Hola")
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+
+        response = api_client.get(url)
+        counts = {s["key"]: s["translation_count"] for s in response.data["results"]}
+        assert counts == {"greeting": 2, "farewell": 0, "welcome": 0}
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "WzFd", "WzEsIngiXQ"])
+    def test_invalid_cursor(self, api_client, project, cursor):
+        url = reverse("string-list", kwargs={"slug": "test-project"})
+        response = api_client.get(url, {"cursor": cursor})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.django_db
 class TestExportTranslations:
     def test_export_json(self, api_client, project, resource_file):
@@ -184,7 +257,39 @@ class TestExportTranslations:
         )
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert "greeting" in str(response.content)
+        assert response.streaming
+        content = b"".join(response.streaming_content).decode("utf-8")
+        assert json.loads(content) == {"greeting": "Ola"}
+
+    def test_export_json_plurals_for_language(self, api_client, project, resource_file):
+        s = TranslatableString.objects.create(
+            project=project,
+            resource_file=resource_file,
+            key="files",
+            source_text="{{count}} file",
+            has_plurals=True,
+            plural_forms={"one": "{{count}} file", "other": "{{count}} files"},
+            order=0,
+        )
+        Translation.objects.create(
+            string=s,
+            language_code="ru",
+            translated_text="{{count}} файл",
+            plural_forms={"one": "{{count}} файл", "few": "{{count}} файла", "many": "{{count}} файлов"},
+            status="approved",
+        )
+        url = reverse(
+            "export-translations",
+            kwargs={"slug": "test-project", "language": "ru", "file_format": "json"},
+        )
+        response = api_client.get(url)
+        content = json.loads(b"".join(response.streaming_content).decode("utf-8"))
+        assert content == {
+            "files_one": "{{count}} файл",
+            "files_few": "{{count}} файла",
+            "files_many": "{{count}} файлов",
+            "files_other": "{{count}} files",
+        }
 
     def test_export_without_translations(self, api_client, project, resource_file):
         TranslatableString.objects.create(
@@ -201,6 +306,76 @@ class TestExportTranslations:
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
 
+    def test_export_po_streams_translations(self, api_client, project, strings):
+        s1, s2, _ = strings
+        Translation.objects.create(
+            string=s1, language_code="es", translated_text="Hola", status="approved"
+        )
+        Translation.objects.create(
+            string=s2, language_code="fr", translated_text="Au revoir", status="approved"
+        )
+        url = reverse(
+            "export-translations",
+            kwargs={"slug": "test-project", "language": "es", "file_format": "po"},
+        )
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/x-gettext-translation; charset=utf-8"
+        content = b"".join(response.streaming_content).decode("utf-8")
+        assert 'msgid "Hello"\nmsgstr "Hola"' in content
+        assert "Au revoir" not in content
+        assert content.index("Hello") < content.index("Goodbye") < content.index("Welcome")
+
+    def test_export_xliff2(self, api_client, project, strings):
+        s1, _, _ = strings
+        Translation.objects.create(
+            string=s1, language_code="es", translated_text="Hola", status="approved"
+        )
+        url = reverse(
+            "export-translations",
+            kwargs={"slug": "test-project", "language": "es", "file_format": "xliff2"},
+        )
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        content = b"".join(response.streaming_content).decode("utf-8")
+        assert 'version="2.0" srcLang="en" trgLang="es"' in content
+        assert "<segment><source>Hello</source><target>Hola</target></segment>" in content
+
+    @pytest.mark.parametrize("file_format", ["json", "po"])
+    def test_export_reads_strings_in_chunks(self, api_client, settings, project, file_format):
+        content = json.dumps({
+            "cart": {"item_one": "{{count}} item", "item_other": "{{count}} items", "empty": "Empty"},
+            "nav": {"home": "Home", "back": "Back"},
+            "title": "Shop",
+        })
+        process_upload(project, content, "en.json", "json")
+        for string in TranslatableString.objects.filter(key__in=["nav.back", "cart.item"]):
+            Translation.objects.create(
+                string=string, language_code="de", translated_text=f"{string.key}!",
+                plural_forms={"one": "ein Artikel"} if string.has_plurals else {},
+            )
+        url = reverse(
+            "export-translations",
+            kwargs={"slug": "test-project", "language": "de", "file_format": file_format},
+        )
+
+        settings.RESOURCE_EXPORT = {"CHUNK_SIZE": 100}
+        expected = b"".join(api_client.get(url).streaming_content).decode("utf-8")
+        settings.RESOURCE_EXPORT = {"CHUNK_SIZE": 2}
+        with CaptureQueriesContext(connection) as queries:
+            chunked = b"".join(api_client.get(url).streaming_content).decode("utf-8")
+
+        assert chunked == expected
+        translation_queries = [q for q in queries if "translations_translation" in q["sql"]]
+        # One EXISTS, then one query per chunk of strings
+        assert len(translation_queries) == 1 + 3
+        if file_format == "json":
+            assert json.loads(chunked) == {
+                "cart": {"empty": "Empty", "item_one": "ein Artikel", "item_other": "{{count}} items"},
+                "nav": {"home": "Home", "back": "nav.back!"},
+                "title": "Shop",
+            }
+
     def test_export_unsupported_format(self, api_client, project):
         url = reverse(
             "export-translations",
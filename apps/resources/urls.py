@@ -8,6 +8,11 @@ urlpatterns = [
         views.upload_resource,
         name="resource-upload",
     ),
+    path(
+        "projects/<slug:slug>/upload-archive/",
+        views.upload_archive,
+        name="resource-upload-archive",
+    ),
     path(
         "projects/<slug:slug>/resources/",
         views.list_resources,
@@ -23,9 +28,24 @@ urlpatterns = [
         views.string_detail,
         name="string-detail",
     ),
+    path(
+        "projects/<slug:slug>/changes/",
+        views.list_changes,
+        name="change-list",
+    ),
     path(
         "projects/<slug:slug>/export/<str:language>/<str:file_format>/",
         views.export_translations,
         name="export-translations",
     ),
+    path(
+        "projects/<slug:slug>/import-jobs/<uuid:job_id>/",
+        views.import_job_detail,
+        name="import-job-detail",
+    ),
+    path(
+        "parse-cache/",
+        views.parse_cache_stats,
+        name="parse-cache-stats",
+    ),
 ]
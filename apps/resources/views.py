@@ -1,27 +1,46 @@
-from django.db.models import Count
+from django.db.models import Exists, OuterRef
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
-from apps.accounts.permissions import IsManagerOrAbove
+from apps.accounts.permissions import IsAdminRole, IsManagerOrAbove
 
 from apps.projects.models import Project
-from apps.resources.models import ResourceFile, TranslatableString
+from apps.resources import export
+from apps.resources.changes import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, changes_since
+from apps.resources.jobs import enqueue_upload, job_accepted_response, wants_async
+from apps.resources.models import ImportJob, ResourceFile, TranslatableString
+from apps.resources.pagination import KeysetPagination
+from apps.resources.search import SEARCH_ORDERING, search_strings
 from apps.resources.serializers import (
+    ArchiveUploadSerializer,
     FileUploadSerializer,
+    ImportJobSerializer,
     ResourceFileSerializer,
+    StringChangeSerializer,
     TranslatableStringListSerializer,
     TranslatableStringSerializer,
 )
-from apps.resources.services import detect_format_from_filename, process_upload
+from apps.resources.services import (
+    detect_format_from_filename,
+    get_parse_cache,
+    process_archive,
+    process_uploaded_file,
+)
+from apps.translations.models import Translation
 from parsers.factory import ParserFactory
 
 
 @api_view(["POST"])
 @permission_classes([IsManagerOrAbove])
 def upload_resource(request, slug):
-    """Upload a resource file for parsing and string extraction."""
+    """Upload a resource file for parsing and string extraction.
+
+    With ``?async=1`` the file is queued as an ImportJob and 202 is returned
+    with the job id; a run_import_worker process then imports it.
+    """
     project = get_object_or_404(Project, slug=slug)
     serializer = FileUploadSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -37,17 +56,31 @@ def upload_resource(request, slug):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    if wants_async(request):
+        return job_accepted_response(request, enqueue_upload(project, uploaded_file, file_format))
+
     try:
-        content = uploaded_file.read().decode("utf-8")
-    except UnicodeDecodeError:
+        result = process_uploaded_file(project, uploaded_file, file_format)
+    except Exception as e:
         return Response(
-            {"error": "File must be UTF-8 encoded."},
+            {"error": str(e)},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    return Response(result, status=status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+@permission_classes([IsManagerOrAbove])
+def upload_archive(request, slug):
+    """Upload a zip or tar archive of resource files and process each of them."""
+    project = get_object_or_404(Project, slug=slug)
+    serializer = ArchiveUploadSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
     try:
-        result = process_upload(project, content, uploaded_file.name, file_format)
-    except Exception as e:
+        result = process_archive(project, serializer.validated_data["file"])
+    except ValueError as e:
         return Response(
             {"error": str(e)},
             status=status.HTTP_400_BAD_REQUEST,
@@ -67,41 +100,43 @@ def list_resources(request, slug):
 
 @api_view(["GET"])
 def list_strings(request, slug):
-    """List translatable strings for a project with optional filters."""
+    """List translatable strings for a project with optional filters.
+
+    Results are paginated by ``(order, id)``, best matches first when
+    searching; follow ``next`` (or pass ``next_cursor`` as ``cursor``) for
+    the next page, and ``page_size`` sets the page length.
+    """
     project = get_object_or_404(Project, slug=slug)
     queryset = TranslatableString.objects.filter(project=project, is_active=True)
 
-    # Filter by untranslated for a specific language
+    # Language filters are EXISTS / NOT EXISTS probes of the
+    # (string, language_code) unique index, so they never duplicate rows
     language = request.query_params.get("language")
     untranslated = request.query_params.get("untranslated")
-
-    if untranslated and language:
-        queryset = queryset.exclude(
-            translations__language_code=language,
-        )
-    elif language:
-        queryset = queryset.filter(
-            translations__language_code=language,
-        )
-
-    # Filter by translation status
     trans_status = request.query_params.get("status")
-    if trans_status and language:
-        queryset = queryset.filter(
-            translations__language_code=language,
-            translations__status=trans_status,
-        )
 
-    # Search by key or source text
+    if language:
+        translations = Translation.objects.filter(string=OuterRef("pk"), language_code=language)
+        if untranslated:
+            queryset = queryset.filter(~Exists(translations))
+        elif trans_status:
+            # Filter by translation status
+            queryset = queryset.filter(Exists(translations.filter(status=trans_status)))
+        else:
+            queryset = queryset.filter(Exists(translations))
+
+    # Search by key or source text, best matches first
     search = request.query_params.get("search")
     if search:
-        queryset = queryset.filter(key__icontains=search) | queryset.filter(
-            source_text__icontains=search
-        )
+        queryset = search_strings(queryset, search)
+        paginator = KeysetPagination(SEARCH_ORDERING)
+    else:
+        paginator = KeysetPagination()
 
-    queryset = queryset.annotate(translation_count=Count("translations")).distinct()
-    serializer = TranslatableStringListSerializer(queryset, many=True)
-    return Response(serializer.data)
+    # Keyset pagination: only the page's rows are read
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = TranslatableStringListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(["GET"])
@@ -118,41 +153,51 @@ def string_detail(request, slug, string_id):
 
 
 @api_view(["GET"])
-def export_translations(request, slug, language, file_format):
-    """Export translations for a language in the specified format."""
+def list_changes(request, slug):
+    """List changes to a project's strings and translations after a cursor.
+
+    Pass the returned ``next_cursor`` as ``since`` to fetch the next page;
+    it is unchanged when nothing new happened.
+    """
     project = get_object_or_404(Project, slug=slug)
 
     try:
-        parser = ParserFactory.get_parser(file_format)
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-    strings = TranslatableString.objects.filter(
-        project=project, is_active=True
-    ).prefetch_related("translations")
+        since = int(request.query_params.get("since", 0))
+        if since < 0:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"detail": "since must be a non-negative integer cursor."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    from parsers.base import ParsedEntry
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_PAGE_SIZE))
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"detail": f"limit must be an integer between 1 and {MAX_PAGE_SIZE}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    entries = []
-    translations_map = {}
+    changes, next_cursor, has_more = changes_since(project.id, since, limit)
+    return Response({
+        "changes": StringChangeSerializer(changes, many=True).data,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
 
-    for s in strings:
-        entry = ParsedEntry(
-            key=s.key,
-            source_text=s.source_text,
-            context=s.context,
-            has_plurals=s.has_plurals,
-            plural_forms=s.plural_forms,
-            order=s.order,
-            max_length=s.max_length,
-        )
-        entries.append(entry)
 
-        translation = s.translations.filter(language_code=language).first()
-        if translation:
-            translations_map[s.key] = translation.translated_text
+@api_view(["GET"])
+def export_translations(request, slug, language, file_format):
+    """Export translations for a language in the specified format."""
+    project = get_object_or_404(Project, slug=slug)
 
-    content = parser.export(entries, translations_map if translations_map else None)
+    try:
+        parser = ParserFactory.get_parser(file_format)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     content_types = {
         "json": "application/json",
@@ -160,10 +205,27 @@ def export_translations(request, slug, language, file_format):
         "strings": "text/plain",
         "xliff": "application/xml",
         "xlf": "application/xml",
+        "xliff2": "application/xml",
     }
     content_type = content_types.get(file_format, "text/plain")
 
-    return Response(
-        content,
+    # Stream the export so the full document is never built in memory
+    return StreamingHttpResponse(
+        export.export_translations(parser, project, language),
         content_type=f"{content_type}; charset=utf-8",
     )
+
+
+@api_view(["GET"])
+@permission_classes([IsManagerOrAbove])
+def import_job_detail(request, slug, job_id):
+    """Report the status and progress counts of one of the project's import jobs."""
+    job = get_object_or_404(ImportJob, id=job_id, project__slug=slug)
+    return Response(ImportJobSerializer(job).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def parse_cache_stats(request):
+    """Report the hit/miss counters of this worker's parse cache."""
+    return Response(get_parse_cache().stats())
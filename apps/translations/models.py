@@ -1,6 +1,86 @@
 import uuid
+from collections import Counter
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.resources.models import TranslatableString
+
+
+def _adjust_translation_counts(deltas: Counter) -> None:
+    """Add ``deltas[string_id]`` to each string's translation_count."""
+    by_delta: dict[int, list] = {}
+    for string_id, delta in deltas.items():
+        if string_id is not None and delta:
+            by_delta.setdefault(delta, []).append(string_id)
+    for delta, string_ids in by_delta.items():
+        TranslatableString.objects.filter(pk__in=string_ids).update(
+            translation_count=F("translation_count") + delta,
+        )
+
+
+def _recount_translations(string_ids) -> None:
+    """Recompute translation_count of the given strings from their rows."""
+    counts = (
+        Translation.objects.filter(string=OuterRef("pk"))
+        .order_by()
+        .values("string")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    TranslatableString.objects.filter(pk__in=list(string_ids)).update(
+        translation_count=Coalesce(Subquery(counts), 0),
+    )
+
+
+class TranslationQuerySet(models.QuerySet):
+    """Keeps TranslatableString.translation_count in step on bulk writes.
+
+    Each method changes the counters in the same transaction as the rows.
+    Rows whose string changes are locked first, through a pk subquery so
+    that querysets using DISTINCT can be locked too.
+    """
+
+    def _locked_string_ids(self) -> list:
+        return list(
+            Translation.objects.select_for_update()
+            .filter(pk__in=self.values("pk"))
+            .values_list("string_id", flat=True)
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Which rows were inserted is unknown, so count them again
+                _recount_translations({obj.string_id for obj in objs})
+            else:
+                _adjust_translation_counts(Counter(obj.string_id for obj in created))
+        return created
+
+    def update(self, **kwargs):
+        # bulk_update() runs through here as well
+        if "string" not in kwargs and "string_id" not in kwargs:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            previous = set(Translation.objects.filter(pk__in=pks)._locked_string_ids())
+            rows = super().update(**kwargs)
+            current = set(Translation.objects.filter(pk__in=pks).values_list("string_id", flat=True))
+            _recount_translations(previous | current)
+        return rows
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            deleted = Counter(self._locked_string_ids())
+            result = super().delete()
+            _adjust_translation_counts(Counter({string_id: -n for string_id, n in deleted.items()}))
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Translation(models.Model):
@@ -23,6 +103,8 @@ class Translation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TranslationQuerySet.as_manager()
+
     class Meta:
         ordering = ["-updated_at"]
         constraints = [
@@ -40,3 +122,26 @@ class Translation(models.Model):
 
     def __str__(self):
         return f"{self.string.key} [{self.language_code}]"
+
+    def save(self, *args, **kwargs):
+        # Keep TranslatableString.translation_count in step, in the same transaction
+        with transaction.atomic():
+            if self._state.adding:
+                previous_string_id = None
+            else:
+                # Locked, so a concurrent save cannot move the row in between
+                previous_string_id = (
+                    Translation.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("string_id", flat=True)
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            if previous_string_id != self.string_id:
+                _adjust_translation_counts(Counter({self.string_id: 1, previous_string_id: -1}))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            _adjust_translation_counts(Counter({self.string_id: -1}))
+        return result
@@ -1,6 +1,7 @@
-"""Tests for translation model string representation."""
+"""Tests for the translation model and its per-string translation counter."""
 
 import pytest
+from django.urls import reverse
 
 from apps.projects.models import Project
 from apps.resources.models import ResourceFile, TranslatableString
@@ -21,3 +22,98 @@ class TestTranslationModel:
             string=s, language_code="pt-BR", translated_text="Ola"
         )
         assert str(t) == "greeting [pt-BR]"
+
+
+@pytest.mark.django_db
+class TestTranslationCount:
+    @pytest.fixture
+    def strings(self):
+        p = Project.objects.create(name="P", slug="p")
+        rf = ResourceFile.objects.create(
+            project=p, file_path="en.json", file_format="json", version=1, checksum="x"
+        )
+        return [
+            TranslatableString.objects.create(
+                project=p, resource_file=rf, key=key, source_text=key, order=i
+            )
+            for i, key in enumerate(["a", "b"])
+        ]
+
+    def _counts(self, strings):
+        return [TranslatableString.objects.get(pk=s.pk).translation_count for s in strings]
+
+    def test_create_and_delete(self, strings):
+        a, _ = strings
+        de = Translation.objects.create(string=a, language_code="de", translated_text="A")
+        Translation.objects.create(string=a, language_code="fr", translated_text="A")
+        assert self._counts(strings) == [2, 0]
+
+        de.delete()
+        assert self._counts(strings) == [1, 0]
+
+    def test_update_keeps_count(self, strings):
+        a, _ = strings
+        t = Translation.objects.create(string=a, language_code="de", translated_text="A")
+        t.translated_text = "A!"
+        t.status = "approved"
+        t.save()
+        assert self._counts(strings) == [1, 0]
+
+    def test_moving_to_another_string(self, strings):
+        a, b = strings
+        t = Translation.objects.create(string=a, language_code="de", translated_text="A")
+        t.string = b
+        t.save()
+        assert self._counts(strings) == [0, 1]
+
+    def test_bulk_paths(self, strings):
+        a, b = strings
+        Translation.objects.bulk_create([
+            Translation(string=a, language_code="de", translated_text="A"),
+            Translation(string=a, language_code="fr", translated_text="A"),
+            Translation(string=b, language_code="de", translated_text="B"),
+        ])
+        assert self._counts(strings) == [2, 1]
+
+        Translation.objects.filter(string=a, language_code="fr").update(string=b)
+        assert self._counts(strings) == [1, 2]
+
+        moved = Translation.objects.get(string=a)
+        moved.string = b
+        moved.language_code = "es"
+        Translation.objects.bulk_update([moved], ["string", "language_code"])
+        assert self._counts(strings) == [0, 3]
+
+        Translation.objects.filter(language_code="de").delete()
+        assert self._counts(strings) == [0, 2]
+
+    def test_bulk_create_ignoring_conflicts(self, strings):
+        a, _ = strings
+        Translation.objects.create(string=a, language_code="de", translated_text="A")
+        Translation.objects.bulk_create(
+            [
+                Translation(string=a, language_code="de", translated_text="A!"),
+                Translation(string=a, language_code="fr", translated_text="A"),
+            ],
+            ignore_conflicts=True,
+        )
+        assert self._counts(strings) == [2, 0]
+
+    def test_admin_delete_selected(self, strings, client, user_factory):
+        a, b = strings
+        kept = Translation.objects.create(string=a, language_code="de", translated_text="A")
+        selected = [
+            Translation.objects.create(string=a, language_code="fr", translated_text="A"),
+            Translation.objects.create(string=b, language_code="fr", translated_text="B"),
+        ]
+        client.force_login(user_factory(role="admin", is_staff=True, is_superuser=True))
+
+        response = client.post(reverse("admin:translations_translation_changelist"), {
+            "action": "delete_selected",
+            "_selected_action": [str(t.pk) for t in selected],
+            "post": "yes",
+        })
+
+        assert response.status_code == 302
+        assert list(Translation.objects.all()) == [kept]
+        assert self._counts(strings) == [1, 0]
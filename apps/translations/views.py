@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, extend_schema
@@ -8,6 +9,7 @@ from rest_framework.response import Response
 from apps.accounts.permissions import IsTranslatorOrAbove
 
 from apps.projects.models import Project
+from apps.resources.changes import TRANSLATED, record_changes
 from apps.resources.models import TranslatableString
 from apps.translations.models import Translation
 from apps.translations.serializers import (
@@ -31,7 +33,9 @@ def create_translation(request, slug, string_id):
 
     serializer = TranslationSerializer(data=data)
     serializer.is_valid(raise_exception=True)
-    serializer.save()
+    with transaction.atomic():
+        translation = serializer.save()
+        record_changes(project.id, [(string.pk, string.key, TRANSLATED)], translation.language_code)
 
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -53,7 +57,9 @@ def update_translation(request, slug, string_id, language):
         translation, data=request.data, partial=partial
     )
     serializer.is_valid(raise_exception=True)
-    serializer.save()
+    with transaction.atomic():
+        translation = serializer.save()
+        record_changes(project.id, [(string.pk, string.key, TRANSLATED)], translation.language_code)
 
     return Response(serializer.data)
 
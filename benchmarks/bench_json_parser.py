@@ -0,0 +1,95 @@
+"""Benchmark JSONParser on large nested i18next files.
+
+Generates a nested document (default 1M leaf keys) where a share of the keys
+are i18next plural groups, then times parse() and the plural suffix lookup
+and reports peak traced memory of a full parse.
+
+Usage:
+    python benchmarks/bench_json_parser.py [--keys N] [--depth N] [--plural-ratio R]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.json_parser import I18NEXT_SUFFIXES, JSONParser  # noqa: E402
+
+
+def build_document(keys: int, depth: int, plural_ratio: float, seed: int = 0) -> str:
+    """Build a nested i18next document with about ``keys`` leaves."""
+    rnd = random.Random(seed)
+    root: dict = {}
+    fanout = max(2, round(keys ** (1 / (depth + 1))))
+    written = 0
+    index = 0
+    while written < keys:
+        node = root
+        for level in range(depth):
+            node = node.setdefault(f"section{(index // fanout ** (level + 1)) % fanout}", {})
+        if rnd.random() < plural_ratio:
+            for form in ("one", "few", "many", "other"):
+                node[f"item{index}_{form}"] = f"{{{{count}}}} item {index} ({form})"
+            written += 4
+        else:
+            node[f"label{index}"] = f"Label number {index}"
+            written += 1
+        index += 1
+    return json.dumps(root, ensure_ascii=False, indent=2)
+
+
+def split_with_endswith(name: str) -> tuple[str, str | None]:
+    """The previous suffix check: one endswith() per suffix."""
+    for suffix in I18NEXT_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)], suffix[1:]
+    return name, None
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--keys", type=int, default=1_000_000)
+    arg_parser.add_argument("--depth", type=int, default=4)
+    arg_parser.add_argument("--plural-ratio", type=float, default=0.1)
+    args = arg_parser.parse_args()
+
+    parser = JSONParser()
+    content = build_document(args.keys, args.depth, args.plural_ratio)
+    size_mb = len(content.encode("utf-8")) / 1e6
+    print(f"{args.keys:,} keys, depth {args.depth}, {size_mb:.1f} MB")
+
+    elapsed = timed(lambda: parser.parse(content))
+    entries = parser.parse(content)
+    print(f"parse                 {elapsed:8.2f} s  {len(entries) / elapsed:12,.0f} entries/s  {size_mb / elapsed:6.1f} MB/s")
+
+    # Deep nesting beyond the recursion limit is handled by the explicit stack
+    deep = '{"a": ' * 5000 + '"leaf"' + "}" * 5000
+    elapsed = timed(lambda: parser.parse(deep))
+    print(f"parse depth 5000      {elapsed:8.4f} s")
+
+    names = [f"item{i}_{form}" for i in range(200_000) for form in ("one", "other")]
+    names += [f"label{i}" for i in range(400_000)]
+    old = timed(lambda: [split_with_endswith(name) for name in names])
+    new = timed(lambda: [parser._split_plural_suffix(name) for name in names])
+    print(f"suffix: endswith      {old:8.3f} s")
+    print(f"suffix: lookup        {new:8.3f} s  ({old / new:.1f}x)")
+
+    tracemalloc.start()
+    parser.parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"peak traced memory    {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
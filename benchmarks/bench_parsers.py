@@ -0,0 +1,218 @@
+"""Parser throughput and peak-memory benchmark suite.
+
+Generates synthetic resource files for every format at several sizes, then
+measures parse() and export_iter() throughput (entries/s and MB/s) and the
+peak memory traced by tracemalloc. Results are written as JSON so runs from
+different releases can be compared with --compare.
+
+Usage:
+    python benchmarks/bench_parsers.py [--sizes 1000,10000] [--formats po,strings]
+                                       [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.base import ParsedBatch, ParsedEntry  # noqa: E402
+from parsers.factory import ParserFactory  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Benchmarked formats: name -> (ParserFactory format, entry generator options)
+FORMATS = {
+    "json-nested": ("json", {"nested": True}),
+    "json-plurals": ("json", {"nested": True, "plurals": True}),
+    "po": ("po", {"contexts": True, "msgctxt": True, "plurals": True}),
+    "xliff-1.2": ("xliff", {"contexts": True}),
+    "xliff-2.0": ("xliff2", {"contexts": True}),
+    "strings": ("strings", {"contexts": True}),
+}
+
+WORDS = "save cancel open file settings account profile message upload search results".split()
+
+
+def generate_entries(
+    count: int,
+    nested: bool = False,
+    plurals: bool = False,
+    contexts: bool = False,
+    msgctxt: bool = False,
+) -> ParsedBatch:
+    """Build ``count`` synthetic entries shaped like a real catalog."""
+    batch = ParsedBatch()
+    for index in range(count):
+        words = " ".join(WORDS[(index + offset) % len(WORDS)] for offset in range(index % 7 + 2))
+        key = f"screen{index % 50}.section{index % 17}.label{index}" if nested else f"label_{index}"
+        context = ""
+        if contexts and index % 5 == 0:
+            context = f"Shown on screen {index % 50}"
+            # PO contexts are encoded in the key, as POParser does
+            if msgctxt:
+                key = f"screen{index % 50}\x04{key}"
+        if plurals and index % 10 == 0:
+            batch.append(ParsedEntry(
+                key=key,
+                source_text=f"{{{{count}}}} {words}",
+                context=context,
+                has_plurals=True,
+                plural_forms={"one": f"{{{{count}}}} {words}", "other": f"{{{{count}}}} {words}s"},
+                order=index,
+            ))
+        else:
+            batch.append(ParsedEntry(key=key, source_text=f"{words.capitalize()} %s #{index}", context=context, order=index))
+    return batch
+
+
+def measure(func: Callable[[], object], repeat: int, memory: bool) -> tuple[float, int | None]:
+    """Return the best wall time of ``repeat`` runs and the traced peak of one more."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def consume(chunks: Iterator[str]) -> int:
+    """Drain an export stream the way a response would, without joining it."""
+    return sum(len(chunk) for chunk in chunks)
+
+
+def run(sizes: list[int], formats: list[str], repeat: int, memory: bool) -> list[dict]:
+    results = []
+    for name in formats:
+        file_format, options = FORMATS[name]
+        parser = ParserFactory.get_parser(file_format)
+        for size in sizes:
+            source = generate_entries(size, **options)
+            content = parser.export(source)
+            size_bytes = len(content.encode("utf-8"))
+            entries = parser.parse_batch(content)
+            translations = {key: f"[{text}]" for key, text in zip(entries.keys, entries.source_texts)}
+
+            operations = {
+                "parse": lambda: parser.parse_batch(content),
+                "export": lambda: consume(parser.export_iter(entries, translations)),
+            }
+            for operation, func in operations.items():
+                seconds, peak = measure(func, repeat, memory)
+                result = {
+                    "format": name,
+                    "operation": operation,
+                    "entries": len(entries),
+                    "bytes": size_bytes,
+                    "seconds": round(seconds, 6),
+                    "entries_per_s": round(len(entries) / seconds, 1),
+                    "mb_per_s": round(size_bytes / 1e6 / seconds, 3),
+                    "peak_memory_bytes": peak,
+                }
+                results.append(result)
+                print(_format_row(result), file=sys.stderr)
+            del source, content, entries, translations
+    return results
+
+
+def _format_row(result: dict) -> str:
+    peak = result["peak_memory_bytes"]
+    peak_text = f"{peak / 1e6:9.1f} MB" if peak is not None else "        -   "
+    return (
+        f"{result['format']:<13} {result['operation']:<7} {result['entries']:>9,} entries "
+        f"{result['entries_per_s']:>12,.0f}/s {result['mb_per_s']:>8.2f} MB/s peak {peak_text}"
+    )
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """Print throughput and memory ratios against a previous results file."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["format"], r["operation"], r["entries"]): r for r in json.load(f)["results"]
+        }
+    print(f"\nCompared with {baseline_path} (throughput and memory as new/old):", file=sys.stderr)
+    for result in results:
+        old = baseline.get((result["format"], result["operation"], result["entries"]))
+        if old is None:
+            continue
+        speed = result["entries_per_s"] / old["entries_per_s"]
+        line = f"{result['format']:<13} {result['operation']:<7} {result['entries']:>9,} entries  speed {speed:5.2f}x"
+        if result["peak_memory_bytes"] and old.get("peak_memory_bytes"):
+            line += f"  memory {result['peak_memory_bytes'] / old['peak_memory_bytes']:5.2f}x"
+        print(line, file=sys.stderr)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                            help="comma-separated entry counts")
+    arg_parser.add_argument("--formats", default=",".join(FORMATS),
+                            help=f"comma-separated subset of: {', '.join(FORMATS)}")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="timed runs per measurement; the best is kept")
+    arg_parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    arg_parser.add_argument("--output", help="write results JSON here instead of stdout")
+    arg_parser.add_argument("--compare", help="results JSON of a previous run to compare against")
+    args = arg_parser.parse_args()
+
+    formats = args.formats.split(",")
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        arg_parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = run(sizes, formats, args.repeat, not args.no_memory)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Microbenchmark for placeholder extraction and variable validation.
+
+Compares the single-pass scanner with running every FORMAT_PATTERNS regex
+in turn, over a corpus shaped like real catalogs: mostly plain UI strings,
+some with printf, brace, ICU-like and i18next placeholders, each source
+validated against several translations.
+
+Usage:
+    python benchmarks/bench_validation.py [--strings N] [--languages N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.validation import (  # noqa: E402
+    FORMAT_PATTERNS,
+    extract_variables,
+    validate_many,
+    validate_variables,
+)
+
+WORDS = (
+    "save cancel open file settings account profile message item user project "
+    "delete confirm upload download search results page next previous close"
+).split()
+
+PLACEHOLDERS = ["%s", "%d", "%1$s", "{name}", "{0}", "{}", "{{count}}", "%{user}", "${total}", "$t(common.ok)"]
+
+
+def build_corpus(strings: int, languages: int, seed: int = 0) -> list[tuple[str, str]]:
+    rnd = random.Random(seed)
+    pairs = []
+    for _ in range(strings):
+        words = [rnd.choice(WORDS) for _ in range(rnd.randint(2, 12))]
+        # About a third of UI strings carry placeholders
+        if rnd.random() < 0.35:
+            for _ in range(rnd.randint(1, 3)):
+                words.insert(rnd.randrange(len(words) + 1), rnd.choice(PLACEHOLDERS))
+        source = " ".join(words).capitalize()
+        for _ in range(languages):
+            translation = " ".join(reversed(source.split()))
+            if rnd.random() < 0.05:
+                translation += " " + rnd.choice(PLACEHOLDERS)
+            pairs.append((source, translation))
+    return pairs
+
+
+def extract_variables_per_pattern(text: str) -> set[str]:
+    """The previous implementation: one full pass per pattern."""
+    variables = set()
+    for pattern in FORMAT_PATTERNS:
+        variables.update(pattern.findall(text) if pattern.groups else [m.group() for m in pattern.finditer(text)])
+    return variables
+
+
+def validate_per_pattern(source: str, translation: str) -> list[str]:
+    source_vars = extract_variables_per_pattern(source)
+    translation_vars = extract_variables_per_pattern(translation)
+    errors = []
+    if source_vars - translation_vars:
+        errors.append("missing")
+    if translation_vars - source_vars:
+        errors.append("extra")
+    return errors
+
+
+def bench(label: str, func, repeat: int, count: int) -> None:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<32} {best * 1000:9.1f} ms  {count / best:12,.0f} pairs/s")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--strings", type=int, default=20_000)
+    arg_parser.add_argument("--languages", type=int, default=5)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    pairs = build_corpus(args.strings, args.languages)
+    texts = [text for pair in pairs for text in pair]
+    assert all(extract_variables(t) == extract_variables_per_pattern(t) for t in texts)
+
+    print(f"{len(pairs):,} pairs, {args.strings:,} distinct sources")
+    bench("extract: per pattern", lambda: [extract_variables_per_pattern(t) for t in texts], args.repeat, len(pairs))
+    bench("extract: single scanner", lambda: [extract_variables(t) for t in texts], args.repeat, len(pairs))
+    bench("validate: per pattern", lambda: [validate_per_pattern(s, t) for s, t in pairs], args.repeat, len(pairs))
+    bench("validate_variables (memoized)", lambda: [validate_variables(s, t) for s, t in pairs], args.repeat, len(pairs))
+    bench("validate_many", lambda: validate_many(pairs), args.repeat, len(pairs))
+
+
+if __name__ == "__main__":
+    main()
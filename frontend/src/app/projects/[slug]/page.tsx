@@ -94,6 +94,10 @@ export default function ProjectPage({
   const [project, setProject] = useState<Project | null>(null);
   const [progress, setProgress] = useState<ProgressData | null>(null);
   const [strings, setStrings] = useState<StringItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Bumped whenever the string list is reloaded, so responses to an older query are dropped
+  const stringsQuery = useRef(0);
   const [resources, setResources] = useState<ResourceFile[]>([]);
   const [search, setSearch] = useState("");
   const [tab, setTab] = useState<"strings" | "resources" | "github">("strings");
@@ -118,7 +122,7 @@ export default function ProjectPage({
   useEffect(() => {
     getProject(slug).then(setProject);
     getProgress(slug).then(setProgress);
-    getStrings(slug).then(setStrings);
+    loadStrings();
     getResources(slug).then(setResources);
     loadGhRepo();
   }, [slug]);
@@ -139,7 +143,7 @@ export default function ProjectPage({
     try {
       await uploadResource(slug, file);
       getResources(slug).then(setResources);
-      getStrings(slug).then(setStrings);
+      loadStrings();
       getProgress(slug).then(setProgress);
     } finally {
       setUploading(false);
@@ -147,13 +151,34 @@ export default function ProjectPage({
     }
   }
 
-  async function handleSearch() {
+  // Load the first page of strings for the current search
+  async function loadStrings() {
+    const query = ++stringsQuery.current;
     const data = await getStrings(slug, search ? { search } : undefined);
-    setStrings(data);
+    if (query !== stringsQuery.current) return;
+    setStrings(data.results);
+    setNextCursor(data.next_cursor);
+  }
+
+  async function loadMoreStrings() {
+    if (!nextCursor) return;
+    const query = stringsQuery.current;
+    setLoadingMore(true);
+    try {
+      const params: Record<string, string> = { cursor: nextCursor };
+      if (search) params.search = search;
+      const data = await getStrings(slug, params);
+      // The search or filter changed while this page was loading
+      if (query !== stringsQuery.current) return;
+      setStrings((current) => [...current, ...data.results]);
+      setNextCursor(data.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
   }
 
   useEffect(() => {
-    const timer = setTimeout(handleSearch, 300);
+    const timer = setTimeout(loadStrings, 300);
     return () => clearTimeout(timer);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [search]);
@@ -208,7 +233,7 @@ export default function ProjectPage({
       );
       await loadGhRepo();
       getResources(slug).then(setResources);
-      getStrings(slug).then(setStrings);
+      loadStrings();
       getProgress(slug).then(setProgress);
     } catch {
       setGhSyncResult("Sync failed. Check repository settings.");
@@ -354,7 +379,7 @@ export default function ProjectPage({
                 : "border-transparent text-gray-500 hover:text-gray-700"
             }`}
           >
-            Strings ({strings.length})
+            Strings ({progress?.total_strings ?? strings.length})
           </button>
           <button
             onClick={() => setTab("resources")}
@@ -434,6 +459,18 @@ export default function ProjectPage({
                 </tbody>
               </table>
             </div>
+
+            {nextCursor && (
+              <div className="flex justify-center mt-4">
+                <button
+                  onClick={loadMoreStrings}
+                  disabled={loadingMore}
+                  className="rounded-lg border px-4 py-2 text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+                >
+                  {loadingMore ? "Loading..." : "Load more"}
+                </button>
+              </div>
+            )}
           </>
         )}
 
@@ -126,6 +126,7 @@ export async function uploadResource(slug: string, file: File, fileFormat?: stri
 }
 
 // --- Strings ---
+// One page of strings; pass next_cursor back as `cursor` for the next page
 export async function getStrings(
   slug: string,
   params?: Record<string, string>
@@ -195,6 +195,52 @@ TRANSLATION_MEMORY = {
     'MAX_RESULTS': 10,
 }
 
+# Parse cache (in-process LRU, plus an optional on-disk tier when DIRECTORY is set).
+# The LRU is held by every worker process, so it stays small unless raised here.
+PARSE_CACHE = {
+    'MAX_ROWS': int(os.getenv('PARSE_CACHE_MAX_ROWS', '10000')),
+    'DIRECTORY': os.getenv('PARSE_CACHE_DIR', ''),
+}
+
+# Archive uploads: members are parsed in a pool of worker processes
+ARCHIVE_UPLOAD = {
+    'MAX_WORKERS': int(os.getenv('ARCHIVE_UPLOAD_WORKERS', '0')) or None,  # None = CPU count
+    'MAX_MEMBERS': 1000,
+    'MAX_TOTAL_SIZE': 256 * 1024 * 1024,
+}
+
+# Resource imports: rows per INSERT/UPDATE statement when strings are written.
+# On PostgreSQL, files with at least COPY_MIN_ROWS strings are loaded with COPY.
+RESOURCE_IMPORT = {
+    'CREATE_BATCH_SIZE': int(os.getenv('IMPORT_CREATE_BATCH_SIZE', '1000')),
+    'UPDATE_BATCH_SIZE': int(os.getenv('IMPORT_UPDATE_BATCH_SIZE', '500')),
+    'COPY_MIN_ROWS': int(os.getenv('IMPORT_COPY_MIN_ROWS', '10000')),
+}
+
+# Exports read strings and their translations this many at a time
+RESOURCE_EXPORT = {
+    'CHUNK_SIZE': int(os.getenv('EXPORT_CHUNK_SIZE', '2000')),
+}
+
+# Async imports: uploads queued with ?async=1 are spooled here until the
+# run_import_worker command processes them
+IMPORT_JOBS = {
+    'SPOOL_DIR': os.getenv('IMPORT_SPOOL_DIR', ''),  # '' = system temp dir
+    'POLL_INTERVAL': float(os.getenv('IMPORT_WORKER_POLL_INTERVAL', '2')),
+    # Running jobs whose worker has not reported for this long are requeued,
+    # up to MAX_ATTEMPTS claims, then failed
+    'LEASE_SECONDS': float(os.getenv('IMPORT_JOB_LEASE_SECONDS', '1800')),
+    'MAX_ATTEMPTS': int(os.getenv('IMPORT_JOB_MAX_ATTEMPTS', '3')),
+}
+
+# Raw uploaded files, compressed and stored once per SHA-256; '' disables it
+BLOB_STORE = {
+    'DIRECTORY': os.getenv('BLOB_STORE_DIR', ''),
+    'COMPRESSION': os.getenv('BLOB_STORE_COMPRESSION', 'zstd'),  # zlib if zstandard is missing
+    'LEVEL': None,
+    'KEEP_VERSIONS': int(os.getenv('BLOB_STORE_KEEP_VERSIONS', '0')),  # 0 = keep all
+}
+
 # WhiteNoise static files compression
 STORAGES = {
     'staticfiles': {
@@ -1,4 +1,4 @@
-from parsers.base import BaseParser, ParsedEntry
+from parsers.base import BaseParser, ParsedBatch, ParsedEntry
 from parsers.factory import ParserFactory
 
-__all__ = ["BaseParser", "ParsedEntry", "ParserFactory"]
+__all__ = ["BaseParser", "ParsedBatch", "ParsedEntry", "ParserFactory"]
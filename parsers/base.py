@@ -1,31 +1,264 @@
+import hashlib
+import json
+import zlib
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
+from parsers.exceptions import ParseError
 
-@dataclass
+# Shared read-only defaults, so entries without plurals or flags allocate nothing
+EMPTY_PLURAL_FORMS: Mapping[str, str] = MappingProxyType({})
+EMPTY_FLAGS: tuple[str, ...] = ()
+
+# Approximate size of the chunks yielded by export_iter()
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Parser input: text, or UTF-8 encoded bytes in any buffer (bytes, memoryview, mmap)
+RawContent = str | bytes | memoryview
+
+
+def compute_content_hash(
+    source_text: str,
+    context: str = "",
+    has_plurals: bool = False,
+    plural_forms: Mapping[str, str] = EMPTY_PLURAL_FORMS,
+) -> str:
+    """Return the SHA-256 hex digest of the fields that define a string's content.
+
+    Two strings with equal source text, context and plural forms have the
+    same hash regardless of their key, position or the order of the forms.
+    """
+    payload = json.dumps(
+        [source_text, context, has_plurals, sorted(plural_forms.items())],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
 class ParsedEntry:
     key: str
     source_text: str
     context: str = ""
     has_plurals: bool = False
-    plural_forms: dict = field(default_factory=dict)
+    plural_forms: Mapping[str, str] = field(default_factory=lambda: EMPTY_PLURAL_FORMS)
     order: int = 0
     max_length: int | None = None
-    flags: list[str] = field(default_factory=list)
+    flags: Sequence[str] = EMPTY_FLAGS
+
+    @property
+    def content_hash(self) -> str:
+        return compute_content_hash(self.source_text, self.context, self.has_plurals, self.plural_forms)
+
+
+class ParsedBatch:
+    """Columnar container for parser output.
+
+    Each ParsedEntry field is stored as its own column. Plural forms, max
+    lengths and flags are rarely set, so they live in sparse dicts keyed by
+    row index. Indexing or iterating a batch yields ParsedEntry views, which
+    keeps it usable anywhere a list of entries is expected.
+    """
+
+    __slots__ = ("keys", "source_texts", "contexts", "orders", "plural_forms", "max_lengths", "flags")
+
+    def __init__(self):
+        self.keys: list[str] = []
+        self.source_texts: list[str] = []
+        self.contexts: list[str] = []
+        self.orders = array("q")
+        self.plural_forms: dict[int, Mapping[str, str]] = {}
+        self.max_lengths: dict[int, int] = {}
+        self.flags: dict[int, Sequence[str]] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[ParsedEntry]) -> "ParsedBatch":
+        batch = cls()
+        for entry in entries:
+            batch.append(entry)
+        return batch
+
+    def append(self, entry: ParsedEntry) -> None:
+        row = len(self.keys)
+        self.keys.append(entry.key)
+        self.source_texts.append(entry.source_text)
+        self.contexts.append(entry.context)
+        self.orders.append(entry.order)
+        if entry.has_plurals:
+            self.plural_forms[row] = entry.plural_forms
+        if entry.max_length is not None:
+            self.max_lengths[row] = entry.max_length
+        if entry.flags:
+            self.flags[row] = entry.flags
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, row: int) -> ParsedEntry:
+        if row < 0:
+            row += len(self.keys)
+        plural_forms = self.plural_forms.get(row)
+        return ParsedEntry(
+            key=self.keys[row],
+            source_text=self.source_texts[row],
+            context=self.contexts[row],
+            has_plurals=plural_forms is not None,
+            plural_forms=EMPTY_PLURAL_FORMS if plural_forms is None else plural_forms,
+            order=self.orders[row],
+            max_length=self.max_lengths.get(row),
+            flags=self.flags.get(row, EMPTY_FLAGS),
+        )
+
+    def __iter__(self) -> Iterator[ParsedEntry]:
+        for row in range(len(self.keys)):
+            yield self[row]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the batch to compressed JSON, column by column."""
+        data = {
+            "keys": self.keys,
+            "source_texts": self.source_texts,
+            "contexts": self.contexts,
+            "orders": self.orders.tolist(),
+            "plural_forms": [[row, dict(forms)] for row, forms in self.plural_forms.items()],
+            "max_lengths": [[row, length] for row, length in self.max_lengths.items()],
+            "flags": [[row, list(flags)] for row, flags in self.flags.items()],
+        }
+        return zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "ParsedBatch":
+        data = json.loads(zlib.decompress(payload))
+        batch = cls()
+        batch.keys = data["keys"]
+        batch.source_texts = data["source_texts"]
+        batch.contexts = data["contexts"]
+        batch.orders = array("q", data["orders"])
+        batch.plural_forms = {row: forms for row, forms in data["plural_forms"]}
+        batch.max_lengths = {row: length for row, length in data["max_lengths"]}
+        batch.flags = {row: flags for row, flags in data["flags"]}
+        return batch
+
+    def iter_by_key(self) -> Iterator[ParsedEntry]:
+        """Yield entries sorted by key, in code point order, sorting row indices only."""
+        for row in sorted(range(len(self.keys)), key=self.keys.__getitem__):
+            yield self[row]
+
+    def iter_ordered(self) -> Iterator[ParsedEntry]:
+        """Yield entries sorted by ``order`` without sorting the views themselves."""
+        orders = self.orders
+        if all(orders[i] <= orders[i + 1] for i in range(len(orders) - 1)):
+            yield from self
+            return
+        for row in sorted(range(len(orders)), key=orders.__getitem__):
+            yield self[row]
 
 
 class BaseParser(ABC):
+    # Bump whenever parse() output changes, so cached results are not reused
+    version = 1
+
     @abstractmethod
-    def parse(self, content: str) -> list[ParsedEntry]:
-        """Parse file content and return a list of ParsedEntry objects."""
+    def parse(self, content: RawContent) -> list[ParsedEntry]:
+        """Parse file content and return a list of ParsedEntry objects.
+
+        ``content`` may be a str or any buffer of UTF-8 encoded bytes, such
+        as a memory-mapped upload, which is then decoded without an
+        intermediate bytes copy.
+        """
         ...
 
+    def iter_parse(self, content: RawContent) -> Iterator[ParsedEntry]:
+        """Parse file content and yield ParsedEntry objects lazily.
+
+        Parsers that can tokenize incrementally should override this so that
+        callers consuming entries one at a time never hold the whole result.
+        The default implementation simply iterates over ``parse()``.
+        """
+        yield from self.parse(content)
+
+    def parse_batch(self, content: RawContent) -> ParsedBatch:
+        """Parse file content into a columnar ParsedBatch."""
+        return ParsedBatch.from_entries(self.iter_parse(content))
+
     @abstractmethod
-    def export(self, entries: list[ParsedEntry], translations: dict[str, str] | None = None) -> str:
+    def export(
+        self,
+        entries: Iterable[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> str:
         """Export entries back to the original file format.
 
         Args:
-            entries: List of ParsedEntry objects to export.
+            entries: ParsedEntry objects or a ParsedBatch to export.
             translations: Optional dict mapping key to translated text.
+                Translated plural forms are looked up as ``<key>_<category>``.
+            language: Optional target language code. Formats that encode
+                plurals write the language's CLDR plural categories.
         """
         ...
+
+    def export_iter(
+        self,
+        entries: Iterable[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> Iterator[str]:
+        """Export entries as a sequence of text chunks, following ``order``.
+
+        Joining the chunks gives the same document as ``export()``. An
+        iterator of entries is consumed lazily, one entry at a time, and must
+        already be in ``order``, or in export_order() where a format has one. Parsers
+        that can serialize entry by entry should override this so the output
+        never has to be held in memory at once. The default implementation
+        yields the result of ``export()`` as a single chunk.
+        """
+        yield self.export(entries, translations, language)
+
+    def export_order(self, keys: Iterable[str]) -> list[int] | None:
+        """Return the positions of ``keys``, given in ``order``, in the order export_iter() writes them.
+
+        None, the default, means entries are written in ``order``. It is
+        returned without reading ``keys``, so callers may pass a lazy iterable
+        and only fetch the keys for formats that need them.
+        """
+        return None
+
+    def _decode(self, content: RawContent) -> str:
+        """Return ``content`` as text, decoding byte buffers as UTF-8 in place."""
+        if isinstance(content, str):
+            return content
+        try:
+            return str(content, "utf-8")
+        except UnicodeDecodeError:
+            raise ParseError("File must be UTF-8 encoded.")
+
+    def _chunked(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Coalesce small output pieces into chunks of about EXPORT_CHUNK_SIZE."""
+        buffer = []
+        size = 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def _ordered(self, entries: Iterable[ParsedEntry]) -> Iterable[ParsedEntry]:
+        """Return entries in ``order``, reading a ParsedBatch column-wise.
+
+        Iterators are passed through untouched; they are already in order.
+        """
+        if isinstance(entries, ParsedBatch):
+            return entries.iter_ordered()
+        if isinstance(entries, Iterator):
+            return entries
+        return sorted(entries, key=lambda e: e.order)
@@ -0,0 +1,150 @@
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from parsers.base import ParsedBatch, RawContent
+from parsers.factory import ParserFactory
+
+logger = logging.getLogger(__name__)
+
+# Parsed rows are held in every server process; keep this tier small and
+# let the on-disk tier carry the bulk of the cache
+DEFAULT_MAX_ROWS = 10_000
+
+
+class ParseCache:
+    """Content-addressed cache of parse results.
+
+    Results are keyed by (format, content checksum, parser version). The
+    first tier is an in-process LRU bounded by the total number of cached
+    rows; the optional second tier stores compressed ParsedBatch payloads in
+    ``directory`` so they survive restarts and are shared between workers.
+
+    Cached batches are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS, directory: str | os.PathLike | None = None):
+        self.max_rows = max_rows
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[tuple[str, str, int], ParsedBatch] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_parse(self, file_format: str, content: RawContent, checksum: str) -> ParsedBatch:
+        """Return the parsed batch for ``content``, parsing it only on a miss.
+
+        Args:
+            file_format: File extension or format name, as for ParserFactory.
+            content: The file content, parsed on a cache miss.
+            checksum: SHA-256 hex digest of ``content``.
+        """
+        batch = self.get(file_format, checksum)
+        if batch is None:
+            batch = ParserFactory.get_parser_class(file_format)().parse_batch(content)
+            self.put(file_format, checksum, batch)
+        return batch
+
+    def get(self, file_format: str, checksum: str) -> ParsedBatch | None:
+        """Return the cached batch for the given content checksum, or None on a miss."""
+        key = self._key(file_format, checksum)
+
+        with self._lock:
+            batch = self._entries.get(key)
+            if batch is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return batch
+
+        batch = self._read_disk(key)
+        if batch is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._store(key, batch)
+        return batch
+
+    def put(self, file_format: str, checksum: str, batch: ParsedBatch) -> None:
+        """Store a batch parsed elsewhere, e.g. in a worker process."""
+        key = self._key(file_format, checksum)
+        self._write_disk(key, batch)
+        self._store(key, batch)
+
+    def clear(self) -> None:
+        """Empty the in-process tier and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "max_rows": self.max_rows,
+                "disk_enabled": self.directory is not None,
+            }
+
+    def _key(self, file_format: str, checksum: str) -> tuple[str, str, int]:
+        parser_class = ParserFactory.get_parser_class(file_format)
+        return (file_format.lower().lstrip("."), checksum, parser_class.version)
+
+    def _store(self, key: tuple[str, str, int], batch: ParsedBatch) -> None:
+        rows = len(batch)
+        if rows > self.max_rows:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = batch
+            self._rows += rows
+            while self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+                self.evictions += 1
+
+    def _disk_path(self, key: tuple[str, str, int]) -> Path:
+        file_format, checksum, version = key
+        return self.directory / checksum[:2] / f"{checksum}.{file_format}.v{version}.batch"
+
+    def _read_disk(self, key: tuple[str, str, int]) -> ParsedBatch | None:
+        if self.directory is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            return ParsedBatch.from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable parse cache file %s: %s", path, e)
+            return None
+
+    def _write_disk(self, key: tuple[str, str, int], batch: ParsedBatch) -> None:
+        if self.directory is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial payload
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(batch.to_bytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write parse cache file %s: %s", path, e)
@@ -1,8 +1,8 @@
-from parsers.base import BaseParser
+from parsers.base import BaseParser, ParsedBatch, RawContent
 from parsers.json_parser import JSONParser
 from parsers.po_parser import POParser
 from parsers.strings_parser import StringsParser
-from parsers.xliff_parser import XLIFFParser
+from parsers.xliff_parser import XLIFF2Parser, XLIFFParser
 from parsers.exceptions import UnsupportedFormatError
 
 
@@ -14,6 +14,8 @@ class ParserFactory:
         "strings": StringsParser,
         "xliff": XLIFFParser,
         "xlf": XLIFFParser,
+        # Same parser; exports are written as XLIFF 2.0
+        "xliff2": XLIFF2Parser,
     }
 
     @classmethod
@@ -29,6 +31,11 @@ class ParserFactory:
         Raises:
             UnsupportedFormatError: If the format is not supported.
         """
+        return cls.get_parser_class(file_format)()
+
+    @classmethod
+    def get_parser_class(cls, file_format: str) -> type[BaseParser]:
+        """Get the parser class for the given file format without instantiating it."""
         file_format = file_format.lower().lstrip(".")
         parser_class = cls._parsers.get(file_format)
         if parser_class is None:
@@ -36,7 +43,7 @@ class ParserFactory:
             raise UnsupportedFormatError(
                 f"Unsupported format: '{file_format}'. Supported formats: {supported}"
             )
-        return parser_class()
+        return parser_class
 
     @classmethod
     def register(cls, format_name: str, parser_class: type[BaseParser]) -> None:
@@ -47,3 +54,11 @@ class ParserFactory:
     def supported_formats(cls) -> list[str]:
         """Return list of supported format names."""
         return sorted(cls._parsers.keys())
+
+
+def parse_content(file_format: str, content: RawContent) -> ParsedBatch:
+    """Parse ``content`` into a ParsedBatch.
+
+    This is a module-level function so it can be submitted to a process pool.
+    """
+    return ParserFactory.get_parser_class(file_format)().parse_batch(content)
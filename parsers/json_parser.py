@@ -1,107 +1,348 @@
 import json
-from parsers.base import BaseParser, ParsedEntry
+import re
+from collections.abc import Iterable, Iterator
+from json.decoder import scanstring
+
+from parsers.base import BaseParser, ParsedEntry, RawContent
 from parsers.exceptions import ParseError
+from parsers.plural_rules import get_plural_forms
 
 I18NEXT_SUFFIXES = ("_zero", "_one", "_two", "_few", "_many", "_other", "_plural")
 
+# Every suffix is "_" plus a word without "_", so the last "_"-separated part
+# of a key identifies its suffix with a single set lookup
+PLURAL_FORM_NAMES = frozenset(suffix[1:] for suffix in I18NEXT_SUFFIXES)
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+INDENT = "  "
+
+_decoder = json.JSONDecoder()
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
 
 class JSONParser(BaseParser):
-    def parse(self, content: str) -> list[ParsedEntry]:
+    # 2: plural grouping and duplicate keys follow json.loads regardless of key order
+    version = 2
+
+    def parse(self, content: RawContent) -> list[ParsedEntry]:
+        return list(self.iter_parse(content))
+
+    def iter_parse(self, content: RawContent) -> Iterator[ParsedEntry]:
+        """Yield entries while tokenizing the document incrementally.
+
+        Entries come out exactly as ``json.loads`` would group them: a
+        duplicate key keeps its first position and its last value, and any
+        key with an i18next suffix joins the plural group of its base key,
+        whose bare key is dropped wherever it appears. A first pass reads
+        only the structure to find plural bases and duplicates, so the
+        second can yield regular keys in document order as soon as they are
+        read. Only plural groups are held back, to be yielded last.
+        """
+        content = self._decode(content)
         try:
-            data = json.loads(content)
+            plural_bases, redirects, skips = self._scan_layout(content)
         except json.JSONDecodeError as e:
             raise ParseError(f"Invalid JSON: {e}")
 
-        if not isinstance(data, dict):
-            raise ParseError("JSON root must be an object")
-
-        flat = self._flatten(data)
-        return self._group_entries(flat)
-
-    def export(self, entries: list[ParsedEntry], translations: dict[str, str] | None = None) -> str:
-        result = {}
-        for entry in sorted(entries, key=lambda e: e.order):
-            text = translations.get(entry.key, entry.source_text) if translations else entry.source_text
-            if entry.has_plurals:
-                # Export plural forms
-                forms = entry.plural_forms or {}
-                if translations:
-                    # Check if we have translated plural forms
-                    for form_name, form_text in forms.items():
-                        result_key = f"{entry.key}_{form_name}"
-                        self._set_nested(result, result_key, translations.get(result_key, form_text))
-                else:
-                    for form_name, form_text in forms.items():
-                        result_key = f"{entry.key}_{form_name}"
-                        self._set_nested(result, result_key, form_text)
-            else:
-                self._set_nested(result, entry.key, text)
-        return json.dumps(result, ensure_ascii=False, indent=2) + "\n"
-
-    def _flatten(self, data: dict, prefix: str = "") -> list[tuple[str, str]]:
-        items = []
-        for key, value in data.items():
-            full_key = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, dict):
-                items.extend(self._flatten(value, full_key))
-            else:
-                items.append((full_key, str(value) if not isinstance(value, str) else value))
-        return items
-
-    def _group_entries(self, flat_items: list[tuple[str, str]]) -> list[ParsedEntry]:
-        # Detect i18next plural patterns
         plural_groups: dict[str, dict[str, str]] = {}
-        regular: list[tuple[int, str, str]] = []
-
-        for order, (key, value) in enumerate(flat_items):
-            plural_suffix = None
-            base_key = key
-            for suffix in I18NEXT_SUFFIXES:
-                if key.endswith(suffix):
-                    plural_suffix = suffix[1:]  # remove leading _
-                    base_key = key[:-len(suffix)]
-                    break
-
+        order = 0
+        for key, value in self._iter_leaves(content, redirects, skips):
+            base_key, plural_suffix = self._split_plural_suffix(key)
             if plural_suffix:
-                if base_key not in plural_groups:
-                    plural_groups[base_key] = {}
-                plural_groups[base_key][plural_suffix] = value
-            else:
-                regular.append((order, key, value))
+                plural_groups.setdefault(base_key, {})[plural_suffix] = value
+                continue
+            # Skip if this key is actually the base of a plural group
+            if key in plural_bases:
+                continue
 
-        entries = []
-        order_counter = 0
+            yield ParsedEntry(key=key, source_text=value, order=order)
+            order += 1
 
-        # Add regular entries
-        for _, key, value in regular:
-            # Skip if this key is actually the base of a plural group
-            if key not in plural_groups:
-                entries.append(ParsedEntry(
-                    key=key,
-                    source_text=value,
-                    order=order_counter,
-                ))
-                order_counter += 1
-
-        # Add plural groups
         for base_key, forms in plural_groups.items():
             source = forms.get("one", forms.get("other", next(iter(forms.values()))))
-            entries.append(ParsedEntry(
+            yield ParsedEntry(
                 key=base_key,
                 source_text=source,
                 has_plurals=True,
                 plural_forms=forms,
-                order=order_counter,
-            ))
-            order_counter += 1
-
-        return entries
-
-    def _set_nested(self, data: dict, key: str, value: str) -> None:
-        parts = key.split(".")
-        current = data
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        current[parts[-1]] = value
+                order=order,
+            )
+            order += 1
+
+    def export(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> str:
+        return "".join(self.export_iter(entries, translations, language))
+
+    def export_iter(
+        self,
+        entries: Iterable[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> Iterator[str]:
+        """Stream the nested document, formatted exactly like ``json.dumps(indent=2)``.
+
+        Dotted keys sharing a prefix are written inside one object, so the
+        entries must come in export_order(). A list or ParsedBatch is put in
+        that order here; an iterator is written as it is consumed.
+        """
+        if not isinstance(entries, Iterator):
+            entries = list(self._ordered(entries))
+            entries = [entries[i] for i in self.export_order([entry.key for entry in entries])]
+        categories = get_plural_forms(language) if language else None
+        return self._chunked(self._iter_json(entries, translations, categories))
+
+    def export_order(self, keys: Iterable[str]) -> list[int]:
+        """Return the positions of ``keys``, given in ``order``, grouped by nested object.
+
+        Each object takes the place of its first key, as when nesting into a
+        dict. Like a dict, a repeated key keeps its first place and its last
+        entry, and a key replaced by an object (or the reverse) is dropped.
+        """
+        root: dict = {}
+        for position, key in enumerate(keys):
+            *parents, name = key.split(".")
+            node = root
+            for part in parents:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = {}
+                node = child
+            node[name] = position
+
+        positions = []
+        stack = [iter(root.values())]
+        while stack:
+            value = next(stack[-1], None)
+            if value is None:
+                stack.pop()
+            elif isinstance(value, dict):
+                stack.append(iter(value.values()))
+            else:
+                positions.append(value)
+        return positions
+
+    def _iter_json(
+        self,
+        entries: Iterable[ParsedEntry],
+        translations: dict[str, str] | None,
+        categories: tuple[str, ...] | None,
+    ) -> Iterator[str]:
+        # Names of the objects currently open
+        path: list[str] = []
+        separator = "{"
+        for entry in entries:
+            for key, text in self._leaves(entry, translations, categories):
+                *parents, name = key.split(".")
+                common = 0
+                while common < min(len(path), len(parents)) and path[common] == parents[common]:
+                    common += 1
+                while len(path) > common:
+                    path.pop()
+                    yield "\n" + INDENT * (len(path) + 1) + "}"
+                for part in parents[common:]:
+                    yield f"{separator}\n{INDENT * (len(path) + 1)}{_encode(part)}: {{"
+                    path.append(part)
+                    separator = ""
+                yield f"{separator}\n{INDENT * (len(path) + 1)}{_encode(name)}: {_encode(text)}"
+                separator = ","
+
+        if separator == "{":
+            yield "{}\n"
+            return
+        while path:
+            path.pop()
+            yield "\n" + INDENT * (len(path) + 1) + "}"
+        yield "\n}\n"
+
+    def _leaves(
+        self,
+        entry: ParsedEntry,
+        translations: dict[str, str] | None,
+        categories: tuple[str, ...] | None,
+    ) -> Iterator[tuple[str, str]]:
+        """Yield the ``(key, text)`` pairs written for ``entry``."""
+        if entry.has_plurals and categories:
+            # Write exactly the target language's categories, falling back
+            # to the source form of the same category, then to "other"
+            forms = entry.plural_forms or {}
+            fallback = forms.get("other", entry.source_text)
+            for category in categories:
+                result_key = f"{entry.key}_{category}"
+                form_text = forms.get(category, fallback)
+                yield result_key, translations.get(result_key, form_text) if translations else form_text
+        elif entry.has_plurals:
+            # Export plural forms, translated ones if we have them
+            for form_name, form_text in (entry.plural_forms or {}).items():
+                result_key = f"{entry.key}_{form_name}"
+                yield result_key, translations.get(result_key, form_text) if translations else form_text
+        else:
+            yield entry.key, translations.get(entry.key, entry.source_text) if translations else entry.source_text
+
+    def _scan_layout(self, content: str) -> tuple[set[str], dict[int, tuple[int, int]], dict[int, int]]:
+        """Validate ``content`` and return what decides grouping, without keeping values.
+
+        Returns the dotted keys that are the base of a plural group, then the
+        duplicate keys: ``redirects`` maps where the first value of a
+        duplicate starts to ``(start of its last value, end of the first)``,
+        and ``skips`` maps where each later value starts to where it ends.
+        Only the member names of the objects currently open are held.
+        """
+        idx = WHITESPACE.match(content, 0).end()
+        if not content.startswith("{", idx):
+            _, end = _decoder.raw_decode(content, idx)
+            self._check_end(content, end)
+            raise ParseError("JSON root must be an object")
+
+        redirects: dict[int, tuple[int, int]] = {}
+        skips: dict[int, int] = {}
+        # Per open object: its prefix, its members as name -> list of
+        # [value start, value end, plural bases of an object value or None
+        # for a leaf], and the member of the parent holding it
+        stack: list[tuple[str, dict[str, list[list]], list]] = []
+        prefix = ""
+        members: dict[str, list[list]] = {}
+
+        idx = WHITESPACE.match(content, idx + 1).end()
+        if content.startswith("}", idx):
+            self._check_end(content, idx + 1)
+            return set(), redirects, skips
+
+        while True:
+            if not content.startswith('"', idx):
+                raise json.JSONDecodeError(
+                    "Expecting property name enclosed in double quotes", content, idx
+                )
+            name, idx = scanstring(content, idx + 1)
+            idx = WHITESPACE.match(content, idx).end()
+            if not content.startswith(":", idx):
+                raise json.JSONDecodeError("Expecting ':' delimiter", content, idx)
+            idx = WHITESPACE.match(content, idx + 1).end()
+
+            member = [idx, None, None]
+            members.setdefault(name, []).append(member)
+            if content.startswith("{", idx):
+                idx = WHITESPACE.match(content, idx + 1).end()
+                if not content.startswith("}", idx):
+                    stack.append((prefix, members, member))
+                    prefix = f"{prefix}{name}."
+                    members = {}
+                    continue
+                # Empty objects contribute no leaves
+                idx += 1
+                member[2] = set()
+            else:
+                _, idx = _decoder.raw_decode(content, idx)
+            member[1] = idx
+
+            idx = WHITESPACE.match(content, idx).end()
+            while content.startswith("}", idx):
+                bases = self._close_object(prefix, members, redirects, skips)
+                if not stack:
+                    self._check_end(content, idx + 1)
+                    return bases, redirects, skips
+                prefix, members, member = stack.pop()
+                member[1] = idx + 1
+                member[2] = bases
+                idx = WHITESPACE.match(content, idx + 1).end()
+
+            if not content.startswith(",", idx):
+                raise json.JSONDecodeError("Expecting ',' delimiter", content, idx)
+            idx = WHITESPACE.match(content, idx + 1).end()
+
+    def _close_object(
+        self,
+        prefix: str,
+        members: dict[str, list[list]],
+        redirects: dict[int, tuple[int, int]],
+        skips: dict[int, int],
+    ) -> set[str]:
+        """Record the duplicates of a finished object and return its plural bases."""
+        bases = set()
+        for name, values in members.items():
+            first, last = values[0], values[-1]
+            if len(values) > 1:
+                # Like json.loads: the first position, with the last value
+                redirects[first[0]] = (last[0], first[1])
+                for start, end, _ in values[1:]:
+                    skips[start] = end
+            if last[2] is not None:
+                bases |= last[2]
+                continue
+            base, plural_suffix = self._split_plural_suffix(name)
+            if plural_suffix:
+                bases.add(prefix + base)
+        return bases
+
+    def _iter_leaves(
+        self,
+        content: str,
+        redirects: dict[int, tuple[int, int]],
+        skips: dict[int, int],
+    ) -> Iterator[tuple[str, str]]:
+        """Yield ``(key, value)`` per leaf of the validated ``content``, in flattened order.
+
+        Nested objects are tracked on an explicit stack; any other value is
+        decoded in place and converted to ``str``. Duplicates are resolved
+        with the positions found by _scan_layout().
+        """
+        # Per open object: the parent's prefix, and where to resume in the
+        # parent when the object was read out of place for a duplicate
+        stack: list[tuple[str, int | None]] = []
+        prefix = ""
+        resume = None
+
+        idx = WHITESPACE.match(content, WHITESPACE.match(content, 0).end() + 1).end()
+        if content.startswith("}", idx):
+            return
+
+        while True:
+            name, idx = scanstring(content, idx + 1)
+            idx = WHITESPACE.match(content, idx).end()
+            idx = WHITESPACE.match(content, idx + 1).end()
+
+            if idx in skips:
+                idx = skips[idx]
+            else:
+                end = None
+                if idx in redirects:
+                    idx, end = redirects[idx]
+                if content.startswith("{", idx):
+                    after = WHITESPACE.match(content, idx + 1).end()
+                    if not content.startswith("}", after):
+                        stack.append((prefix, resume))
+                        prefix = f"{prefix}{name}."
+                        resume = end
+                        idx = after
+                        continue
+                    idx = after + 1
+                else:
+                    value, idx = _decoder.raw_decode(content, idx)
+                    yield prefix + name, value if isinstance(value, str) else str(value)
+                if end is not None:
+                    idx = end
+
+            idx = WHITESPACE.match(content, idx).end()
+            while content.startswith("}", idx):
+                if not stack:
+                    return
+                idx = idx + 1 if resume is None else resume
+                prefix, resume = stack.pop()
+                idx = WHITESPACE.match(content, idx).end()
+
+            idx = WHITESPACE.match(content, idx + 1).end()
+
+    def _check_end(self, content: str, idx: int) -> None:
+        idx = WHITESPACE.match(content, idx).end()
+        if idx != len(content):
+            raise json.JSONDecodeError("Extra data", content, idx)
+
+    def _split_plural_suffix(self, name: str) -> tuple[str, str | None]:
+        base, separator, tail = name.rpartition("_")
+        if separator and tail in PLURAL_FORM_NAMES:
+            return base, tail
+        return name, None
@@ -1,56 +1,383 @@
-# Simplified CLDR plural categories per language
-# Each language maps to a list of required plural form names
-PLURAL_RULES: dict[str, list[str]] = {
-    # One/Other languages (most European)
-    "en": ["one", "other"],
-    "de": ["one", "other"],
-    "es": ["one", "many", "other"],
-    "fr": ["one", "many", "other"],
-    "it": ["one", "many", "other"],
-    "pt": ["one", "many", "other"],
-    "pt-BR": ["one", "many", "other"],
-    "nl": ["one", "other"],
-    "sv": ["one", "other"],
-    "da": ["one", "other"],
-    "no": ["one", "other"],
-    "fi": ["one", "other"],
-    # Zero/One/Other
-    "lv": ["zero", "one", "other"],
-    # One/Few/Many/Other (Slavic)
-    "pl": ["one", "few", "many", "other"],
-    "ru": ["one", "few", "many", "other"],
-    "uk": ["one", "few", "many", "other"],
-    "cs": ["one", "few", "many", "other"],
-    "sk": ["one", "few", "many", "other"],
-    "hr": ["one", "few", "other"],
-    # Arabic
-    "ar": ["zero", "one", "two", "few", "many", "other"],
-    # East Asian (no plural forms, just "other")
-    "zh": ["other"],
-    "ja": ["other"],
-    "ko": ["other"],
-    "vi": ["other"],
-    "th": ["other"],
-    "id": ["other"],
-    "ms": ["other"],
-    # Turkish
-    "tr": ["one", "other"],
-    # Hebrew
-    "he": ["one", "two", "other"],
+"""CLDR cardinal plural rules.
+
+Rules are written in the CLDR plural rule syntax (https://unicode.org/reports/tr35/tr35-numbers.html#Language_Plural_Rules)
+and compiled into Python callables the first time a locale is used. Each
+compiled rule also keeps a lookup table for small integers, so the common
+case of categorising a count is a single index.
+"""
+import functools
+import re
+from collections.abc import Mapping
+from decimal import Decimal, InvalidOperation
+
+# Plural categories in CLDR order; gettext msgstr[n] indexes follow this order
+CATEGORIES = ("zero", "one", "two", "few", "many", "other")
+
+# Integers below this are categorised through a precomputed table
+INTEGER_TABLE_SIZE = 1000
+
+# Shared rule for the French-style "many" category used by large round numbers
+_MANY_MILLIONS = "e = 0 and i != 0 and i % 1000000 = 0 and v = 0 or e != 0..5"
+
+# CLDR cardinal rules, grouped by locales sharing them. Only non-"other"
+# categories are listed; "other" matches everything else.
+_RULE_GROUPS: list[tuple[str, dict[str, str]]] = [
+    ("bm bo dz id ig ii in ja jbo jv jw kde kea km ko lkt lo ms my nqo osa sah ses sg su th to tpi "
+     "vi wo yo yue zh", {}),
+    ("am as bn doi fa gu hi kn pcm zu", {"one": "i = 0 or n = 1"}),
+    ("ff hy kab", {"one": "i = 0,1"}),
+    ("ast de en et fi fy gl ia io ji lij nl sc sv sw ur yi", {"one": "i = 1 and v = 0"}),
+    ("si", {"one": "n = 0,1 or i = 0 and f = 1"}),
+    ("ak bho guw ln mg nso pa ti wa", {"one": "n = 0..1"}),
+    ("tzm", {"one": "n = 0..1 or n = 11..99"}),
+    ("af an asa az bal bem bez bg brx ce cgg chr ckb dv ee el eo eu fo fur gsw ha haw hu jgo jmc ka "
+     "kaj kcg kk kkj kl ks ksb ku ky lb lg mas mgo ml mn mr nah nb nd ne nn nnh no nr ny nyn om or os "
+     "pap ps rm rof rwk saq sd sdh seh sn so sq ss ssy st syr ta te teo tig tk tn tr ts ug uz ve vo vun "
+     "wae xh xog", {"one": "n = 1"}),
+    ("da", {"one": "n = 1 or t != 0 and i = 0,1"}),
+    ("is", {"one": "t = 0 and i % 10 = 1 and i % 100 != 11 or t % 10 = 1 and t % 100 != 11"}),
+    ("mk", {"one": "v = 0 and i % 10 = 1 and i % 100 != 11 or f % 10 = 1 and f % 100 != 11"}),
+    ("ceb fil tl", {"one": "v = 0 and i = 1,2,3 or v = 0 and i % 10 != 4,6,9 or v != 0 and f % 10 != 4,6,9"}),
+    ("lv prg", {
+        "zero": "n % 10 = 0 or n % 100 = 11..19 or v = 2 and f % 100 = 11..19",
+        "one": "n % 10 = 1 and n % 100 != 11 or v = 2 and f % 10 = 1 and f % 100 != 11 or v != 2 and f % 10 = 1",
+    }),
+    ("lag", {"zero": "n = 0", "one": "i = 0,1 and n != 0"}),
+    ("ksh", {"zero": "n = 0", "one": "n = 1"}),
+    ("he iw", {"one": "i = 1 and v = 0 or i = 0 and v != 0", "two": "i = 2 and v = 0"}),
+    ("iu naq sat se sma smi smj smn sms", {"one": "n = 1", "two": "n = 2"}),
+    ("shi", {"one": "i = 0 or n = 1", "few": "n = 2..10"}),
+    ("mo ro", {"one": "i = 1 and v = 0", "few": "v != 0 or n = 0 or n != 1 and n % 100 = 1..19"}),
+    ("bs hr sh sr", {
+        "one": "v = 0 and i % 10 = 1 and i % 100 != 11 or f % 10 = 1 and f % 100 != 11",
+        "few": "v = 0 and i % 10 = 2..4 and i % 100 != 12..14 or f % 10 = 2..4 and f % 100 != 12..14",
+    }),
+    ("fr", {"one": "i = 0,1", "many": _MANY_MILLIONS}),
+    ("es", {"one": "n = 1", "many": _MANY_MILLIONS}),
+    ("ca it pt-PT vec", {"one": "i = 1 and v = 0", "many": _MANY_MILLIONS}),
+    ("pt", {"one": "i = 0..1", "many": _MANY_MILLIONS}),
+    ("gd", {"one": "n = 1,11", "two": "n = 2,12", "few": "n = 3..10,13..19"}),
+    ("sl", {"one": "v = 0 and i % 100 = 1", "two": "v = 0 and i % 100 = 2", "few": "v = 0 and i % 100 = 3..4 or v != 0"}),
+    ("dsb hsb", {
+        "one": "v = 0 and i % 100 = 1 or f % 100 = 1",
+        "two": "v = 0 and i % 100 = 2 or f % 100 = 2",
+        "few": "v = 0 and i % 100 = 3..4 or f % 100 = 3..4",
+    }),
+    ("cs sk", {"one": "i = 1 and v = 0", "few": "i = 2..4 and v = 0", "many": "v != 0"}),
+    ("pl", {
+        "one": "i = 1 and v = 0",
+        "few": "v = 0 and i % 10 = 2..4 and i % 100 != 12..14",
+        "many": "v = 0 and i != 1 and i % 10 = 0..1 or v = 0 and i % 10 = 5..9 or v = 0 and i % 100 = 12..14",
+    }),
+    ("be", {
+        "one": "n % 10 = 1 and n % 100 != 11",
+        "few": "n % 10 = 2..4 and n % 100 != 12..14",
+        "many": "n % 10 = 0 or n % 10 = 5..9 or n % 100 = 11..14",
+    }),
+    ("lt", {
+        "one": "n % 10 = 1 and n % 100 != 11..19",
+        "few": "n % 10 = 2..9 and n % 100 != 11..19",
+        "many": "f != 0",
+    }),
+    ("ru uk", {
+        "one": "v = 0 and i % 10 = 1 and i % 100 != 11",
+        "few": "v = 0 and i % 10 = 2..4 and i % 100 != 12..14",
+        "many": "v = 0 and i % 10 = 0 or v = 0 and i % 10 = 5..9 or v = 0 and i % 100 = 11..14",
+    }),
+    ("br", {
+        "one": "n % 10 = 1 and n % 100 != 11,71,91",
+        "two": "n % 10 = 2 and n % 100 != 12,72,92",
+        "few": "n % 10 = 3..4,9 and n % 100 != 10..19,70..79,90..99",
+        "many": "n != 0 and n % 1000000 = 0",
+    }),
+    ("mt", {"one": "n = 1", "two": "n = 2", "few": "n = 0 or n % 100 = 3..10", "many": "n % 100 = 11..19"}),
+    ("ga", {"one": "n = 1", "two": "n = 2", "few": "n = 3..6", "many": "n = 7..10"}),
+    ("gv", {
+        "one": "v = 0 and i % 10 = 1",
+        "two": "v = 0 and i % 10 = 2",
+        "few": "v = 0 and i % 100 = 0,20,40,60,80",
+        "many": "v != 0",
+    }),
+    ("kw", {
+        "zero": "n = 0",
+        "one": "n = 1",
+        "two": "n % 100 = 2,22,42,62,82 or n % 1000 = 0 and n % 100000 = 1000..20000,40000,60000,80000 "
+               "or n != 0 and n % 1000000 = 100000",
+        "few": "n % 100 = 3,23,43,63,83",
+        "many": "n != 1 and n % 100 = 1,21,41,61,81",
+    }),
+    ("ar ars", {"zero": "n = 0", "one": "n = 1", "two": "n = 2", "few": "n % 100 = 3..10", "many": "n % 100 = 11..99"}),
+    ("cy", {"zero": "n = 0", "one": "n = 1", "two": "n = 2", "few": "n = 3", "many": "n = 6"}),
+]
+
+CLDR_PLURAL_RULES: dict[str, Mapping[str, str]] = {
+    locale: rules for locales, rules in _RULE_GROUPS for locale in locales.split()
 }
 
-DEFAULT_PLURAL_FORMS = ["one", "other"]
+# Rules used for locales CLDR does not cover
+DEFAULT_LOCALE = "en"
+
+# Operands in the order the compiled callables take them
+OPERANDS = ("n", "i", "v", "w", "f", "t", "c", "e")
+
+_TOKEN = re.compile(r"\s*(?:(\d+)\.\.(\d+)|(\d+)|([niwvftce])\b|(and|or)\b|(!=|=|%|,))")
+
+# Fraction digit candidates tried when looking for decimal sample numbers
+_DECIMAL_CANDIDATES = [
+    f"{whole}.{fraction}"
+    for fraction in ("0", "1", "5", "00", "01", "02", "03", "11", "12", "20", "21")
+    for whole in range(0, 22)
+]
+
+
+class PluralRuleSyntaxError(ValueError):
+    """Raised when a CLDR plural rule expression cannot be parsed."""
+
+
+class PluralRule:
+    """The compiled plural rule of one locale.
+
+    Conditions are compiled to Python callables over the CLDR operands, and
+    the category of every integer below INTEGER_TABLE_SIZE is precomputed.
+    """
+
+    def __init__(self, locale: str, rules: Mapping[str, str]):
+        self.locale = locale
+        self.categories: tuple[str, ...] = tuple(c for c in CATEGORIES if c in rules or c == "other")
+        parsed = [(self.categories.index(c), _parse_condition(rules[c])) for c in self.categories[:-1]]
+        self._conditions = [(index, _compile_python(condition)) for index, condition in parsed]
+        self._gettext = _gettext_expression(parsed, len(self.categories) - 1)
+        self._integer_table = bytes(
+            self._evaluate((number, number, 0, 0, 0, 0, 0, 0)) for number in range(INTEGER_TABLE_SIZE)
+        )
+
+    def category(self, number: int | float | Decimal | str) -> str:
+        """Return the plural category of ``number``.
+
+        Strings keep their visible fraction digits, so ``"1.0"`` and ``1``
+        may fall in different categories, as CLDR specifies.
+        """
+        if type(number) is int and -INTEGER_TABLE_SIZE < number < INTEGER_TABLE_SIZE:
+            return self.categories[self._integer_table[abs(number)]]
+        return self.categories[self._evaluate(plural_operands(number))]
+
+    def index(self, number: int | float | Decimal | str) -> int:
+        """Return the position of the category of ``number`` in ``categories``."""
+        return self.categories.index(self.category(number))
+
+    @functools.cached_property
+    def samples(self) -> dict[str, list[str]]:
+        """Up to six sample numbers per category, integers first."""
+        samples: dict[str, list[str]] = {category: [] for category in self.categories}
+        for number, index in enumerate(self._integer_table):
+            bucket = samples[self.categories[index]]
+            if len(bucket) < 6:
+                bucket.append(str(number))
+        # Categories such as "many" in French only start with large integers
+        for exponent in range(3, 13):
+            for digit in (1, 2):
+                number = digit * 10 ** exponent
+                bucket = samples[self.category(number)]
+                if len(bucket) < 3:
+                    bucket.append(str(number))
+        for number in _DECIMAL_CANDIDATES:
+            bucket = samples[self.category(number)]
+            if len(bucket) < 6:
+                bucket.append(number)
+        return samples
+
+    @property
+    def gettext_plural_forms(self) -> str:
+        """The rule as a gettext ``Plural-Forms`` header value for integer counts."""
+        return f"nplurals={len(self.categories)}; plural={self._gettext};"
+
+    def _evaluate(self, operands: tuple) -> int:
+        for index, condition in self._conditions:
+            if condition(*operands):
+                return index
+        return len(self.categories) - 1
+
+
+def plural_operands(number: int | float | Decimal | str) -> tuple:
+    """Compute the CLDR operands (n, i, v, w, f, t, c, e) of ``number``."""
+    if type(number) is int:
+        number = abs(number)
+        return (number, number, 0, 0, 0, 0, 0, 0)
+
+    try:
+        text = format(Decimal(str(number)), "f").lstrip("-")
+    except InvalidOperation:
+        raise ValueError(f"Not a number: {number!r}")
+    integer_digits, _, fraction_digits = text.partition(".")
+    trimmed = fraction_digits.rstrip("0")
+    i = int(integer_digits)
+    f = int(fraction_digits or 0)
+    n = i if f == 0 else Decimal(text)
+    return (n, i, len(fraction_digits), len(trimmed), f, int(trimmed or 0), 0, 0)
+
+
+@functools.cache
+def get_plural_rule(language_code: str) -> PluralRule:
+    """Get the compiled plural rule for a language code.
+
+    Tries exact match first (case-insensitive, ``_`` or ``-`` separated),
+    then the base language (e.g., pt-BR -> pt). Falls back to the English
+    rule if the language is not covered by CLDR.
+    """
+    normalized = language_code.replace("_", "-")
+    for candidate in (normalized, normalized.split("-")[0]):
+        locale = _LOCALES_BY_LOWER.get(candidate.lower())
+        if locale is not None:
+            return _compile_locale(locale)
+    return _compile_locale(DEFAULT_LOCALE)
+
+
+@functools.cache
+def _compile_locale(locale: str) -> PluralRule:
+    # Cached separately so every code mapping to a locale shares one instance
+    return PluralRule(locale, CLDR_PLURAL_RULES[locale])
 
 
 def get_plural_forms(language_code: str) -> list[str]:
-    """Get required plural forms for a given language code.
+    """Get required plural forms for a given language code, in CLDR order.
 
-    Tries exact match first, then base language (e.g., pt-BR -> pt).
-    Falls back to DEFAULT_PLURAL_FORMS if not found.
+    Returns a new list on each call; the rule itself is cached by get_plural_rule().
     """
-    if language_code in PLURAL_RULES:
-        return PLURAL_RULES[language_code]
-    base = language_code.split("-")[0].split("_")[0]
-    if base in PLURAL_RULES:
-        return PLURAL_RULES[base]
-    return DEFAULT_PLURAL_FORMS
+    return list(get_plural_rule(language_code).categories)
+
+
+def get_plural_category(language_code: str, number: int | float | Decimal | str) -> str:
+    """Get the plural category a number falls in for a given language code."""
+    return get_plural_rule(language_code).category(number)
+
+
+_LOCALES_BY_LOWER = {locale.lower(): locale for locale in CLDR_PLURAL_RULES}
+
+
+# A relation is (operand, modulus or None, negated, ranges as (low, high) pairs);
+# a condition is a list of "or" alternatives, each a list of "and" relations.
+_Relation = tuple[str, int | None, bool, list[tuple[int, int]]]
+
+
+def _parse_condition(rule: str) -> list[list[_Relation]]:
+    tokens = []
+    pos = 0
+    rule = rule.strip()
+    while pos < len(rule):
+        match = _TOKEN.match(rule, pos)
+        if not match:
+            raise PluralRuleSyntaxError(f"Unexpected input at {pos} in plural rule: {rule!r}")
+        low, high, value, operand, keyword, symbol = match.groups()
+        if low is not None:
+            tokens.append(("range", (int(low), int(high))))
+        elif value is not None:
+            tokens.append(("range", (int(value), int(value))))
+        else:
+            tokens.append(("word", operand or keyword or symbol))
+        pos = match.end()
+
+    condition: list[list[_Relation]] = [[]]
+    pos = 0
+
+    def expect_word(*words: str) -> str:
+        nonlocal pos
+        if pos >= len(tokens) or tokens[pos][0] != "word" or tokens[pos][1] not in words:
+            raise PluralRuleSyntaxError(f"Expected {' or '.join(words)} in plural rule: {rule!r}")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    def expect_range() -> tuple[int, int]:
+        nonlocal pos
+        if pos >= len(tokens) or tokens[pos][0] != "range":
+            raise PluralRuleSyntaxError(f"Expected a number in plural rule: {rule!r}")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    while True:
+        operand = expect_word(*OPERANDS)
+        modulus = None
+        if pos < len(tokens) and tokens[pos] == ("word", "%"):
+            pos += 1
+            modulus = expect_range()[0]
+        negated = expect_word("=", "!=") == "!="
+        ranges = [expect_range()]
+        while pos < len(tokens) and tokens[pos] == ("word", ","):
+            pos += 1
+            ranges.append(expect_range())
+        condition[-1].append((operand, modulus, negated, ranges))
+
+        if pos == len(tokens):
+            return condition
+        if expect_word("and", "or") == "or":
+            condition.append([])
+
+
+def _compile_python(condition: list[list[_Relation]]):
+    alternatives = []
+    for relations in condition:
+        parts = []
+        for operand, modulus, negated, ranges in relations:
+            value = f"({operand} % {modulus})" if modulus else operand
+            checks = []
+            for low, high in ranges:
+                if low == high:
+                    checks.append(f"{value} == {low}")
+                elif operand == "n":
+                    # n may be a non-integral Decimal, which no integer range contains
+                    checks.append(f"(type({value}) is int and {low} <= {value} <= {high})")
+                else:
+                    checks.append(f"{low} <= {value} <= {high}")
+            test = " or ".join(checks)
+            parts.append(f"not ({test})" if negated else f"({test})")
+        alternatives.append(" and ".join(parts))
+    source = f"lambda {', '.join(OPERANDS)}: " + " or ".join(f"({a})" for a in alternatives)
+    return eval(compile(source, "<plural rule>", "eval"), {"__builtins__": {"type": type, "int": int}})
+
+
+def _gettext_expression(conditions: list[tuple[int, list[list[_Relation]]]], other_index: int) -> str:
+    """Translate conditions into a C expression over the integer count ``n``.
+
+    For integer counts every operand but n and i is 0, so relations on them
+    are folded into constants and branches that can never match are dropped.
+    """
+    branches = []
+    for index, condition in conditions:
+        alternatives = []
+        for relations in condition:
+            parts = []
+            for operand, modulus, negated, ranges in relations:
+                if operand not in ("n", "i"):
+                    value = 0
+                    if any(low <= value <= high for low, high in ranges) != negated:
+                        continue
+                    break
+                value = f"n % {modulus}" if modulus else "n"
+                checks = [
+                    f"{value} == {low}" if low == high else f"({value} >= {low} && {value} <= {high})"
+                    for low, high in ranges
+                ]
+                if len(checks) == 1 and ranges[0][0] == ranges[0][1]:
+                    test = f"{value} {'!=' if negated else '=='} {ranges[0][0]}"
+                else:
+                    test = checks[0] if len(checks) == 1 else f"({' || '.join(checks)})"
+                    if negated:
+                        test = "!" + test
+                parts.append(test)
+            else:
+                if not parts:
+                    # Always true for integers
+                    alternatives = None
+                    break
+                alternatives.append(" && ".join(parts))
+        if alternatives is None:
+            branches.append((index, None))
+            break
+        if alternatives:
+            if len(alternatives) > 1:
+                alternatives = [f"({a})" if " && " in a else a for a in alternatives]
+            branches.append((index, " || ".join(alternatives)))
+
+    expression = str(other_index)
+    for index, test in reversed(branches):
+        expression = str(index) if test is None else f"({test}) ? {index} : {expression}"
+    return expression
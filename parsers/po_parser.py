@@ -1,97 +1,338 @@
+import codecs
+import re
+from collections.abc import Iterator
+
 import polib
-from parsers.base import BaseParser, ParsedEntry
+from parsers.base import EMPTY_FLAGS, BaseParser, ParsedEntry, RawContent
 from parsers.exceptions import ParseError
+from parsers.plural_rules import get_plural_rule
+
+BOM = codecs.BOM_UTF8.decode("utf-8")
+UNESCAPED_QUOTE = re.compile(r'([^\\]|^)"')
+
+KEYWORDS = {
+    "msgctxt": "ct",
+    "msgid": "mi",
+    "msgstr": "ms",
+    "msgid_plural": "mp",
+}
+PREV_KEYWORDS = {
+    "msgid_plural": "pp",
+    "msgid": "pm",
+    "msgctxt": "pc",
+}
+
+# Parser states from which each symbol may follow, mirroring polib's state
+# machine so both parsers accept and reject exactly the same inputs.
+_ANY_STATE = frozenset({
+    "st", "he", "gc", "oc", "fl", "ct", "pc", "pm", "pp", "tc", "ms", "mp", "mx", "mi",
+})
+TRANSITIONS = {
+    "tc": _ANY_STATE - {"ct"},
+    "gc": _ANY_STATE,
+    "oc": _ANY_STATE,
+    "fl": _ANY_STATE,
+    "pc": _ANY_STATE,
+    "pm": _ANY_STATE,
+    "pp": _ANY_STATE,
+    "ct": frozenset({"st", "he", "gc", "oc", "fl", "tc", "pc", "pm", "pp", "ms", "mx"}),
+    "mi": frozenset({"st", "he", "gc", "oc", "fl", "ct", "tc", "pc", "pm", "pp", "ms", "mx"}),
+    "mp": frozenset({"tc", "gc", "pc", "pm", "pp", "mi"}),
+    "ms": frozenset({"mi", "mp", "tc"}),
+    "mx": frozenset({"mi", "mx", "mp", "tc"}),
+    "mc": frozenset({"ct", "mi", "mp", "ms", "mx", "pm", "pp", "pc"}),
+}
+# Symbols that start a new entry when they follow a msgstr
+ENTRY_STARTS = frozenset({"gc", "oc", "fl", "tc", "ct", "mi", "pc", "pm", "pp"})
+
+
+class _FallbackToPolib(Exception):
+    """Raised by the fast path when the input needs polib's full parser."""
+
+
+class _RawEntry:
+    """The subset of a PO entry that ParsedEntry is built from."""
+
+    __slots__ = ("msgctxt", "msgid", "msgid_plural", "msgstr_plural", "flags", "comment", "obsolete")
+
+    def __init__(self):
+        self.msgctxt = None
+        self.msgid = ""
+        self.msgid_plural = ""
+        self.msgstr_plural = {}
+        self.flags = []
+        self.comment = ""
+        self.obsolete = 0
+
+
+def _unescape(s: str) -> str:
+    return polib.unescape(s) if "\\" in s else s
 
 
 class POParser(BaseParser):
-    def parse(self, content: str) -> list[ParsedEntry]:
+    def parse(self, content: RawContent) -> list[ParsedEntry]:
+        content = self._decode(content)
         try:
-            po = polib.pofile(content)
-        except Exception as e:
-            raise ParseError(f"Invalid PO file: {e}")
+            raw_entries = self._tokenize(content)
+        except _FallbackToPolib:
+            raw_entries = self._polib_entries(content)
 
         entries = []
-        for order, entry in enumerate(po):
+        for order, entry in enumerate(raw_entries):
             if entry.obsolete:
                 continue
+            entries.append(self._build_entry(entry, order))
+        return entries
+
+    def _polib_entries(self, content: str) -> list[polib.POEntry]:
+        try:
+            return list(polib.pofile(content))
+        except Exception as e:
+            raise ParseError(f"Invalid PO file: {e}")
+
+    def _tokenize(self, content: str) -> list[_RawEntry]:
+        """Read the entries of a PO catalog without building polib objects.
+
+        This follows polib's line-based state machine but only keeps msgctxt,
+        msgid, msgid_plural, msgstr[n], flags and extracted comments; msgstr,
+        occurrences, translator comments and previous-msgid lines are
+        validated and skipped. Anything outside the common grammar raises
+        _FallbackToPolib so polib can parse it or report the error. The
+        header entry is removed, as polib does.
+        """
+        entries: list[_RawEntry] = []
+        current = _RawEntry()
+        state = "st"
+        msgstr_index = 0
+        tokens: list[str] = []
+
+        for lineno, line in enumerate(content.splitlines()):
+            if lineno == 0 and line.startswith(BOM):
+                line = line[len(BOM):]
+            line = line.strip()
+            if not line:
+                continue
+
+            tokens = line.split(None, 2)
+            nb_tokens = len(tokens)
+            if tokens[0] == "#~|":
+                continue
+            if tokens[0] == "#~" and nb_tokens > 1:
+                line = line[3:].strip()
+                tokens = tokens[1:]
+                nb_tokens -= 1
+                obsolete = 1
+            else:
+                obsolete = 0
 
-            flags = list(entry.flags)
-            context_parts = []
-            if entry.msgctxt:
-                context_parts.append(entry.msgctxt)
-            if entry.comment:
-                context_parts.append(entry.comment)
-
-            key = entry.msgctxt + "\x04" + entry.msgid if entry.msgctxt else entry.msgid
-
-            if entry.msgid_plural:
-                plural_forms = {}
-                plural_forms["one"] = entry.msgid
-                plural_forms["other"] = entry.msgid_plural
-                # Include translated plural forms if available
-                for idx, text in sorted(entry.msgstr_plural.items()):
-                    if text:
-                        plural_forms[f"form{idx}"] = text
-
-                entries.append(ParsedEntry(
-                    key=key,
-                    source_text=entry.msgid,
-                    context="\n".join(context_parts),
-                    has_plurals=True,
-                    plural_forms=plural_forms,
-                    order=order,
-                    flags=flags,
-                ))
+            keyword = tokens[0]
+            if keyword in KEYWORDS and nb_tokens > 1:
+                symbol = KEYWORDS[keyword]
+                line = line[len(keyword):].lstrip()
+                if '"' in line[1:-1] and UNESCAPED_QUOTE.search(line[1:-1]):
+                    raise _FallbackToPolib
+            elif keyword == "#:":
+                if nb_tokens <= 1:
+                    continue
+                symbol = "oc"
+            elif line[:1] == '"':
+                if '"' in line[1:-1] and UNESCAPED_QUOTE.search(line[1:-1]):
+                    raise _FallbackToPolib
+                symbol = "mc"
+            elif line[:7] == "msgstr[":
+                symbol = "mx"
+            elif keyword == "#,":
+                if nb_tokens <= 1:
+                    continue
+                symbol = "fl"
+            elif keyword == "#" or keyword.startswith("##"):
+                symbol = "tc"
+            elif keyword == "#.":
+                if nb_tokens <= 1:
+                    continue
+                symbol = "gc"
+            elif keyword == "#|" and nb_tokens > 1 and tokens[1].startswith('"'):
+                # Continuation of a previous msgid, extended like any other field
+                line = line[2:].lstrip()
+                symbol = "mc"
+            elif keyword == "#|" and nb_tokens > 2 and tokens[1] in PREV_KEYWORDS:
+                symbol = PREV_KEYWORDS[tokens[1]]
             else:
-                entries.append(ParsedEntry(
-                    key=key,
-                    source_text=entry.msgid,
-                    context="\n".join(context_parts),
-                    order=order,
-                    flags=flags,
-                ))
+                raise _FallbackToPolib
+
+            if state not in TRANSITIONS[symbol]:
+                raise _FallbackToPolib
+
+            if symbol in ENTRY_STARTS and state in ("ms", "mx"):
+                entries.append(current)
+                current = _RawEntry()
+
+            if symbol == "mc":
+                token = _unescape(line[1:-1])
+                if state == "ct":
+                    current.msgctxt += token
+                elif state == "mi":
+                    current.msgid += token
+                elif state == "mp":
+                    current.msgid_plural += token
+                elif state == "mx":
+                    current.msgstr_plural[msgstr_index] += token
+                # A continuation never changes the state
+                continue
+
+            if symbol == "ct":
+                current.msgctxt = _unescape(line[1:-1])
+            elif symbol == "mi":
+                current.obsolete = obsolete
+                current.msgid = _unescape(line[1:-1])
+            elif symbol == "mp":
+                current.msgid_plural = _unescape(line[1:-1])
+            elif symbol == "mx":
+                if not line[7:8].isdigit():
+                    raise _FallbackToPolib
+                msgstr_index = int(line[7])
+                current.msgstr_plural[msgstr_index] = _unescape(line[line.find('"') + 1:-1])
+            elif symbol == "fl":
+                current.flags += [flag.strip() for flag in line[3:].split(",")]
+            elif symbol == "gc":
+                if current.comment:
+                    current.comment += "\n"
+                current.comment += line[3:]
+            elif symbol == "tc" and state in ("st", "he"):
+                symbol = "he"
+            state = symbol
+
+        # The last entry is only kept when the file does not end in a comment
+        if tokens and not tokens[0].startswith("#"):
+            entries.append(current)
 
+        headers = [i for i, entry in enumerate(entries) if entry.msgid == ""]
+        if len(headers) > 1 or any(entries[i].obsolete for i in headers):
+            # polib's header lookup has tie-breaking rules worth not copying
+            raise _FallbackToPolib
+        if headers:
+            del entries[headers[0]]
         return entries
 
-    def export(self, entries: list[ParsedEntry], translations: dict[str, str] | None = None) -> str:
+    def _build_entry(self, entry: _RawEntry | polib.POEntry, order: int) -> ParsedEntry:
+        flags = list(entry.flags) if entry.flags else EMPTY_FLAGS
+        context_parts = []
+        if entry.msgctxt:
+            context_parts.append(entry.msgctxt)
+        if entry.comment:
+            context_parts.append(entry.comment)
+
+        key = entry.msgctxt + "\x04" + entry.msgid if entry.msgctxt else entry.msgid
+
+        if entry.msgid_plural:
+            plural_forms = {}
+            plural_forms["one"] = entry.msgid
+            plural_forms["other"] = entry.msgid_plural
+            # Include translated plural forms if available
+            for idx, text in sorted(entry.msgstr_plural.items()):
+                if text:
+                    plural_forms[f"form{idx}"] = text
+
+            return ParsedEntry(
+                key=key,
+                source_text=entry.msgid,
+                context="\n".join(context_parts),
+                has_plurals=True,
+                plural_forms=plural_forms,
+                order=order,
+                flags=flags,
+            )
+        return ParsedEntry(
+            key=key,
+            source_text=entry.msgid,
+            context="\n".join(context_parts),
+            order=order,
+            flags=flags,
+        )
+
+    def export(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> str:
+        return "".join(self.export_iter(entries, translations, language))
+
+    def export_iter(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> Iterator[str]:
+        """Stream the catalog one entry at a time, formatted exactly like polib."""
+        return self._chunked(self._iter_entries(entries, translations, language))
+
+    def _iter_entries(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None,
+        language: str | None,
+    ) -> Iterator[str]:
         po = polib.POFile()
         po.metadata = {
             "Content-Type": "text/plain; charset=utf-8",
             "Content-Transfer-Encoding": "8bit",
         }
+        categories = None
+        if language:
+            rule = get_plural_rule(language)
+            categories = rule.categories
+            po.metadata["Language"] = language
+            po.metadata["Plural-Forms"] = rule.gettext_plural_forms
+        # polib writes an empty header as a lone "#" line before the metadata
+        yield "#\n" + str(po.metadata_as_entry())
 
-        for entry in sorted(entries, key=lambda e: e.order):
-            # Parse key to extract msgctxt
-            if "\x04" in entry.key:
-                msgctxt, msgid = entry.key.split("\x04", 1)
-            else:
-                msgctxt = None
-                msgid = entry.key if not entry.source_text else entry.source_text
+        for entry in self._ordered(entries):
+            yield "\n" + str(self._build_po_entry(entry, translations, categories))
 
-            translated = translations.get(entry.key, "") if translations else ""
+    def _build_po_entry(
+        self,
+        entry: ParsedEntry,
+        translations: dict[str, str] | None,
+        categories: tuple[str, ...] | None = None,
+    ) -> polib.POEntry:
+        # Parse key to extract msgctxt
+        if "\x04" in entry.key:
+            msgctxt, msgid = entry.key.split("\x04", 1)
+        else:
+            msgctxt = None
+            msgid = entry.key if not entry.source_text else entry.source_text
 
-            po_entry = polib.POEntry(
-                msgid=entry.source_text,
-                msgstr=translated if not entry.has_plurals else "",
-                msgctxt=msgctxt,
-            )
+        translated = translations.get(entry.key, "") if translations else ""
 
-            if entry.has_plurals:
-                po_entry.msgid_plural = entry.plural_forms.get("other", "")
-                if translations:
-                    # Expect translations to contain plural forms
-                    po_entry.msgstr_plural = {
-                        0: translations.get(entry.key, ""),
-                    }
-                else:
-                    po_entry.msgstr_plural = {0: "", 1: ""}
+        po_entry = polib.POEntry(
+            msgid=entry.source_text,
+            msgstr=translated if not entry.has_plurals else "",
+            msgctxt=msgctxt,
+        )
 
-            if entry.context:
-                po_entry.comment = entry.context.split("\n")[-1] if "\n" in entry.context else (entry.context if not msgctxt else "")
+        if entry.has_plurals:
+            po_entry.msgid_plural = entry.plural_forms.get("other", "")
+            if categories:
+                # One msgstr per category, indexed like the Plural-Forms expression
+                po_entry.msgstr_plural = {
+                    index: translations.get(f"{entry.key}_{category}", "") if translations else ""
+                    for index, category in enumerate(categories)
+                }
+                if translations and not po_entry.msgstr_plural[0]:
+                    po_entry.msgstr_plural[0] = translated
+            elif translations:
+                # Expect translations to contain plural forms
+                po_entry.msgstr_plural = {
+                    0: translations.get(entry.key, ""),
+                }
+            else:
+                po_entry.msgstr_plural = {0: "", 1: ""}
 
-            if entry.flags:
-                po_entry.flags = entry.flags
+        if entry.context:
+            po_entry.comment = entry.context.split("\n")[-1] if "\n" in entry.context else (entry.context if not msgctxt else "")
 
-            po.append(po_entry)
+        if entry.flags:
+            po_entry.flags = list(entry.flags)
 
-        return str(po)
+        return po_entry
@@ -1,87 +1,172 @@
 import re
-from parsers.base import BaseParser, ParsedEntry
+from collections.abc import Iterator
+from parsers.base import BaseParser, ParsedEntry, RawContent
 from parsers.exceptions import ParseError
 
-# Regex patterns for .strings format
-COMMENT_PATTERN = re.compile(r'/\*\s*(.*?)\s*\*/', re.DOTALL)
-ENTRY_PATTERN = re.compile(
-    r'"((?:[^"\\]|\\.)*)"\s*=\s*"((?:[^"\\]|\\.)*)"\s*;'
-)
+# Token patterns for .strings format, always matched at the scanner position
+WHITESPACE = re.compile(r"\s*")
+STRING_CHUNK = re.compile(r'[^"\\]*')
+BARE_WORD = re.compile(r"[\w.$:/-]+")
+HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+
+UNESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    '"': '"',
+    "'": "'",
+    "\\": "\\",
+}
+
+ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\t": "\\t",
+    "\r": "\\r",
+})
 
 
 class StringsParser(BaseParser):
-    def parse(self, content: str) -> list[ParsedEntry]:
-        entries = []
-        # Track comments for context
+    def parse(self, content: RawContent) -> list[ParsedEntry]:
+        return list(self.iter_parse(content))
+
+    def iter_parse(self, content: RawContent) -> Iterator[ParsedEntry]:
+        """Scan the whole buffer once, yielding an entry per ``key = value;``.
+
+        Comments, quoted strings (which may span lines) and escape sequences
+        are all handled as the scanner advances, so no character is visited
+        twice. The most recent comment becomes the context of the next entry.
+        """
+        content = self._decode(content)
         last_comment = ""
         order = 0
+        # Tokens of the entry being read: [key] or [key, "="] or [key, "=", value]
+        pending: list[str] = []
+        pos = 0
+        end = len(content)
 
-        # Process line by line to associate comments with entries
-        lines = content.split("\n")
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Multi-line comment
-            if line.startswith("/*"):
-                comment_text = line
-                while "*/" not in comment_text and i < len(lines) - 1:
-                    i += 1
-                    comment_text += "\n" + lines[i]
-                match = COMMENT_PATTERN.search(comment_text)
-                if match:
-                    last_comment = match.group(1).strip()
-                i += 1
+        while True:
+            pos = WHITESPACE.match(content, pos).end()
+            if pos >= end:
+                break
+
+            if content.startswith("/*", pos):
+                close = content.find("*/", pos + 2)
+                if close == -1:
+                    raise ParseError(f"Unterminated comment at line {self._line_at(content, pos)}")
+                last_comment = content[pos + 2:close].strip()
+                pos = close + 2
+                continue
+
+            if content.startswith("//", pos):
+                close = content.find("\n", pos)
+                close = end if close == -1 else close
+                last_comment = content[pos + 2:close].strip()
+                pos = close
+                continue
+
+            char = content[pos]
+            if char == "=" and len(pending) == 1:
+                pending.append(char)
+                pos += 1
                 continue
 
-            # Entry
-            match = ENTRY_PATTERN.search(line if line else "")
-            if match:
-                key = self._unescape(match.group(1))
-                value = self._unescape(match.group(2))
-                entries.append(ParsedEntry(
-                    key=key,
-                    source_text=value,
+            if char == ";" and len(pending) in (1, 3):
+                # A lone "key"; is shorthand for "key" = "key";
+                yield ParsedEntry(
+                    key=pending[0],
+                    source_text=pending[-1],
                     context=last_comment,
                     order=order,
-                ))
+                )
                 order += 1
                 last_comment = ""
+                pending = []
+                pos += 1
+                continue
+
+            if len(pending) in (0, 2):
+                if char == '"':
+                    token, pos = self._read_string(content, pos + 1)
+                    pending.append(token)
+                    continue
+                match = BARE_WORD.match(content, pos)
+                if match:
+                    pending.append(match.group())
+                    pos = match.end()
+                    continue
 
-            i += 1
+            # Unexpected token: drop the partial entry and resume on the next line
+            close = content.find("\n", pos)
+            pos = end if close == -1 else close
+            pending = []
 
-        return entries
+    def export(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> str:
+        return "".join(self.export_iter(entries, translations, language))
 
-    def export(self, entries: list[ParsedEntry], translations: dict[str, str] | None = None) -> str:
-        lines = []
-        for entry in sorted(entries, key=lambda e: e.order):
+    def export_iter(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> Iterator[str]:
+        return self._chunked(self._iter_lines(entries, translations))
+
+    def _iter_lines(self, entries: list[ParsedEntry], translations: dict[str, str] | None) -> Iterator[str]:
+        separator = ""
+        for entry in self._ordered(entries):
             text = translations.get(entry.key, entry.source_text) if translations else entry.source_text
             if entry.context:
-                lines.append(f"/* {entry.context} */")
+                yield f"{separator}/* {entry.context} */\n"
+                separator = ""
             escaped_key = self._escape(entry.key)
             escaped_value = self._escape(text)
-            lines.append(f'"{escaped_key}" = "{escaped_value}";')
-            lines.append("")
-        return "\n".join(lines)
-
-    def _unescape(self, s: str) -> str:
-        """Unescape Apple .strings format."""
-        s = s.replace('\\"', '"')
-        s = s.replace("\\n", "\n")
-        s = s.replace("\\t", "\t")
-        s = s.replace("\\\\", "\\")
-        # Handle \Uxxxx unicode escapes
-        s = re.sub(
-            r'\\U([0-9a-fA-F]{4})',
-            lambda m: chr(int(m.group(1), 16)),
-            s
-        )
-        return s
+            yield f'{separator}"{escaped_key}" = "{escaped_value}";\n'
+            # Entries are separated by a blank line
+            separator = "\n"
+
+    def _read_string(self, content: str, pos: int) -> tuple[str, int]:
+        """Read a quoted string starting just after its opening quote.
+
+        Returns the unescaped value and the position after the closing quote.
+        Escapes are decoded as they are reached, so runs of plain characters
+        are copied in a single slice.
+        """
+        start = pos
+        parts = []
+        while True:
+            chunk = STRING_CHUNK.match(content, pos)
+            parts.append(chunk.group())
+            pos = chunk.end()
+
+            char = content[pos:pos + 1]
+            if char == '"':
+                return "".join(parts), pos + 1
+            if not char:
+                raise ParseError(f"Unterminated string at line {self._line_at(content, start)}")
+
+            # Backslash escape
+            escaped = content[pos + 1:pos + 2]
+            if escaped in UNESCAPES:
+                parts.append(UNESCAPES[escaped])
+                pos += 2
+            elif escaped in ("U", "u") and HEX4.match(content, pos + 2):
+                # Handle \Uxxxx unicode escapes
+                parts.append(chr(int(content[pos + 2:pos + 6], 16)))
+                pos += 6
+            else:
+                parts.append("\\" + escaped)
+                pos += 2
 
     def _escape(self, s: str) -> str:
         """Escape for Apple .strings format."""
-        s = s.replace("\\", "\\\\")
-        s = s.replace('"', '\\"')
-        s = s.replace("\n", "\\n")
-        s = s.replace("\t", "\\t")
-        return s
+        return s.translate(ESCAPES)
+
+    def _line_at(self, content: str, pos: int) -> int:
+        return content.count("\n", 0, pos) + 1
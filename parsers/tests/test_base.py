@@ -0,0 +1,150 @@
+import json
+import pytest
+from parsers.base import EMPTY_FLAGS, EMPTY_PLURAL_FORMS, ParsedBatch, ParsedEntry, compute_content_hash
+from parsers.json_parser import JSONParser
+from parsers.exceptions import ParseError
+from parsers.factory import ParserFactory
+from parsers.po_parser import POParser
+
+
+@pytest.fixture
+def entries():
+    return [
+        ParsedEntry(key="greeting", source_text="Hello", order=0),
+        ParsedEntry(key="farewell", source_text="Goodbye", context="On exit", order=1, max_length=20),
+        ParsedEntry(
+            key="item",
+            source_text="{{count}} item",
+            has_plurals=True,
+            plural_forms={"one": "{{count}} item", "other": "{{count}} items"},
+            order=2,
+            flags=["fuzzy"],
+        ),
+    ]
+
+
+class TestParsedEntry:
+    def test_has_no_instance_dict(self):
+        entry = ParsedEntry(key="k", source_text="v")
+        assert not hasattr(entry, "__dict__")
+
+    def test_defaults_are_shared_sentinels(self):
+        first = ParsedEntry(key="a", source_text="A")
+        second = ParsedEntry(key="b", source_text="B")
+
+        assert first.plural_forms is EMPTY_PLURAL_FORMS
+        assert second.plural_forms is EMPTY_PLURAL_FORMS
+        assert first.flags is EMPTY_FLAGS
+        assert first.plural_forms == {}
+
+    def test_shared_plural_forms_are_read_only(self):
+        entry = ParsedEntry(key="a", source_text="A")
+        with pytest.raises(TypeError):
+            entry.plural_forms["one"] = "x"
+
+
+class TestParsedBatch:
+    def test_roundtrip_entries(self, entries):
+        batch = ParsedBatch.from_entries(entries)
+
+        assert len(batch) == 3
+        assert list(batch) == entries
+        assert batch[-1] == entries[2]
+
+    def test_sparse_columns(self, entries):
+        batch = ParsedBatch.from_entries(entries)
+
+        assert batch.keys == ["greeting", "farewell", "item"]
+        assert list(batch.plural_forms) == [2]
+        assert batch.max_lengths == {1: 20}
+        assert batch.flags == {2: ["fuzzy"]}
+
+    def test_iter_ordered(self, entries):
+        batch = ParsedBatch.from_entries(reversed(entries))
+        assert [e.key for e in batch.iter_ordered()] == ["greeting", "farewell", "item"]
+
+    def test_parse_batch(self):
+        content = json.dumps({"a": "A", "n_one": "one", "n_other": "many"})
+        batch = JSONParser().parse_batch(content)
+
+        assert isinstance(batch, ParsedBatch)
+        assert list(batch) == JSONParser().parse(content)
+
+    def test_exporters_accept_batch(self, entries):
+        batch = ParsedBatch.from_entries(entries)
+        parser = POParser()
+        assert parser.export(batch) == parser.export(entries)
+
+
+class TestExportIter:
+    @pytest.mark.parametrize("file_format", ["json", "po", "strings", "xliff"])
+    def test_chunks_join_to_export(self, file_format):
+        parser = ParserFactory.get_parser(file_format)
+        entries = [
+            ParsedEntry(key=f"section{i % 3}.key{i}", source_text=f"Text {i}", order=i)
+            for i in range(5000)
+        ]
+        translations = {"section0.key0": "Translated"}
+
+        chunks = list(parser.export_iter(entries, translations))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == parser.export(entries, translations)
+
+
+class TestParsedBatchSerialization:
+    def test_bytes_roundtrip(self, entries):
+        batch = ParsedBatch.from_entries(entries)
+        restored = ParsedBatch.from_bytes(batch.to_bytes())
+
+        assert list(restored) == entries
+
+
+class TestByteInput:
+    @pytest.mark.parametrize("file_format,content", [
+        ("json", '{"menu": {"open": "Öffnen"}}'),
+        ("po", 'msgid "Öffnen"\nmsgstr ""\n'),
+        ("strings", '"open" = "Öffnen";\n'),
+        ("xliff", (
+            '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2">'
+            '<file original="t"><body><trans-unit id="open"><source>Öffnen</source>'
+            '</trans-unit></body></file></xliff>'
+        )),
+    ])
+    def test_bytes_and_memoryview_parse_like_text(self, file_format, content):
+        parser = ParserFactory.get_parser(file_format)
+        expected = parser.parse(content)
+        encoded = content.encode("utf-8")
+
+        assert parser.parse(encoded) == expected
+        assert parser.parse(memoryview(encoded)) == expected
+        assert expected[0].source_text == "Öffnen"
+
+    @pytest.mark.parametrize("file_format", ["json", "po", "strings"])
+    def test_invalid_utf8_raises_parse_error(self, file_format):
+        with pytest.raises(ParseError, match="UTF-8"):
+            ParserFactory.get_parser(file_format).parse(b'"\xff\xfe"')
+
+
+class TestContentHash:
+    def test_hash_covers_content_fields_only(self):
+        entry = ParsedEntry(key="a", source_text="Hello", context="Greeting", order=1, max_length=10)
+        moved = ParsedEntry(key="b", source_text="Hello", context="Greeting", order=7)
+
+        assert entry.content_hash == moved.content_hash
+        assert entry.content_hash == compute_content_hash("Hello", "Greeting")
+        assert len(entry.content_hash) == 64
+
+    @pytest.mark.parametrize("changes", [
+        {"source_text": "Hello!"},
+        {"context": "Other"},
+        {"has_plurals": True},
+        {"plural_forms": {"one": "Hello", "other": "Hellos"}},
+    ])
+    def test_hash_changes_with_content(self, changes):
+        fields = {"key": "a", "source_text": "Hello", "context": "Greeting"}
+        assert ParsedEntry(**fields).content_hash != ParsedEntry(**{**fields, **changes}).content_hash
+
+    def test_batch_views_hash_like_entries(self, entries):
+        batch = ParsedBatch.from_entries(entries)
+        assert [e.content_hash for e in batch] == [e.content_hash for e in entries]
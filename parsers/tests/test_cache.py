@@ -0,0 +1,82 @@
+import hashlib
+import json
+import pytest
+from parsers.base import ParsedBatch
+from parsers.cache import ParseCache
+from parsers.exceptions import ParseError
+
+
+def _checksum(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def content():
+    return json.dumps({"greeting": "Hello", "item_one": "1 item", "item_other": "{{count}} items"})
+
+
+class TestParseCache:
+    def test_miss_then_hit(self, content):
+        cache = ParseCache()
+        first = cache.get_or_parse("json", content, _checksum(content))
+        second = cache.get_or_parse("json", content, _checksum(content))
+
+        assert second is first
+        assert [e.key for e in first] == ["greeting", "item"]
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_key_includes_format_and_parser_version(self, content, monkeypatch):
+        from parsers.json_parser import JSONParser
+
+        cache = ParseCache()
+        checksum = _checksum(content)
+        cache.get_or_parse("json", content, checksum)
+
+        monkeypatch.setattr(JSONParser, "version", JSONParser.version + 1)
+        cache.get_or_parse("json", content, checksum)
+
+        assert cache.stats()["misses"] == 2
+
+    def test_lru_eviction_by_rows(self):
+        cache = ParseCache(max_rows=3)
+        contents = [json.dumps({f"k{i}": "a", f"j{i}": "b"}) for i in range(3)]
+        for content in contents:
+            cache.get_or_parse("json", content, _checksum(content))
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["rows"] == 2
+        assert stats["evictions"] == 2
+
+    def test_parse_errors_are_not_cached(self):
+        cache = ParseCache()
+        with pytest.raises(ParseError):
+            cache.get_or_parse("json", "{broken", _checksum("{broken"))
+        assert cache.stats()["entries"] == 0
+
+    def test_disk_tier(self, content, tmp_path):
+        checksum = _checksum(content)
+        ParseCache(directory=tmp_path).get_or_parse("json", content, checksum)
+
+        cache = ParseCache(directory=tmp_path)
+        batch = cache.get_or_parse("json", content, checksum)
+
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.stats()["misses"] == 0
+        assert list(batch) == list(ParsedBatch.from_entries(batch))
+        assert batch[1].plural_forms == {"one": "1 item", "other": "{{count}} items"}
+
+    def test_corrupt_disk_entry_is_reparsed(self, content, tmp_path):
+        checksum = _checksum(content)
+        cache = ParseCache(directory=tmp_path)
+        cache.get_or_parse("json", content, checksum)
+        for path in tmp_path.rglob("*.batch"):
+            path.write_bytes(b"garbage")
+
+        fresh = ParseCache(directory=tmp_path)
+        batch = fresh.get_or_parse("json", content, checksum)
+
+        assert len(batch) == 2
+        assert fresh.stats()["misses"] == 1
@@ -1,9 +1,40 @@
 import json
+from itertools import permutations
+
 import pytest
+from parsers.base import ParsedEntry
 from parsers.json_parser import JSONParser
 from parsers.exceptions import ParseError
 
 
+def _loads_entries(content):
+    """Entries grouped from the json.loads result, as the parser did before it streamed."""
+    flat = []
+
+    def flatten(data, prefix=""):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                flatten(value, f"{prefix}{key}.")
+            else:
+                flat.append((prefix + key, value if isinstance(value, str) else str(value)))
+
+    flatten(json.loads(content))
+    parser = JSONParser()
+    groups = {}
+    for key, value in flat:
+        base_key, suffix = parser._split_plural_suffix(key)
+        if suffix:
+            groups.setdefault(base_key, {})[suffix] = value
+    entries = [ParsedEntry(key=key, source_text=value) for key, value in flat
+               if not parser._split_plural_suffix(key)[1] and key not in groups]
+    for base_key, forms in groups.items():
+        source = forms.get("one", forms.get("other", next(iter(forms.values()))))
+        entries.append(ParsedEntry(key=base_key, source_text=source, has_plurals=True, plural_forms=forms))
+    for order, entry in enumerate(entries):
+        entry.order = order
+    return entries
+
+
 @pytest.fixture
 def parser():
     return JSONParser()
@@ -152,3 +183,159 @@ class TestJSONParserExport:
 
         assert result["item_one"] == "{{count}} item"
         assert result["item_other"] == "{{count}} items"
+
+    def test_export_plurals_for_language(self, parser):
+        content = json.dumps({
+            "item_one": "{{count}} item",
+            "item_other": "{{count}} items",
+        })
+        entries = parser.parse(content)
+        translations = {"item_one": "{{count}} element", "item_few": "{{count}} elementy"}
+        result = json.loads(parser.export(entries, translations, language="pl"))
+
+        assert result == {
+            "item_one": "{{count}} element",
+            "item_few": "{{count}} elementy",
+            "item_many": "{{count}} items",
+            "item_other": "{{count}} items",
+        }
+
+
+    def test_export_groups_nested_keys(self, parser):
+        entries = [
+            ParsedEntry(key="a.x", source_text="1", order=0),
+            ParsedEntry(key="b", source_text="2", order=1),
+            ParsedEntry(key="a.y.z", source_text="3", order=2),
+            ParsedEntry(key="b", source_text="4", order=3),
+        ]
+        exported = parser.export(entries)
+
+        assert exported == json.dumps({"a": {"x": "1", "y": {"z": "3"}}, "b": "4"}, ensure_ascii=False, indent=2) + "\n"
+
+    def test_export_order(self, parser):
+        assert parser.export_order(["a.x", "b", "a.y", "c.d", "b", "c"]) == [0, 2, 4, 5]
+
+    def test_export_iter_streams_iterators(self, parser):
+        entries = [
+            ParsedEntry(key="cart.empty", source_text="Empty", order=0),
+            ParsedEntry(key="title", source_text="Shop", order=1),
+            ParsedEntry(key="cart.item", source_text="item", has_plurals=True,
+                        plural_forms={"one": "item", "other": "items"}, order=2),
+        ]
+        in_order = [entries[i] for i in parser.export_order(e.key for e in entries)]
+
+        assert "".join(parser.export_iter(iter(in_order))) == parser.export(entries)
+        assert json.loads(parser.export(entries)) == {
+            "cart": {"empty": "Empty", "item_one": "item", "item_other": "items"},
+            "title": "Shop",
+        }
+
+
+class TestJSONParserIterParse:
+    def test_iter_parse_is_lazy(self, parser):
+        content = json.dumps({"first": "1", "second": "2"})
+        iterator = parser.iter_parse(content)
+
+        assert not isinstance(iterator, list)
+        first = next(iterator)
+        assert first.key == "first"
+        assert [e.key for e in iterator] == ["second"]
+
+    def test_iter_parse_matches_parse(self, parser):
+        content = json.dumps({
+            "nav": {"home": "Home", "item_one": "{{count}} item", "item_other": "{{count}} items"},
+            "title": "Title",
+        })
+        assert list(parser.iter_parse(content)) == parser.parse(content)
+
+    def test_nested_plurals_yielded_after_regular_keys(self, parser):
+        content = json.dumps({
+            "cart": {
+                "item_one": "{{count}} item",
+                "item_other": "{{count}} items",
+                "empty": "Cart is empty",
+            },
+            "title": "Shop",
+        })
+        entries = parser.parse(content)
+
+        assert [e.key for e in entries] == ["cart.empty", "title", "cart.item"]
+        assert [e.order for e in entries] == [0, 1, 2]
+        assert entries[2].plural_forms == {"one": "{{count}} item", "other": "{{count}} items"}
+
+    def test_bare_key_after_plural_group_is_skipped(self, parser):
+        content = '{"item_one": "one item", "item_other": "items", "item": "item"}'
+        entries = parser.parse(content)
+
+        assert len(entries) == 1
+        assert entries[0].key == "item"
+        assert entries[0].has_plurals is True
+
+    def test_bare_key_before_suffixes_is_skipped(self, parser):
+        content = '{"item": "item", "item_plural": "items"}'
+        entries = parser.parse(content)
+
+        assert len(entries) == 1
+        assert entries[0].key == "item"
+        assert entries[0].plural_forms == {"plural": "items"}
+
+    @pytest.mark.parametrize("members", list(permutations([
+        '"item_one": "a"', '"item": "b"', '"item_other": "c"', '"title": "t"',
+    ])))
+    def test_grouping_ignores_key_order(self, parser, members):
+        content = "{" + ", ".join(members) + "}"
+        entries = parser.parse(content)
+
+        assert [(e.key, e.has_plurals) for e in entries] == [("title", False), ("item", True)]
+        assert entries[1].plural_forms == {"one": "a", "other": "c"}
+        assert entries == _loads_entries(content)
+
+    @pytest.mark.parametrize("content", [
+        '{"a": "1", "b": "2", "a": "3"}',
+        '{"a": {"x": "1"}, "b": "2", "a": {"y": "3"}}',
+        '{"a": "1", "b": "2", "a": {"c": {"d": "3"}, "e_one": "4"}, "f": "5"}',
+        '{"a": {"b_one": "1", "b": "2"}, "a": {"b": "3"}, "c": "4"}',
+        '{"n": {"a": "1", "a": "2", "m": {"k": "3", "k": {"z": "4"}}}, "x_one": "5", "x_one": "6"}',
+        '{"a": {}, "a": "1"}',
+        '{"a.b_one": "1", "a": {"b": "2", "c": "3"}}',
+    ])
+    def test_duplicate_keys_match_json_loads(self, parser, content):
+        assert parser.parse(content) == _loads_entries(content)
+
+    def test_non_string_values(self, parser):
+        content = '{"count": 5, "enabled": true, "empty": {}, "list": ["a"]}'
+        entries = parser.parse(content)
+
+        assert [(e.key, e.source_text) for e in entries] == [
+            ("count", "5"),
+            ("enabled", "True"),
+            ("list", "['a']"),
+        ]
+
+    def test_deeply_nested(self, parser):
+        depth = 5000
+        content = '{"k": ' * depth + '"leaf"' + "}" * depth
+        entries = parser.parse(content)
+
+        assert len(entries) == 1
+        assert entries[0].key == ".".join(["k"] * depth)
+
+    def test_trailing_data(self, parser):
+        with pytest.raises(ParseError, match="Invalid JSON"):
+            parser.parse('{"a": "b"} extra')
+
+    def test_missing_delimiter(self, parser):
+        with pytest.raises(ParseError, match="Invalid JSON"):
+            parser.parse('{"a": "b" "c": "d"}')
+
+    @pytest.mark.parametrize("name,expected", [
+        ("item_one", ("item", "one")),
+        ("a_b_other", ("a_b", "other")),
+        ("count_plural", ("count", "plural")),
+        ("_zero", ("", "zero")),
+        ("someone", ("someone", None)),
+        ("item_ones", ("item_ones", None)),
+        ("item", ("item", None)),
+    ])
+    def test_split_plural_suffix(self, parser, name, expected):
+        assert parser._split_plural_suffix(name) == expected
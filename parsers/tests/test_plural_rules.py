@@ -0,0 +1,137 @@
+import gettext
+from decimal import Decimal
+
+import pytest
+from parsers.plural_rules import (
+    CLDR_PLURAL_RULES,
+    INTEGER_TABLE_SIZE,
+    PluralRule,
+    PluralRuleSyntaxError,
+    get_plural_category,
+    get_plural_forms,
+    get_plural_rule,
+    plural_operands,
+)
+
+
+class TestGetPluralForms:
+    @pytest.mark.parametrize("language_code,expected", [
+        ("en", ["one", "other"]),
+        ("ja", ["other"]),
+        ("fr", ["one", "many", "other"]),
+        ("pl", ["one", "few", "many", "other"]),
+        ("ar", ["zero", "one", "two", "few", "many", "other"]),
+        ("cy", ["zero", "one", "two", "few", "many", "other"]),
+        ("sl", ["one", "two", "few", "other"]),
+        ("lt", ["one", "few", "many", "other"]),
+    ])
+    def test_cldr_categories(self, language_code, expected):
+        assert get_plural_forms(language_code) == expected
+
+    def test_region_falls_back_to_base_language(self):
+        assert get_plural_rule("ru-RU").locale == "ru"
+        assert get_plural_rule("sr_Latn").locale == "sr"
+
+    def test_region_specific_rules_win(self):
+        assert get_plural_rule("pt_PT").locale == "pt-PT"
+        assert get_plural_category("pt-PT", 0) == "other"
+        assert get_plural_category("pt-BR", 0) == "one"
+
+    def test_unknown_language_uses_default(self):
+        assert get_plural_forms("xx") == ["one", "other"]
+
+    def test_forms_are_not_shared(self):
+        get_plural_forms("en").append("many")
+        assert get_plural_forms("en") == ["one", "other"]
+
+    def test_is_memoized(self):
+        assert get_plural_rule("uk") is get_plural_rule("uk")
+
+
+class TestPluralCategory:
+    @pytest.mark.parametrize("language_code,number,expected", [
+        ("en", 1, "one"),
+        ("en", "1.0", "other"),
+        ("es", "1.0", "one"),
+        ("ru", 21, "one"),
+        ("ru", 11, "many"),
+        ("ru", 22, "few"),
+        ("ru", "1.5", "other"),
+        ("pl", 0, "many"),
+        ("pl", 112, "many"),
+        ("fr", 1_000_000, "many"),
+        ("fr", 1_000_001, "other"),
+        ("ar", 102, "other"),
+        ("ar", 111, "many"),
+        ("lt", Decimal("0.5"), "many"),
+        ("he", "0.5", "one"),
+        ("is", "21.1", "one"),
+    ])
+    def test_category(self, language_code, number, expected):
+        assert get_plural_category(language_code, number) == expected
+
+    def test_negative_numbers_use_absolute_value(self):
+        assert get_plural_category("ru", -21) == "one"
+
+    def test_integer_table_matches_rules(self):
+        for locale, rules in CLDR_PLURAL_RULES.items():
+            rule = get_plural_rule(locale)
+            for number in range(INTEGER_TABLE_SIZE):
+                assert rule.category(number) == rule.category(str(number)), (locale, number)
+
+
+class TestPluralOperands:
+    def test_integer(self):
+        assert plural_operands(5) == (5, 5, 0, 0, 0, 0, 0, 0)
+
+    def test_visible_fraction_digits(self):
+        n, i, v, w, f, t, c, e = plural_operands("1.50")
+        assert (i, v, w, f, t) == (1, 2, 1, 50, 5)
+        assert n == Decimal("1.50")
+
+    def test_float(self):
+        assert plural_operands(2.0)[:3] == (2, 2, 1)
+
+    def test_rejects_non_numbers(self):
+        with pytest.raises(ValueError):
+            plural_operands("many")
+
+
+class TestSamples:
+    def test_every_category_has_samples(self):
+        for locale in CLDR_PLURAL_RULES:
+            rule = get_plural_rule(locale)
+            for category, samples in rule.samples.items():
+                assert samples, (locale, category)
+                assert all(rule.category(sample) == category for sample in samples)
+
+    def test_large_integer_samples(self):
+        assert get_plural_rule("fr").samples["many"][0] == "1000000"
+
+
+class TestGettextPluralForms:
+    def test_english(self):
+        assert get_plural_rule("en").gettext_plural_forms == "nplurals=2; plural=(n == 1) ? 0 : 1;"
+
+    def test_no_plurals(self):
+        assert get_plural_rule("zh").gettext_plural_forms == "nplurals=1; plural=0;"
+
+    def test_matches_compiled_rules_for_integers(self):
+        numbers = [*range(250), 1000, 11000, 100000, 1000000, 2000000, 10000000]
+        for locale in CLDR_PLURAL_RULES:
+            rule = get_plural_rule(locale)
+            expression = rule.gettext_plural_forms.split("plural=", 1)[1].rstrip(";")
+            plural = gettext.c2py(expression)
+            assert [plural(n) for n in numbers] == [rule.index(n) for n in numbers], locale
+
+
+class TestRuleSyntax:
+    def test_invalid_rule(self):
+        with pytest.raises(PluralRuleSyntaxError):
+            PluralRule("xx", {"one": "n == 1"})
+
+    def test_custom_rule(self):
+        rule = PluralRule("xx", {"one": "n % 10 = 1..2,5", "few": "i != 0 and v = 0"})
+        assert rule.categories == ("one", "few", "other")
+        assert [rule.category(n) for n in (0, 1, 2, 3, 5, 15)] == ["other", "one", "one", "few", "one", "one"]
+        assert rule.category("3.0") == "other"
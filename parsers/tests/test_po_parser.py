@@ -1,3 +1,4 @@
+import polib
 import pytest
 from parsers.po_parser import POParser
 from parsers.exceptions import ParseError
@@ -113,3 +114,137 @@ class TestPOParserExport:
         assert len(re_entries) == len(entries)
         for orig, reparsed in zip(entries, re_entries):
             assert orig.source_text == reparsed.source_text
+
+    def test_export_language_plural_forms(self, parser):
+        entries = parser.parse(PLURAL_PO)
+        key = entries[0].key
+        translations = {f"{key}_one": "jeden", f"{key}_few": "kilka", f"{key}_many": "wiele"}
+        exported = parser.export(entries, translations, language="pl")
+        po = polib.pofile(exported)
+
+        assert po.metadata["Language"] == "pl"
+        assert po.metadata["Plural-Forms"].startswith("nplurals=4;")
+        assert po[0].msgstr_plural == {0: "jeden", 1: "kilka", 2: "wiele", 3: ""}
+
+
+# Catalogs covering the grammar the fast tokenizer handles on its own
+FAST_PATH_CORPUS = [
+    SIMPLE_PO,
+    PLURAL_PO,
+    CONTEXT_PO,
+    "",
+    "# Only a comment\n",
+    '''﻿# Translation header
+# Copyright
+#, fuzzy
+msgid ""
+msgstr ""
+"Project-Id-Version: demo\\n"
+"Plural-Forms: nplurals=3; plural=(n==1 ? 0 : n%10>=2 ? 1 : 2);\\n"
+
+#. Extracted comment
+#. spanning two lines
+#: src/app.py:10 src/app.py:20
+#, python-format, fuzzy
+msgctxt "button"
+msgid "Save %s"
+msgstr "Zapisz %s"
+
+# translator comment
+#| msgid "Old %d file"
+#| msgid_plural "Old %d files"
+msgid ""
+"%d file "
+"selected"
+msgid_plural "%d files selected"
+msgstr[0] "%d plik"
+msgstr[1] ""
+"%d pliki"
+msgstr[2] "%d plików"
+
+msgid "Escapes \\"quoted\\" \\\\ tab\\t newline\\n"
+msgstr "x"
+
+msgid "Untranslated"
+msgstr ""
+
+#~ msgid "Obsolete"
+#~ msgstr "Przestarzałe"
+
+#~| msgid "Older"
+#~ msgid "Removed"
+#~ msgstr "Usunięte"
+''',
+    '''msgid "Header not first"
+msgstr "A"
+
+msgid ""
+msgstr "Content-Type: text/plain; charset=utf-8\\n"
+
+msgid "After header"
+msgstr "B"
+# trailing comment drops nothing
+''',
+    '''msgid "No trailing msgstr"''',
+    '''msgid "Ends with bare flag"
+msgstr "x"
+#,
+''',
+]
+
+
+def _generated_catalog(size):
+    blocks = ['msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=utf-8\\n"\n']
+    for i in range(size):
+        if i % 7 == 0:
+            blocks.append(f'#, fuzzy\nmsgctxt "ctx{i}"\nmsgid "Key {i}"\nmsgstr "Valor {i}"\n')
+        elif i % 5 == 0:
+            blocks.append(
+                f'#. note {i}\nmsgid "{i} item"\nmsgid_plural "{i} items"\n'
+                f'msgstr[0] "{i} elemento"\nmsgstr[1] "{i} elementos"\n'
+            )
+        else:
+            blocks.append(f'msgid "Line {i}\\n"\n"continued"\nmsgstr ""\n"Linha {i}"\n')
+    return "\n".join(blocks)
+
+
+class TestPOParserFastPath:
+    def _reference(self, parser, content):
+        return [
+            parser._build_entry(entry, order)
+            for order, entry in enumerate(parser._polib_entries(content))
+            if not entry.obsolete
+        ]
+
+    @pytest.mark.parametrize("content", FAST_PATH_CORPUS + [_generated_catalog(500)])
+    def test_matches_polib(self, parser, content):
+        fast = parser._tokenize(content)
+        entries = [
+            parser._build_entry(entry, order)
+            for order, entry in enumerate(fast)
+            if not entry.obsolete
+        ]
+        assert entries == self._reference(parser, content)
+        assert parser.parse(content) == entries
+
+    def test_exotic_input_falls_back_to_polib(self, parser):
+        content = '''msgid "a"
+msgstr "b"
+
+#| msgid "dangling previous"
+#| "continued"
+#~ msgid ""
+#~ msgstr "obsolete header"
+
+msgid ""
+msgstr "Content-Type: text/plain; charset=utf-8\\n"
+'''
+        from parsers.po_parser import _FallbackToPolib
+
+        with pytest.raises(_FallbackToPolib):
+            parser._tokenize(content)
+        assert parser.parse(content) == self._reference(parser, content)
+
+    def test_syntax_error_raises_parse_error(self, parser):
+        with pytest.raises(ParseError, match="Invalid PO file"):
+            parser.parse('msgid "a"\nmsgstr "b"\nnot a po line\n')
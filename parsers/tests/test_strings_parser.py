@@ -1,5 +1,6 @@
 import pytest
 from parsers.strings_parser import StringsParser
+from parsers.exceptions import ParseError
 
 
 @pytest.fixture
@@ -97,3 +98,53 @@ class TestStringsParserExport:
             assert orig.key == reparsed.key
             assert orig.source_text == reparsed.source_text
             assert orig.context == reparsed.context
+
+
+class TestStringsParserScanner:
+    def test_multiline_value(self, parser):
+        content = '"terms" = "Line 1\nLine 2";\n"next" = "Next";\n'
+        entries = parser.parse(content)
+
+        assert [e.key for e in entries] == ["terms", "next"]
+        assert entries[0].source_text == "Line 1\nLine 2"
+
+    def test_multiline_comment(self, parser):
+        content = '/* First line\n   second line */\n"key" = "Value";\n'
+        entries = parser.parse(content)
+
+        assert entries[0].context == "First line\n   second line"
+
+    def test_line_comment_and_entries_on_one_line(self, parser):
+        content = '// Buttons\n"ok" = "OK"; "cancel" = "Cancel";\n'
+        entries = parser.parse(content)
+
+        assert [e.key for e in entries] == ["ok", "cancel"]
+        assert entries[0].context == "Buttons"
+        assert entries[1].context == ""
+
+    def test_escaped_backslash_before_n(self, parser):
+        entries = parser.parse('"path" = "C:\\\\new";')
+        assert entries[0].source_text == "C:\\new"
+
+    def test_unquoted_key_and_shorthand(self, parser):
+        entries = parser.parse('title = "Title";\n"Done";\n')
+
+        assert [(e.key, e.source_text) for e in entries] == [
+            ("title", "Title"),
+            ("Done", "Done"),
+        ]
+
+    def test_invalid_line_is_skipped(self, parser):
+        entries = parser.parse('garbage here\n"key" = "Value";\n')
+        assert [e.key for e in entries] == ["key"]
+
+    def test_unterminated_string(self, parser):
+        with pytest.raises(ParseError, match="Unterminated string at line 2"):
+            parser.parse('"a" = "b";\n"key" = "never closed;\n')
+
+    def test_escape_roundtrip(self, parser):
+        text = 'Tab\there, "quote", back\\slash\nnew line\r'
+        entries = parser.parse('"key" = "x";')
+        exported = parser.export(entries, {"key": text})
+
+        assert parser.parse(exported)[0].source_text == text
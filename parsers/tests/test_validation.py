@@ -1,6 +1,8 @@
 import pytest
 from parsers.validation import (
+    FORMAT_PATTERNS,
     extract_variables,
+    validate_many,
     validate_variables,
     validate_length,
     validate_plural_forms,
@@ -47,6 +49,46 @@ class TestExtractVariables:
         assert "name" in variables
 
 
+class TestSinglePassScanner:
+    @pytest.mark.parametrize("text", [
+        "%%s and %d%%",
+        "{{name}} and {name}",
+        "%{user} paid ${total}",
+        "%1$s(a.b) %%{x}",
+        "$t(common.ok) ${{x}}",
+        "{}{0}{{}}",
+        "no placeholders at all",
+        "",
+    ])
+    def test_matches_each_pattern_run_separately(self, text):
+        expected = set()
+        for pattern in FORMAT_PATTERNS:
+            expected.update(pattern.findall(text) if pattern.groups else [m.group() for m in pattern.finditer(text)])
+        assert extract_variables(text) == expected
+
+    def test_result_is_a_fresh_set(self):
+        variables = extract_variables("Hello {name}")
+        variables.add("{other}")
+        assert extract_variables("Hello {name}") == {"{name}"}
+
+
+class TestValidateMany:
+    def test_matches_validate_variables(self):
+        pairs = [
+            ("Hello %s", "Hola %s"),
+            ("Hello %s", "Hola"),
+            ("Hello %s", "Hola %s %d"),
+            ("Plain", "Simple"),
+        ]
+        assert validate_many(pairs) == [validate_variables(s, t) for s, t in pairs]
+
+    def test_accepts_iterators(self):
+        assert validate_many(iter([("{a}", "{b}")])) == [[
+            "Missing variables in translation: {a}",
+            "Extra variables in translation: {b}",
+        ]]
+
+
 class TestValidateVariables:
     def test_validate_variables_ok(self):
         source = "Hello %s, you have %d messages"
@@ -1,6 +1,10 @@
+import mmap
+import xml.etree.ElementTree as ET
+
 import pytest
-from parsers.xliff_parser import XLIFFParser
-from parsers.exceptions import ParseError
+from parsers.base import ParsedEntry
+from parsers.xliff_parser import XLIFF2Parser, XLIFFParser, XLIFFWriter
+from parsers.exceptions import ExportError, ParseError
 
 
 @pytest.fixture
@@ -87,6 +91,13 @@ class TestXLIFFParserExport:
         assert "Hello" in exported  # source should still be there
         assert "Goodbye" in exported
 
+    def test_export_sets_target_language(self, parser):
+        entries = parser.parse(BASIC_XLIFF)
+        exported = parser.export(entries, {"greeting": "Bonjour"}, language="fr")
+
+        assert 'target-language="fr"' in exported
+        assert len(parser.parse(exported)) == len(entries)
+
     def test_export_without_translations(self, parser):
         entries = parser.parse(BASIC_XLIFF)
         exported = parser.export(entries)
@@ -110,3 +121,129 @@ class TestXLIFFParserExport:
         # Should be re-parseable
         re_entries = parser.parse(exported)
         assert len(re_entries) == len(entries)
+
+
+XLIFF_20 = '''<?xml version="1.0" encoding="UTF-8"?>
+<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" version="2.0" srcLang="en" trgLang="fr">
+  <file id="f1">
+    <unit id="greeting">
+      <notes>
+        <note>Shown on launch</note>
+      </notes>
+      <segment>
+        <source>Hello</source>
+        <target>Bonjour</target>
+      </segment>
+    </unit>
+    <unit id="two_sentences">
+      <segment>
+        <source>First.</source>
+      </segment>
+      <ignorable>
+        <source> </source>
+      </ignorable>
+      <segment>
+        <source>Second.</source>
+      </segment>
+    </unit>
+    <unit id="no_segment">
+      <notes>
+        <note>Nothing to translate</note>
+      </notes>
+    </unit>
+  </file>
+</xliff>'''
+
+
+class TestXLIFFWriter:
+    ENTRIES = [
+        ParsedEntry(key='a&b "c"', source_text="1 < 2 & 3 > 0", context="Line\r\nbreak", order=0, max_length=20),
+        ParsedEntry(key="plain", source_text="Plain", order=1),
+    ]
+
+    def test_escapes_text_and_attributes(self):
+        writer = XLIFFWriter()
+        unit = writer.unit('a&b "c"\t', "1 < 2 & 3 > 0", target="x\ry")
+        assert unit == (
+            '<trans-unit id="a&amp;b &quot;c&quot;&#09;">'
+            "<source>1 &lt; 2 &amp; 3 &gt; 0</source><target>x&#13;y</target></trans-unit>"
+        )
+
+    @pytest.mark.parametrize("parser_class", [XLIFFParser, XLIFF2Parser])
+    def test_export_is_well_formed_and_roundtrips(self, parser_class):
+        parser = parser_class()
+        exported = parser.export(self.ENTRIES, {"plain": "Simple"}, language="fr")
+
+        ET.fromstring(exported.encode("utf-8"))
+        reparsed = parser.parse(exported)
+        assert [(e.key, e.source_text, e.max_length) for e in reparsed] == [
+            ('a&b "c"', "1 < 2 & 3 > 0", 20),
+            ("plain", "Plain", None),
+        ]
+        assert reparsed[0].context == "Line\r\nbreak"
+
+    def test_xliff_20_structure(self):
+        exported = XLIFF2Parser().export(self.ENTRIES, {"plain": "Simple"}, language="fr")
+        root = ET.fromstring(exported.encode("utf-8"))
+        ns = {"x": XLIFFWriter.NAMESPACES["2.0"]}
+
+        assert root.get("version") == "2.0"
+        assert root.get("srcLang") == "en"
+        assert root.get("trgLang") == "fr"
+        units = root.findall("x:file/x:unit", ns)
+        assert units[0].get(f"{{{XLIFFWriter.SIZE_RESTRICTION_NAMESPACE}}}sizeRestriction") == "20"
+        assert units[0].find("x:notes/x:note", ns).text == "Line\r\nbreak"
+        assert units[1].find("x:segment/x:target", ns).text == "Simple"
+        assert units[0].find("x:segment/x:target", ns) is None
+
+    def test_unsupported_version(self):
+        with pytest.raises(ExportError):
+            XLIFFWriter("1.1")
+
+
+class TestXLIFFParserIterParse:
+    def test_iter_parse_is_lazy(self, parser):
+        iterator = parser.iter_parse(BASIC_XLIFF)
+
+        assert next(iterator).key == "greeting"
+        assert [e.key for e in iterator] == ["farewell"]
+
+    def test_units_are_released(self, parser):
+        units = "".join(
+            f'<trans-unit id="k{i}"><source>Text {i}</source></trans-unit>'
+            for i in range(50)
+        )
+        content = (
+            '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2">'
+            f'<file original="test"><body>{units}</body></file></xliff>'
+        )
+        entries = parser.parse(content)
+
+        assert len(entries) == 50
+        assert entries[49].key == "k49"
+        assert entries[49].source_text == "Text 49"
+
+    def test_parse_xliff_20(self, parser):
+        entries = parser.parse(XLIFF_20)
+
+        assert [e.key for e in entries] == ["greeting", "two_sentences"]
+        assert entries[0].source_text == "Hello"
+        assert entries[0].context == "Shown on launch"
+        assert entries[1].source_text == "First. Second."
+        assert [e.order for e in entries] == [0, 1]
+
+    def test_parse_invalid_xml_midway(self, parser):
+        content = BASIC_XLIFF.replace("</body>", "")
+        with pytest.raises(ParseError, match="Invalid XML"):
+            parser.parse(content)
+
+    def test_parse_memory_mapped_file(self, parser, tmp_path):
+        path = tmp_path / "messages.xliff"
+        path.write_bytes(BASIC_XLIFF.encode("utf-8"))
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            entries = parser.parse(buffer)
+            # The parser released its view, so the map can be closed
+            buffer.close()
+
+        assert [e.key for e in entries] == ["greeting", "farewell"]
@@ -1,5 +1,8 @@
+import functools
 import re
-from parsers.plural_rules import get_plural_forms
+from collections.abc import Iterable
+
+from parsers.plural_rules import get_plural_rule
 
 # Common format variable patterns
 FORMAT_PATTERNS = [
@@ -11,13 +14,59 @@ FORMAT_PATTERNS = [
     re.compile(r'\$(?:t|s)\([\w.]+\)'),                      # i18next interpolation
 ]
 
+# All patterns as one zero-width alternation, so a single pass reports every
+# pattern's match at each position. No two patterns can match at the same
+# position, so the alternation order does not matter. The leading character
+# class lets the regex engine skip quickly to positions that can start one.
+PLACEHOLDER_SCANNER = re.compile(
+    "(?=[%{$])(?=" + "|".join(f"({pattern.pattern})" for pattern in FORMAT_PATTERNS) + ")"
+)
+
+
+def _scanner_groups() -> dict[int, tuple[int, int]]:
+    """Map the scanner group closing each pattern to (pattern index, value group)."""
+    groups = {}
+    group = 1
+    for index, pattern in enumerate(FORMAT_PATTERNS):
+        # Patterns with a capture group report the captured name, like findall()
+        groups[group] = (index, group + 1 if pattern.groups else group)
+        group += 1 + pattern.groups
+    return groups
+
+
+_SCANNER_GROUPS = _scanner_groups()
+
+# Placeholders always start with one of these characters
+PLACEHOLDER_CHARS = re.compile(r"[%{$]")
+
+SOURCE_VARIABLES_CACHE_SIZE = 16_384
+
 
 def extract_variables(text: str) -> set[str]:
     """Extract all format variables/placeholders from text."""
+    return set(_scan_variables(text))
+
+
+def _scan_variables(text: str) -> frozenset[str]:
+    if not PLACEHOLDER_CHARS.search(text):
+        return frozenset()
+
     variables = set()
-    for pattern in FORMAT_PATTERNS:
-        variables.update(pattern.findall(text) if pattern.groups else [m.group() for m in pattern.finditer(text)])
-    return variables
+    # Matches of one pattern never overlap, as with finditer() per pattern
+    pattern_ends = [0] * len(FORMAT_PATTERNS)
+    for match in PLACEHOLDER_SCANNER.finditer(text):
+        index, value_group = _SCANNER_GROUPS[match.lastindex]
+        start = match.start()
+        if start < pattern_ends[index]:
+            continue
+        pattern_ends[index] = match.end(match.lastindex)
+        variables.add(match.group(value_group))
+    return frozenset(variables)
+
+
+# Source texts are validated against every translation of a string, so their
+# variables are memoized; translations are scanned each time.
+_source_variables = functools.lru_cache(maxsize=SOURCE_VARIABLES_CACHE_SIZE)(_scan_variables)
 
 
 def validate_variables(source: str, translation: str) -> list[str]:
@@ -25,9 +74,10 @@ def validate_variables(source: str, translation: str) -> list[str]:
 
     Returns list of error messages (empty if valid).
     """
-    source_vars = extract_variables(source)
-    translation_vars = extract_variables(translation)
+    return _compare_variables(_source_variables(source), _scan_variables(translation))
 
+
+def _compare_variables(source_vars: frozenset[str], translation_vars: frozenset[str]) -> list[str]:
     errors = []
     missing = source_vars - translation_vars
     if missing:
@@ -40,6 +90,23 @@ def validate_variables(source: str, translation: str) -> list[str]:
     return errors
 
 
+def validate_many(pairs: Iterable[tuple[str, str]]) -> list[list[str]]:
+    """Validate the variables of many (source, translation) pairs.
+
+    Returns one error list per pair, in order. Each distinct source text is
+    scanned once per call, which suits bulk imports and QA scans where the
+    same source is checked against many translations.
+    """
+    source_cache: dict[str, frozenset[str]] = {}
+    results = []
+    for source, translation in pairs:
+        source_vars = source_cache.get(source)
+        if source_vars is None:
+            source_vars = source_cache[source] = _scan_variables(source)
+        results.append(_compare_variables(source_vars, _scan_variables(translation)))
+    return results
+
+
 def validate_length(translation: str, max_length: int | None) -> list[str]:
     """Check translation length against max_length constraint."""
     if max_length is not None and len(translation) > max_length:
@@ -48,13 +115,19 @@ def validate_length(translation: str, max_length: int | None) -> list[str]:
 
 
 def validate_plural_forms(plural_translations: dict[str, str], language_code: str) -> list[str]:
-    """Validate that all required plural forms for a language are provided."""
-    required = get_plural_forms(language_code)
-    provided = set(plural_translations.keys())
+    """Validate that all required plural forms for a language are provided.
+
+    Missing forms are reported in CLDR order with sample numbers, so
+    translators can tell which counts each form is used for.
+    """
+    rule = get_plural_rule(language_code)
+    missing = [category for category in rule.categories if category not in plural_translations]
 
     errors = []
-    missing = set(required) - provided
     if missing:
-        errors.append(f"Missing plural forms for {language_code}: {', '.join(sorted(missing))}")
+        described = ", ".join(
+            f"{category} (e.g. {', '.join(rule.samples[category][:3])})" for category in missing
+        )
+        errors.append(f"Missing plural forms for {language_code}: {described}")
 
     return errors
@@ -1,90 +1,310 @@
+import io
 import xml.etree.ElementTree as ET
-from parsers.base import BaseParser, ParsedEntry
-from parsers.exceptions import ParseError
+from collections.abc import Iterator
 
+from parsers.base import BaseParser, ParsedEntry, RawContent
+from parsers.exceptions import ExportError, ParseError
+
+
+TEXT_ESCAPES = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    # A literal carriage return would be normalized away by XML parsers
+    "\r": "&#13;",
+})
+
+ATTRIBUTE_ESCAPES = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "\n": "&#10;",
+    "\r": "&#13;",
+    "\t": "&#09;",
+})
+
+
+class XLIFFWriter:
+    """Serialize an XLIFF document one unit at a time.
+
+    ``header()``, then ``unit()`` for every entry, then ``footer()`` return
+    the pieces of the document; joined, they form a complete file. Version
+    1.2 writes ``trans-unit`` elements, version 2.0 ``unit/segment`` with
+    the size restriction module for maximum lengths.
+    """
 
-class XLIFFParser(BaseParser):
     NAMESPACES = {
         "1.2": "urn:oasis:names:tc:xliff:document:1.2",
         "2.0": "urn:oasis:names:tc:xliff:document:2.0",
     }
+    SIZE_RESTRICTION_NAMESPACE = "urn:oasis:names:tc:xliff:sizerestriction:2.0"
+
+    def __init__(
+        self,
+        version: str = "1.2",
+        source_language: str = "en",
+        target_language: str | None = None,
+        original: str = "locflow",
+    ):
+        if version not in self.NAMESPACES:
+            raise ExportError(f"Unsupported XLIFF version: '{version}'")
+        self.version = version
+        self.source_language = source_language
+        self.target_language = target_language
+        self.original = original
+
+    def header(self) -> str:
+        ns = self.NAMESPACES[self.version]
+        if self.version == "2.0":
+            return (
+                "<?xml version='1.0' encoding='utf-8'?>\n"
+                f'<xliff xmlns="{ns}" xmlns:slr="{self.SIZE_RESTRICTION_NAMESPACE}" version="2.0"'
+                f' srcLang="{_attr(self.source_language)}"'
+                + (f' trgLang="{_attr(self.target_language)}"' if self.target_language else "")
+                + f'><file id="{_attr(self.original)}">'
+            )
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            f'<xliff xmlns="{ns}" version="1.2">'
+            f'<file source-language="{_attr(self.source_language)}"'
+            + (f' target-language="{_attr(self.target_language)}"' if self.target_language else "")
+            + f' datatype="plaintext" original="{_attr(self.original)}"><body>'
+        )
+
+    def unit(
+        self,
+        key: str,
+        source: str,
+        target: str | None = None,
+        note: str = "",
+        max_length: int | None = None,
+    ) -> str:
+        if self.version == "2.0":
+            parts = [f'<unit id="{_attr(key)}"']
+            if max_length:
+                parts.append(f' slr:sizeRestriction="{max_length}"')
+            parts.append(">")
+            if note:
+                parts.append(f"<notes><note>{_text(note)}</note></notes>")
+            parts.append(f"<segment><source>{_text(source)}</source>")
+            if target is not None:
+                parts.append(f"<target>{_text(target)}</target>")
+            parts.append("</segment></unit>")
+            return "".join(parts)
+
+        parts = [f'<trans-unit id="{_attr(key)}"']
+        if max_length:
+            parts.append(f' maxwidth="{max_length}"')
+        parts.append(f"><source>{_text(source)}</source>")
+        if target is not None:
+            parts.append(f"<target>{_text(target)}</target>")
+        if note:
+            parts.append(f"<note>{_text(note)}</note>")
+        parts.append("</trans-unit>")
+        return "".join(parts)
+
+    def footer(self) -> str:
+        if self.version == "2.0":
+            return "</file></xliff>"
+        return "</body></file></xliff>"
+
+
+def _text(value: str) -> str:
+    return value.translate(TEXT_ESCAPES)
+
+
+def _attr(value: str) -> str:
+    return value.translate(ATTRIBUTE_ESCAPES)
+
+
+class _BufferReader(io.RawIOBase):
+    """Read-only file over a byte buffer that hands out slices, not a copy of the whole."""
 
-    def parse(self, content: str) -> list[ParsedEntry]:
+    def __init__(self, content: bytes | memoryview):
+        self._view = memoryview(content).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        chunk = bytes(self._view[self._pos:end])
+        self._pos = end
+        return chunk
+
+    def close(self) -> None:
+        # Release the view so the underlying mmap can be closed by its owner
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class XLIFFParser(BaseParser):
+    NAMESPACES = XLIFFWriter.NAMESPACES
+
+    # Version written by export(); parsing detects the version of each file
+    export_version = "1.2"
+
+    def parse(self, content: RawContent) -> list[ParsedEntry]:
+        return list(self.iter_parse(content))
+
+    def iter_parse(self, content: RawContent) -> Iterator[ParsedEntry]:
+        """Yield entries from XLIFF 1.2 ``trans-unit`` or 2.0 ``unit`` elements.
+
+        The document is read with ``iterparse`` and every unit is cleared and
+        detached from its parent once its entry has been built, so memory
+        stays constant regardless of how many units the file contains.
+        Byte buffers are fed to the XML parser directly, so a memory-mapped
+        upload is never decoded or copied as a whole.
+        """
+        if isinstance(content, str):
+            source = io.StringIO(content)
+        else:
+            source = _BufferReader(content)
         try:
-            root = ET.fromstring(content)
+            yield from self._iter_units(source)
         except ET.ParseError as e:
             raise ParseError(f"Invalid XML: {e}")
+        finally:
+            source.close()
 
-        ns = self._detect_namespace(root)
-        ns_prefix = f"{{{ns}}}" if ns else ""
-
-        entries = []
+    def _iter_units(self, source: io.IOBase) -> Iterator[ParsedEntry]:
+        events = ET.iterparse(source, events=("start", "end"))
+        ancestors: list[ET.Element] = []
+        ns_prefix = ""
+        unit_tag = "trans-unit"
+        is_v2 = False
+        in_file = 0
         order = 0
 
-        for file_elem in root.iter(f"{ns_prefix}file"):
-            for trans_unit in file_elem.iter(f"{ns_prefix}trans-unit"):
-                unit_id = trans_unit.get("id", "")
-                source_elem = trans_unit.find(f"{ns_prefix}source")
-
-                if source_elem is None:
-                    continue
-
-                source_text = self._get_text(source_elem)
+        for event, elem in events:
+            if event == "start":
+                if not ancestors:
+                    ns = self._detect_namespace(elem)
+                    ns_prefix = f"{{{ns}}}" if ns else ""
+                    is_v2 = ns == self.NAMESPACES["2.0"] or (
+                        not ns and elem.get("version", "").startswith("2")
+                    )
+                    unit_tag = f"{ns_prefix}unit" if is_v2 else f"{ns_prefix}trans-unit"
+                elif elem.tag == f"{ns_prefix}file":
+                    in_file += 1
+                ancestors.append(elem)
+                continue
 
-                # Get note for context
-                note_elem = trans_unit.find(f"{ns_prefix}note")
-                context = note_elem.text.strip() if note_elem is not None and note_elem.text else ""
+            ancestors.pop()
+            if elem.tag == f"{ns_prefix}file":
+                in_file -= 1
+            elif elem.tag == unit_tag and in_file:
+                if is_v2:
+                    entry = self._build_v2_entry(elem, ns_prefix, order)
+                else:
+                    entry = self._build_v12_entry(elem, ns_prefix, order)
+                if entry is not None:
+                    yield entry
+                    order += 1
 
-                # Check for max-width
-                max_length = None
-                size_restriction = trans_unit.get("maxwidth") or trans_unit.get("size-restriction")
-                if size_restriction:
-                    try:
-                        max_length = int(size_restriction)
-                    except ValueError:
-                        pass
+                # Drop the finished unit so the tree never grows past one unit
+                elem.clear()
+                if ancestors:
+                    ancestors[-1].remove(elem)
 
-                entries.append(ParsedEntry(
-                    key=unit_id,
-                    source_text=source_text,
-                    context=context,
-                    order=order,
-                    max_length=max_length,
-                ))
-                order += 1
+    def _build_v12_entry(self, trans_unit: ET.Element, ns_prefix: str, order: int) -> ParsedEntry | None:
+        source_elem = trans_unit.find(f"{ns_prefix}source")
+        if source_elem is None:
+            return None
 
-        return entries
+        # Get note for context
+        note_elem = trans_unit.find(f"{ns_prefix}note")
+        context = note_elem.text.strip() if note_elem is not None and note_elem.text else ""
 
-    def export(self, entries: list[ParsedEntry], translations: dict[str, str] | None = None) -> str:
-        ns = self.NAMESPACES["1.2"]
-        ET.register_namespace("", ns)
+        return ParsedEntry(
+            key=trans_unit.get("id", ""),
+            source_text=self._get_text(source_elem),
+            context=context,
+            order=order,
+            max_length=self._get_max_length(trans_unit),
+        )
 
-        xliff = ET.Element(f"{{{ns}}}xliff", version="1.2")
-        file_elem = ET.SubElement(xliff, f"{{{ns}}}file", {
-            "source-language": "en",
-            "datatype": "plaintext",
-            "original": "locflow",
-        })
-        body = ET.SubElement(file_elem, f"{{{ns}}}body")
+    def _build_v2_entry(self, unit: ET.Element, ns_prefix: str, order: int) -> ParsedEntry | None:
+        # Segments carry the translatable text; ignorables hold the whitespace
+        # between them, so both are joined in document order.
+        parts = []
+        has_segment = False
+        for child in unit:
+            if child.tag not in (f"{ns_prefix}segment", f"{ns_prefix}ignorable"):
+                continue
+            source_elem = child.find(f"{ns_prefix}source")
+            if source_elem is None:
+                continue
+            if child.tag == f"{ns_prefix}segment":
+                has_segment = True
+                parts.append(self._get_text(source_elem))
+            else:
+                parts.append(source_elem.text or "")
+        if not has_segment:
+            return None
 
-        for entry in sorted(entries, key=lambda e: e.order):
-            trans_unit = ET.SubElement(body, f"{{{ns}}}trans-unit", id=entry.key)
+        note_elem = unit.find(f"{ns_prefix}notes/{ns_prefix}note")
+        context = note_elem.text.strip() if note_elem is not None and note_elem.text else ""
 
-            source = ET.SubElement(trans_unit, f"{{{ns}}}source")
-            source.text = entry.source_text
+        return ParsedEntry(
+            key=unit.get("id", ""),
+            source_text="".join(parts).strip(),
+            context=context,
+            order=order,
+            max_length=self._get_max_length(unit),
+        )
 
-            if translations and entry.key in translations:
-                target = ET.SubElement(trans_unit, f"{{{ns}}}target")
-                target.text = translations[entry.key]
+    def _get_max_length(self, unit: ET.Element) -> int | None:
+        # Check for max-width (1.2) or the size restriction module (2.0)
+        size_restriction = (
+            unit.get("maxwidth")
+            or unit.get("size-restriction")
+            or unit.get(f"{{{XLIFFWriter.SIZE_RESTRICTION_NAMESPACE}}}sizeRestriction")
+        )
+        if size_restriction:
+            try:
+                return int(size_restriction)
+            except ValueError:
+                pass
+        return None
 
-            if entry.context:
-                note = ET.SubElement(trans_unit, f"{{{ns}}}note")
-                note.text = entry.context
+    def export(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> str:
+        return "".join(self.export_iter(entries, translations, language))
 
-            if entry.max_length:
-                trans_unit.set("maxwidth", str(entry.max_length))
+    def export_iter(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None = None,
+        language: str | None = None,
+    ) -> Iterator[str]:
+        """Stream the document, serializing one unit at a time with XLIFFWriter."""
+        return self._chunked(self._iter_units_xml(entries, translations, language))
 
-        return ET.tostring(xliff, encoding="unicode", xml_declaration=True)
+    def _iter_units_xml(
+        self,
+        entries: list[ParsedEntry],
+        translations: dict[str, str] | None,
+        language: str | None,
+    ) -> Iterator[str]:
+        writer = XLIFFWriter(self.export_version, target_language=language)
+        yield writer.header()
+        for entry in self._ordered(entries):
+            yield writer.unit(
+                entry.key,
+                entry.source_text,
+                target=translations.get(entry.key) if translations else None,
+                note=entry.context,
+                max_length=entry.max_length,
+            )
+        yield writer.footer()
 
     def _detect_namespace(self, root: ET.Element) -> str:
         tag = root.tag
@@ -102,3 +322,9 @@ class XLIFFParser(BaseParser):
         if element.tail:
             parts.append(element.tail)
         return "".join(parts).strip()
+
+
+class XLIFF2Parser(XLIFFParser):
+    """XLIFF parser whose exports are XLIFF 2.0 documents."""
+
+    export_version = "2.0"